@@ -22,6 +22,7 @@
 #include <memory>
 #include <string>
 #include <utility>
+#include <vector>
 
 #include "boost/lexical_cast.hpp"
 
@@ -30,6 +31,7 @@
 
 #include "core/server/rpc_utils.h"
 #include "core/utils/convert_utils.h"
+#include "core/utils/transform_utils.h"
 #include "proto/graphscope/proto/types.pb.h"
 
 namespace gs {
@@ -104,6 +106,31 @@ class DynamicFragmentReporter : public grape::Communicator {
       BOOST_LEAF_AUTO(lid, params.Get<int64_t>(rpc::LID));
       return batchGetNodes(fragment, fid, lid);
     }
+    case rpc::NEIGHBORS_BY_LOC:
+    case rpc::SUCCS_BY_LOC:
+    case rpc::PREDS_BY_LOC: {
+      BOOST_LEAF_AUTO(fid, params.Get<int64_t>(rpc::FID));
+      BOOST_LEAF_AUTO(lid, params.Get<int64_t>(rpc::LID));
+      return batchGetNeighbors(fragment, fid, lid, report_type);
+    }
+    case rpc::NODES_TO_DATAFRAME: {
+      BOOST_LEAF_AUTO(attrs_in_json, params.Get<std::string>(rpc::PROPERTIES));
+      dynamic::Value attrs;
+      dynamic::Parse(attrs_in_json, attrs);
+      return nodesToDataframe(fragment, attrs);
+    }
+    case rpc::EDGES_TO_DATAFRAME: {
+      BOOST_LEAF_AUTO(attrs_in_json, params.Get<std::string>(rpc::PROPERTIES));
+      dynamic::Value attrs;
+      dynamic::Parse(attrs_in_json, attrs);
+      return edgesToDataframe(fragment, attrs);
+    }
+    case rpc::DEG_TO_DATAFRAME:
+    case rpc::IN_DEG_TO_DATAFRAME:
+    case rpc::OUT_DEG_TO_DATAFRAME: {
+      BOOST_LEAF_AUTO(weight, params.Get<std::string>(rpc::EDGE_KEY));
+      return degreesToDataframe(fragment, weight, report_type);
+    }
     default:
       CHECK(false);
     }
@@ -169,21 +196,69 @@ class DynamicFragmentReporter : public grape::Communicator {
     vertex_t v;
     dynamic::Value nbrs(rapidjson::kArrayType);
     if (fragment->GetInnerVertex(node, v) && fragment->IsAliveInnerVertex(v)) {
-      adj_list_t edges;
-      dynamic::Value id_array(rapidjson::kArrayType);
-      dynamic::Value data_array(rapidjson::kArrayType);
-      report_type == rpc::PREDS_BY_NODE
-          ? edges = fragment->GetIncomingAdjList(v)
-          : edges = fragment->GetOutgoingAdjList(v);
-      for (auto& e : edges) {
-        id_array.PushBack(fragment->GetId(e.neighbor()));
-        data_array.PushBack(e.data());
-      }
-      nbrs.PushBack(id_array).PushBack(data_array);
+      fillNeighbors(fragment, v, report_type, nbrs);
     }
     return nbrs.Empty() ? std::string() : dynamic::Stringify(nbrs);
   }
 
+  // fill the [[neighbor ids], [edge data]] pair of v into nbrs.
+  void fillNeighbors(std::shared_ptr<fragment_t>& fragment, const vertex_t& v,
+                     const rpc::ReportType& report_type,
+                     dynamic::Value& nbrs) {
+    adj_list_t edges;
+    dynamic::Value id_array(rapidjson::kArrayType);
+    dynamic::Value data_array(rapidjson::kArrayType);
+    report_type == rpc::PREDS_BY_NODE || report_type == rpc::PREDS_BY_LOC
+        ? edges = fragment->GetIncomingAdjList(v)
+        : edges = fragment->GetOutgoingAdjList(v);
+    for (auto& e : edges) {
+      id_array.PushBack(fragment->GetId(e.neighbor()));
+      data_array.PushBack(e.data());
+    }
+    nbrs.PushBack(id_array).PushBack(data_array);
+  }
+
+  std::string batchGetNeighbors(std::shared_ptr<fragment_t>& fragment,
+                                vid_t fid, vid_t start_lid,
+                                const rpc::ReportType& report_type) {
+    if (fragment->fid() == fid) {
+      int cnt = 0;
+      vertex_t v(start_lid);
+      dynamic::Value ret(rapidjson::kObjectType);
+      dynamic::Value batch(rapidjson::kArrayType);
+      while (fragment->IsInnerVertex(v) && cnt < batch_num_) {
+        if (fragment->IsAliveInnerVertex(v)) {
+          dynamic::Value item(rapidjson::kObjectType);
+          dynamic::Value nbrs(rapidjson::kArrayType);
+          fillNeighbors(fragment, v, report_type, nbrs);
+          item.Insert("node", fragment->GetId(v));
+          item.Insert("nbrs", nbrs);
+          batch.PushBack(item);
+          ++cnt;
+        }
+        ++v;
+      }
+      // the same layout with batch_get_nodes, but ret["batch"] store a list
+      // of {"node": id, "nbrs": [[neighbor ids], [edge data]]}.
+      dynamic::Value next(rapidjson::kArrayType);
+      if (!batch.Empty()) {
+        ret.Insert("status", true);
+        ret.Insert("batch", batch);
+        if (fragment->IsInnerVertex(v)) {
+          next.PushBack(fid).PushBack(v.GetValue());
+        } else {
+          next.PushBack(fid + 1).PushBack(0);
+        }
+      } else {
+        ret.Insert("status", false);
+        next.PushBack(fid + 1).PushBack(0);
+      }
+      ret.Insert("next", next);
+      return dynamic::Stringify(ret);
+    }
+    return std::string();
+  }
+
   std::string batchGetNodes(std::shared_ptr<fragment_t>& fragment, vid_t fid,
                             vid_t start_lid) {
     if (fragment->fid() == fid) {
@@ -221,6 +296,202 @@ class DynamicFragmentReporter : public grape::Communicator {
     return std::string();
   }
 
+  // The *ToDataframe methods serialize the columns in the same layout with
+  // the dataframe of context, the archive is gathered to the first fragment,
+  // other fragments return an empty string.
+  std::string nodesToDataframe(std::shared_ptr<fragment_t>& fragment,
+                               const dynamic::Value& attrs) {
+    std::vector<oid_t> ids;
+    std::vector<vertex_t> vertices;
+    for (auto v : fragment->InnerVertices()) {
+      ids.push_back(fragment->GetId(v));
+      vertices.push_back(v);
+    }
+    grape::InArchive arc;
+    writeHeader(attrs.Size() + 1, ids.size(), arc);
+    serializeColumn("id", valuesOf(ids), arc);
+    for (const auto& attr : attrs) {
+      std::vector<const rapidjson::Value*> values;
+      for (auto& v : vertices) {
+        values.push_back(findMember(fragment->GetData(v), attr));
+      }
+      serializeColumn(attr.GetString(), values, arc);
+    }
+    return archiveToString(arc);
+  }
+
+  std::string edgesToDataframe(std::shared_ptr<fragment_t>& fragment,
+                               const dynamic::Value& attrs) {
+    std::vector<oid_t> sources, targets;
+    std::vector<const dynamic::Value*> edge_data;
+    for (auto u : fragment->InnerVertices()) {
+      auto u_gid = fragment->Vertex2Gid(u);
+      for (auto& e : fragment->GetOutgoingAdjList(u)) {
+        // an undirected edge is stored in both of its ends, only report once.
+        if (!fragment->directed() &&
+            u_gid > fragment->Vertex2Gid(e.neighbor())) {
+          continue;
+        }
+        sources.push_back(fragment->GetId(u));
+        targets.push_back(fragment->GetId(e.neighbor()));
+        edge_data.push_back(&e.data());
+      }
+    }
+    grape::InArchive arc;
+    writeHeader(attrs.Size() + 2, sources.size(), arc);
+    serializeColumn("source", valuesOf(sources), arc);
+    serializeColumn("target", valuesOf(targets), arc);
+    for (const auto& attr : attrs) {
+      std::vector<const rapidjson::Value*> values;
+      for (auto data : edge_data) {
+        values.push_back(findMember(*data, attr));
+      }
+      serializeColumn(attr.GetString(), values, arc);
+    }
+    return archiveToString(arc);
+  }
+
+  std::string degreesToDataframe(std::shared_ptr<fragment_t>& fragment,
+                                 const std::string& weight,
+                                 const rpc::ReportType& report_type) {
+    std::vector<dynamic::Value> degrees;
+    for (auto v : fragment->InnerVertices()) {
+      double degree = 0;
+      if (report_type != rpc::IN_DEG_TO_DATAFRAME) {
+        for (auto& e : fragment->GetOutgoingAdjList(v)) {
+          double w = edgeWeight(e.data(), weight);
+          // a selfloop of undirected graph contributes 2 to the degree.
+          degree += (!fragment->directed() && e.neighbor() == v) ? 2 * w : w;
+        }
+      }
+      if (fragment->directed() && report_type != rpc::OUT_DEG_TO_DATAFRAME) {
+        for (auto& e : fragment->GetIncomingAdjList(v)) {
+          degree += edgeWeight(e.data(), weight);
+        }
+      }
+      dynamic::Value degree_value;
+      if (weight.empty()) {
+        degree_value.SetInt64(static_cast<int64_t>(degree));
+      } else {
+        degree_value.SetDouble(degree);
+      }
+      degrees.push_back(std::move(degree_value));
+    }
+    grape::InArchive arc;
+    writeHeader(1, degrees.size(), arc);
+    serializeColumn("degree", valuesOf(degrees), arc);
+    return archiveToString(arc);
+  }
+
+  void writeHeader(size_t column_num, size_t local_row_num,
+                   grape::InArchive& arc) {
+    int64_t local_num = static_cast<int64_t>(local_row_num), total_num = 0;
+    Sum(local_num, total_num);
+    if (comm_spec_.fid() == 0) {
+      arc << static_cast<int64_t>(column_num);
+      arc << total_num;
+    }
+  }
+
+  // Serialize a column of values, the type of the column is decided by the
+  // values in all fragments: int64, double or string if all values are of
+  // the type, otherwise each value is serialized as a json string.
+  void serializeColumn(const std::string& name,
+                       const std::vector<const rapidjson::Value*>& values,
+                       grape::InArchive& arc) {
+    size_t int64_num = 0, double_num = 0, string_num = 0, other_num = 0;
+    for (auto value : values) {
+      if (value != nullptr && value->IsInt64()) {
+        ++int64_num;
+      } else if (value != nullptr && value->IsDouble()) {
+        ++double_num;
+      } else if (value != nullptr && value->IsString()) {
+        ++string_num;
+      } else {
+        ++other_num;
+      }
+    }
+    size_t total_int64_num, total_double_num, total_string_num, total_other_num;
+    Sum(int64_num, total_int64_num);
+    Sum(double_num, total_double_num);
+    Sum(string_num, total_string_num);
+    Sum(other_num, total_other_num);
+
+    int type_id;
+    if (total_other_num > 0 ||
+        (total_string_num > 0 && total_int64_num + total_double_num > 0)) {
+      type_id = rpc::COLUMN_TYPE_JSON;
+    } else if (total_string_num > 0) {
+      type_id = vineyard::TypeToInt<std::string>::value;
+    } else if (total_double_num > 0) {
+      type_id = vineyard::TypeToInt<double>::value;
+    } else {
+      type_id = vineyard::TypeToInt<int64_t>::value;
+    }
+    if (comm_spec_.fid() == 0) {
+      arc << name;
+      arc << type_id;
+    }
+
+    size_t old_size = arc.GetSize();
+    for (auto value : values) {
+      if (type_id == vineyard::TypeToInt<int64_t>::value) {
+        arc << value->GetInt64();
+      } else if (type_id == vineyard::TypeToInt<double>::value) {
+        arc << value->GetDouble();
+      } else if (type_id == vineyard::TypeToInt<std::string>::value) {
+        size_t size = value->GetStringLength();
+        arc << size;
+        arc.AddBytes(value->GetString(), size);
+      } else {
+        std::string json = value == nullptr
+                               ? std::string("null")
+                               : dynamic::Stringify(dynamic::Value(*value));
+        arc << json;
+      }
+    }
+    gather_archives(arc, comm_spec_, old_size);
+  }
+
+  template <typename T>
+  std::vector<const rapidjson::Value*> valuesOf(const std::vector<T>& values) {
+    std::vector<const rapidjson::Value*> ret;
+    ret.reserve(values.size());
+    for (auto& value : values) {
+      ret.push_back(&value);
+    }
+    return ret;
+  }
+
+  const rapidjson::Value* findMember(const rapidjson::Value& data,
+                                     const rapidjson::Value& key) {
+    if (data.IsObject()) {
+      auto member = data.FindMember(key);
+      if (member != data.MemberEnd()) {
+        return &member->value;
+      }
+    }
+    return nullptr;
+  }
+
+  double edgeWeight(const dynamic::Value& data, const std::string& weight) {
+    if (weight.empty() || !data.IsObject()) {
+      return 1;
+    }
+    auto member = data.FindMember(weight.c_str());
+    if (member == data.MemberEnd() || !member->value.IsNumber()) {
+      return 1;
+    }
+    return member->value.GetDouble();
+  }
+
+  std::string archiveToString(const grape::InArchive& arc) {
+    if (comm_spec_.fid() == 0) {
+      return std::string(arc.GetBuffer(), arc.GetSize());
+    }
+    return std::string();
+  }
+
   grape::CommSpec comm_spec_;
   static const int batch_num_ = 100;
 };
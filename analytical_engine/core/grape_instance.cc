@@ -14,6 +14,7 @@
  */
 
 #include <memory>
+#include <string>
 #include <unordered_set>
 #include <utility>
 #include <vector>
@@ -263,6 +264,81 @@ bl::result<std::string> GrapeInstance::reportGraph(
   return wrapper->ReportGraph(comm_spec_, params);
 }
 
+#ifdef NETWORKX
+/**
+ * Parse the nodes or edges to modify from the chunk, which is either a json
+ * array, or a batch in columnar layout if the chunk type is "columnar".
+ *
+ * The columnar batch shares the layout of dataframe in OutArchive: the first
+ * `id_num` columns are the id of nodes (or the src and dst of edges), followed
+ * by the attribute columns. Each row is restored to `[id, {attrs}]` (or `[src,
+ * dst, {attrs}]`), the same as the json one.
+ */
+static bl::result<void> parseModifications(const rpc::Chunk& chunk,
+                                           int64_t id_num,
+                                           dynamic::Value& rows) {
+  const auto& chunk_attr = chunk.attr();
+  auto iter = chunk_attr.find(rpc::CHUNK_TYPE);
+  if (iter == chunk_attr.end() || iter->second.s() != "columnar") {
+    dynamic::Parse(chunk.buffer(), rows);
+    return {};
+  }
+
+  grape::OutArchive arc;
+  arc.SetSlice(const_cast<char*>(chunk.buffer().data()),
+               chunk.buffer().size());
+  int64_t col_num, row_num;
+  arc >> col_num >> row_num;
+  std::vector<std::string> names(col_num);
+  std::vector<std::vector<dynamic::Value>> columns(col_num);
+  for (int64_t i = 0; i < col_num; ++i) {
+    int type;
+    arc >> names[i] >> type;
+    auto& column = columns[i];
+    column.reserve(row_num);
+    for (int64_t j = 0; j < row_num; ++j) {
+      if (type == 4) {
+        int64_t value;
+        arc >> value;
+        column.emplace_back(value);
+      } else if (type == 7) {
+        double value;
+        arc >> value;
+        column.emplace_back(value);
+      } else if (type == 8) {
+        std::string value;
+        arc >> value;
+        column.emplace_back(value);
+      } else {
+        RETURN_GS_ERROR(vineyard::ErrorCode::kInvalidValueError,
+                        "Unsupported column type: " + std::to_string(type));
+      }
+    }
+  }
+
+  rows.SetArray();
+  for (int64_t j = 0; j < row_num; ++j) {
+    if (col_num == 1 && id_num == 1) {
+      rows.PushBack(columns[0][j]);
+      continue;
+    }
+    dynamic::Value row(rapidjson::kArrayType);
+    for (int64_t i = 0; i < id_num; ++i) {
+      row.PushBack(columns[i][j]);
+    }
+    if (col_num > id_num) {
+      dynamic::Value attrs(rapidjson::kObjectType);
+      for (int64_t i = id_num; i < col_num; ++i) {
+        attrs.Insert(names[i], columns[i][j]);
+      }
+      row.PushBack(attrs);
+    }
+    rows.PushBack(row);
+  }
+  return {};
+}
+#endif  // NETWORKX
+
 bl::result<void> GrapeInstance::modifyVertices(const rpc::GSParams& params) {
 #ifdef NETWORKX
   BOOST_LEAF_AUTO(modify_type, params.Get<rpc::ModifyType>(rpc::MODIFY_TYPE));
@@ -283,9 +359,8 @@ bl::result<void> GrapeInstance::modifyVertices(const rpc::GSParams& params) {
   dynamic::Value common_attr, nodes;
   // the common attribute for all nodes to be modified
   dynamic::Parse(common_attr_json, common_attr);
-  std::string nodes_json =
-      params.GetLargeAttr().chunk_list().items()[0].buffer();
-  dynamic::Parse(nodes_json, nodes);
+  BOOST_LEAF_CHECK(parseModifications(
+      params.GetLargeAttr().chunk_list().items()[0], 1, nodes));
   auto fragment =
       std::static_pointer_cast<DynamicFragment>(wrapper->fragment());
 
@@ -321,9 +396,8 @@ bl::result<void> GrapeInstance::modifyEdges(const rpc::GSParams& params) {
   if (params.HasKey(rpc::EDGE_KEY)) {
     BOOST_LEAF_AUTO(weight, params.Get<std::string>(rpc::EDGE_KEY));
   }
-  std::string edges_json =
-      params.GetLargeAttr().chunk_list().items()[0].buffer();
-  dynamic::Parse(edges_json, edges);
+  BOOST_LEAF_CHECK(parseModifications(
+      params.GetLargeAttr().chunk_list().items()[0], 2, edges));
   auto fragment =
       std::static_pointer_cast<DynamicFragment>(wrapper->fragment());
   fragment->ModifyEdges(edges, common_attr, modify_type, weight);
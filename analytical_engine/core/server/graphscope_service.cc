@@ -64,7 +64,8 @@ Status GraphScopeService::HeartBeat(ServerContext* context,
       auto* chunk_list = mutable_large_attr->mutable_chunk_list();
       for (const auto& chunk_meta : large_attr.chunk_meta_list().items()) {
         auto* chunk = chunk_list->add_items();
-        if (chunk_meta.size() > 0) {
+        // size is -1 for the chunks streamed by client
+        if (chunk_meta.size() != 0) {
           // set buffer
           chunk->set_buffer(std::move(chunks.front()));
           chunks.pop();
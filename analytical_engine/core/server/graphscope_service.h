@@ -77,6 +77,7 @@ class GraphScopeService final : public EngineService::Service {
       for (size_t i = 0; i < data.size(); i += chunk_size_) {
         RunStepResponse response_body;
         auto* body = response_body.mutable_body();
+        body->set_op_key(op_result->key());
         if ((i + chunk_size_) >= data.size()) {
           body->mutable_chunk()->assign(data.begin() + i, data.end());
           body->set_has_next(false);
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the time that :class:`gscoordinator.dag_manager.DAGManager` takes to
+split a synthetic RunStep request, which loads `--graphs` graphs from pandas,
+each of which is shipped in `--chunks` chunks, and runs an app on each of them:
+
+    python3 benchmarks/dag_split.py --graphs 100 --chunks 100
+"""
+
+import argparse
+import time
+
+from graphscope.proto import message_pb2
+from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
+
+from gscoordinator.dag_manager import DAGManager
+
+
+def generate(num_graphs, num_chunks, chunk_size):
+    dag_def = op_def_pb2.DagDef()
+    bodies = []
+    chunk = b"x" * chunk_size
+    for i in range(num_graphs):
+        source = dag_def.op.add(key="source_%d" % i, op=types_pb2.DATA_SOURCE)
+        graph = dag_def.op.add(
+            key="graph_%d" % i, op=types_pb2.CREATE_GRAPH, parents=[source.key]
+        )
+        app = dag_def.op.add(key="app_%d" % i, op=types_pb2.CREATE_APP)
+        bound = dag_def.op.add(
+            key="bound_%d" % i, op=types_pb2.BIND_APP, parents=[graph.key, app.key]
+        )
+        dag_def.op.add(key="context_%d" % i, op=types_pb2.RUN_APP, parents=[bound.key])
+        for j in range(num_chunks):
+            bodies.append(
+                message_pb2.RunStepRequest(
+                    body=message_pb2.RunStepRequestBody(
+                        chunk=chunk, op_key=source.key, has_next=j + 1 < num_chunks
+                    )
+                )
+            )
+    head = message_pb2.RunStepRequest(
+        head=message_pb2.RunStepRequestHead(dag_def=dag_def)
+    )
+    return [head] + bodies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--graphs", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    requests = generate(args.graphs, args.chunks, args.chunk_size)
+    elapsed = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        dag_manager = DAGManager(requests)
+        elapsed.append(time.perf_counter() - start)
+    print(
+        "%d ops, %d chunks, %d dags: %.3f ms"
+        % (
+            args.graphs * 5,
+            args.graphs * args.chunks,
+            len(dag_manager),
+            min(elapsed) * 1000,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
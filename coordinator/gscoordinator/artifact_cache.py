@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Cache of the compiled libraries of apps and graph frames, shared by
+coordinators.
+"""
+
+import contextlib
+import fcntl
+import functools
+import hashlib
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import uuid
+
+from gscoordinator.version import __version__
+
+logger = logging.getLogger("graphscope")
+
+
+@functools.lru_cache()
+def get_toolchain_info():
+    """The toolchain that the libraries are built with, i.e., the version of
+    graphscope, the platform, the c++ compiler and cmake.
+    """
+
+    def _first_line_of_version(command):
+        path = shutil.which(command)
+        if path is None:
+            return ""
+        try:
+            output = subprocess.check_output(
+                [path, "--version"], stderr=subprocess.STDOUT
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return ""
+        return output.decode("utf-8", errors="replace").split("\n", 1)[0]
+
+    return "\n".join(
+        [
+            __version__,
+            platform.system(),
+            platform.machine(),
+            "-".join(platform.libc_ver()),
+            _first_line_of_version(os.environ.get("CXX", "c++")),
+            _first_line_of_version("cmake"),
+        ]
+    )
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive lock of the file `path`, which waits for the holders in
+    other threads and processes, e.g., coordinators that share a volume.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class LocalArtifactStore(object):
+    """Artifacts in a local directory, which may be a volume shared by the
+    coordinators of different sessions and pods.
+    """
+
+    def __init__(self, root):
+        self._root = root
+        os.makedirs(self._root, exist_ok=True)
+
+    def __repr__(self):
+        return self._root
+
+    def lock(self, key):
+        return file_lock(os.path.join(self._root, key + ".lock"))
+
+    def get(self, key, path):
+        artifact = os.path.join(self._root, key)
+        if not os.path.isfile(artifact):
+            return False
+        _copy_atomically(artifact, path)
+        return True
+
+    def put(self, key, path):
+        _copy_atomically(path, os.path.join(self._root, key))
+
+
+class FsspecArtifactStore(object):
+    """Artifacts in an object store, e.g., s3 or oss, accessed through `fsspec`.
+
+    An object store has no locks, the coordinators that share no volume may build
+    the same library at the same time, and the last one wins.
+    """
+
+    def __init__(self, url):
+        import fsspec
+
+        self._url = url
+        self._fs, self._root = fsspec.core.url_to_fs(url)
+
+    def __repr__(self):
+        return self._url
+
+    def lock(self, key):
+        return contextlib.nullcontext()
+
+    def get(self, key, path):
+        artifact = self._root.rstrip("/") + "/" + key
+        if not self._fs.exists(artifact):
+            return False
+        tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            self._fs.get(artifact, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return True
+
+    def put(self, key, path):
+        self._fs.put(path, self._root.rstrip("/") + "/" + key)
+
+
+def _copy_atomically(src, dst):
+    # readers never see a partially written library
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = "%s.%s.tmp" % (dst, uuid.uuid4().hex)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class ArtifactCache(object):
+    """Content-addressed cache of compiled libraries, keyed by the signature of
+    the app or graph frame together with the toolchain.
+
+    The builds of the same library wait on a lock, so that concurrent sessions on
+    one host, and ones that share a local store, build it only once. Libraries are
+    fetched from and published to the `store` if it is given.
+    """
+
+    def __init__(self, store=None):
+        self._store = store
+
+    @staticmethod
+    def from_uri(uri):
+        """Create the cache by `uri`, a local directory or an url of `fsspec`,
+        and without a shared store if `uri` is empty.
+        """
+        if not uri:
+            return ArtifactCache()
+        if uri.startswith("file://"):
+            uri = uri[len("file://") :]
+        elif "://" in uri:
+            return ArtifactCache(FsspecArtifactStore(uri))
+        return ArtifactCache(LocalArtifactStore(uri))
+
+    @property
+    def store(self):
+        return self._store
+
+    def key(self, signature):
+        return hashlib.sha256(
+            f"{signature}\n{get_toolchain_info()}".encode("utf-8")
+        ).hexdigest()
+
+    def fetch_or_build(self, signature, lib_path, build, distribute=None):
+        """Get the library of `signature` to `lib_path`.
+
+        The library is fetched or built to a temporary path, and moved to
+        `lib_path` only after it is distributed, thus a library at `lib_path` is
+        always complete, on all hosts.
+
+        Args:
+            signature (str): The signature of the app or graph frame.
+            lib_path (str): Where the library is expected.
+            build (callable): Build the library and return its path, and whether
+                it could be shared with other coordinators.
+            distribute (callable, optional): `distribute(path, dest)` ships the
+                library at `path` to `dest` on the hosts of engines.
+
+        Returns:
+            str: The path of the library.
+        """
+        key = self.key(signature)
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(file_lock(lib_path + ".lock"))
+            if self._store is not None:
+                stack.enter_context(self._store.lock(key))
+            # built by the holder of the lock we've waited for
+            if os.path.isfile(lib_path):
+                return lib_path
+            tmp = "%s.%s.tmp" % (lib_path, uuid.uuid4().hex)
+            try:
+                if not self._fetch(key, tmp):
+                    built_path, shareable = build()
+                    if self._store is not None and shareable:
+                        try:
+                            self._store.put(key, built_path)
+                        except Exception as e:  # pylint: disable=broad-except
+                            logger.warning(
+                                "Failed to publish %s to %s: %s", key, self._store, e
+                            )
+                    shutil.copyfile(built_path, tmp)
+                if distribute is not None:
+                    distribute(tmp, lib_path)
+                os.replace(tmp, lib_path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            return lib_path
+
+    def _fetch(self, key, path):
+        if self._store is None:
+            return False
+        try:
+            if self._store.get(key, path):
+                logger.info("Fetched %s from %s", key, self._store)
+                return True
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Failed to fetch %s from %s: %s", key, self._store, e)
+        return False
@@ -60,6 +60,7 @@ from graphscope.framework.utils import get_tempdir
 from graphscope.framework.utils import is_free_port
 from graphscope.proto import types_pb2
 
+from gscoordinator.distributor import KubectlFileDistributor
 from gscoordinator.launcher import Launcher
 from gscoordinator.utils import ANALYTICAL_ENGINE_PATH
 from gscoordinator.utils import GRAPHSCOPE_HOME
@@ -319,32 +320,10 @@ class KubernetesClusterLauncher(Launcher):
         """String of a list of pod name, comma separated."""
         return ",".join(self._pod_name_list)
 
-    def distribute_file(self, path):
-        d = os.path.dirname(path)
-        for pod in self._pod_name_list:
-            subprocess.check_call(
-                [
-                    shutil.which("kubectl"),
-                    "exec",
-                    pod,
-                    "-c",
-                    "engine",
-                    "--",
-                    "mkdir",
-                    "-p",
-                    d,
-                ]
-            )
-            subprocess.check_call(
-                [
-                    shutil.which("kubectl"),
-                    "cp",
-                    path,
-                    "{}:{}".format(pod, path),
-                    "-c",
-                    "engine",
-                ]
-            )
+    def distribute_file(self, path, dest=None):
+        KubectlFileDistributor(container="engine").distribute(
+            path, self._pod_name_list, dest
+        )
 
     def create_interactive_instance(self, config: dict):
         """
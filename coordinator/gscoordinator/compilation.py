@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+""" Compile the libraries of apps and graph frames in background.
+"""
+
+import functools
+import os
+import threading
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CompilationService(object):
+    """Compile libraries in a bounded pool of threads.
+
+    There are `parallelism` build slots, i.e., parallel jobs of make, which are
+    shared by all the running builds. A build asks for an even share of the slots
+    among the builds submitted together, and takes the ones that are free when it
+    starts, at least one, thus the jobs of make never exceed `parallelism` in
+    total. Builds of the same signature
+    are deduplicated, e.g., the build of an app that is compiled ahead of execution
+    is waited by the op that binds the app later.
+    """
+
+    def __init__(self, parallelism=None):
+        self._parallelism = parallelism or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._parallelism, thread_name_prefix="compile"
+        )
+        # signature -> future of the ongoing build
+        self._builds = {}
+        self._lock = threading.RLock()
+        self._free_slots = self._parallelism
+        self._slots = threading.Condition()
+
+    @property
+    def parallelism(self):
+        return self._parallelism
+
+    def submit(self, signature, build):
+        """Submit a build, see :meth:`submit_all`."""
+        return self.submit_all([(signature, build)])[0]
+
+    def submit_all(self, builds):
+        """Submit `builds`, a list of `(signature, build)`, where `build(jobs)`
+        builds the library with `jobs` parallel jobs and returns its path.
+
+        Returns:
+            A list of :class:`concurrent.futures.Future` of the paths.
+        """
+        jobs = max(1, self._parallelism // max(1, len(builds)))
+        results = []
+        with self._lock:
+            for signature, build in builds:
+                future = self._builds.get(signature)
+                if future is None:
+                    future = self._executor.submit(self._run, build, jobs)
+                    self._builds[signature] = future
+                    future.add_done_callback(functools.partial(self._done, signature))
+                results.append(future)
+        return results
+
+    def wait(self, signature):
+        """Wait for the ongoing build of `signature` if there is one, where the
+        failure is left to the caller that builds it again.
+        """
+        with self._lock:
+            future = self._builds.get(signature)
+        if future is not None:
+            futures.wait([future])
+
+    def _run(self, build, jobs):
+        with self._slots:
+            self._slots.wait_for(lambda: self._free_slots > 0)
+            jobs = min(jobs, self._free_slots)
+            self._free_slots -= jobs
+        try:
+            return build(jobs)
+        finally:
+            with self._slots:
+                self._free_slots += jobs
+                self._slots.notify_all()
+
+    def _done(self, signature, future):
+        with self._lock:
+            if self._builds.get(signature) is future:
+                del self._builds[signature]
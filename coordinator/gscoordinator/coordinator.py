@@ -20,7 +20,9 @@
 
 import argparse
 import atexit
+import copy
 import datetime
+import functools
 import json
 import logging
 import os
@@ -32,6 +34,7 @@ import signal
 import string
 import sys
 import threading
+import time
 import traceback
 import urllib.parse
 import urllib.request
@@ -46,7 +49,10 @@ from gscoordinator.io_utils import StdStreamWrapper
 sys.stdout = StdStreamWrapper(sys.stdout)
 sys.stderr = StdStreamWrapper(sys.stderr)
 
+from graphscope.client.utils import BodyCompressor
 from graphscope.client.utils import GRPCUtils
+from graphscope.client.utils import negotiate_compression
+from graphscope.framework import tracing
 from graphscope.framework import utils
 from graphscope.framework.dag_utils import create_graph
 from graphscope.framework.dag_utils import create_loader
@@ -66,7 +72,9 @@ from graphscope.proto import message_pb2
 from graphscope.proto import op_def_pb2
 from graphscope.proto import types_pb2
 
+from gscoordinator.artifact_cache import ArtifactCache
 from gscoordinator.cluster import KubernetesClusterLauncher
+from gscoordinator.compilation import CompilationService
 from gscoordinator.dag_manager import DAGManager
 from gscoordinator.dag_manager import GSEngine
 from gscoordinator.dag_manager import split_op_result
@@ -77,6 +85,7 @@ from gscoordinator.object_manager import InteractiveQueryManager
 from gscoordinator.object_manager import LearningInstanceManager
 from gscoordinator.object_manager import LibMeta
 from gscoordinator.object_manager import ObjectManager
+from gscoordinator.object_manager import OpPool
 from gscoordinator.utils import GRAPHSCOPE_HOME
 from gscoordinator.utils import WORKSPACE
 from gscoordinator.utils import check_gremlin_server_ready
@@ -98,6 +107,19 @@ GS_DEBUG_ENDPOINT = os.environ.get("GS_DEBUG_ENDPOINT", "")
 # 2 GB
 GS_GRPC_MAX_MESSAGE_LENGTH = 2 * 1024 * 1024 * 1024 - 1
 
+# shared cache of compiled apps and graph frames, a directory or an url of fsspec,
+# e.g., s3://bucket/path
+ARTIFACT_CACHE = os.environ.get("GS_ARTIFACT_CACHE", "")
+
+# number of parallel jobs to compile apps and graph frames, defaults to cpu count
+COMPILE_PARALLELISM = int(os.environ.get("GS_COMPILE_PARALLELISM", 0)) or None
+
+# number of ops kept in coordinator after they are no longer live
+OP_POOL_CAPACITY = int(os.environ.get("GS_OP_POOL_CAPACITY", 1024))
+
+# number of response chunks buffered in coordinator when relaying them to client
+RELAY_QUEUE_SIZE = 2
+
 logger = logging.getLogger("graphscope")
 
 
@@ -115,11 +137,23 @@ class CoordinatorServiceServicer(
 
     """
 
+    _engine_error_codes = {
+        GSEngine.analytical_engine: error_codes_pb2.ANALYTICAL_ENGINE_INTERNAL_ERROR,
+        GSEngine.interactive_engine: error_codes_pb2.INTERACTIVE_ENGINE_INTERNAL_ERROR,
+        GSEngine.learning_engine: error_codes_pb2.LEARNING_ENGINE_INTERNAL_ERROR,
+        GSEngine.coordinator: error_codes_pb2.COORDINATOR_INTERNAL_ERROR,
+    }
+
     def __init__(self, launcher, dangling_timeout_seconds, log_level="INFO"):
         self._launcher = launcher
 
         self._request = None
+        # the codec to compress the chunks of RunStep with, negotiated with the client
+        self._compression = ""
         self._object_manager = ObjectManager()
+        self._op_pool = OpPool(OP_POOL_CAPACITY, self._object_manager)
+        self._artifact_cache = ArtifactCache.from_uri(ARTIFACT_CACHE)
+        self._compilation_service = CompilationService(COMPILE_PARALLELISM)
         self._grpc_utils = GRPCUtils()
         self._dangling_detecting_timer = None
         self._config_logging(log_level)
@@ -146,6 +180,11 @@ class CoordinatorServiceServicer(
         if self._launcher_type == types_pb2.K8S:
             self._k8s_namespace = self._launcher.get_namespace()
 
+        # runs the independent parts of a dag on engines concurrently
+        self._dag_executor = futures.ThreadPoolExecutor(
+            max_workers=len(GSEngine), thread_name_prefix="dag-runner"
+        )
+
         # analytical engine
         self._analytical_engine_stub = self._create_grpc_stub()
         self._analytical_engine_config = None
@@ -211,6 +250,8 @@ class CoordinatorServiceServicer(
         # A session is already connected.
         if self._request:
             if getattr(request, "reconnect", False):
+                # the client may be another one, with other codecs
+                self._compression = negotiate_compression(request.compressions)
                 return message_pb2.ConnectSessionResponse(
                     session_id=self._session_id,
                     cluster_type=self._launcher.type(),
@@ -218,6 +259,7 @@ class CoordinatorServiceServicer(
                     engine_config=json.dumps(self._analytical_engine_config),
                     pod_name_list=self._engine_hosts.split(","),
                     namespace=self._k8s_namespace,
+                    compression=self._compression,
                 )
             # connect failed, more than one connection at the same time.
             context.set_code(grpc.StatusCode.ALREADY_EXISTS)
@@ -226,9 +268,7 @@ class CoordinatorServiceServicer(
             )
             return message_pb2.ConnectSessionResponse()
         # Connect to serving coordinator.
-        self._key_to_op = {}
-        # dict of op_def_pb2.OpResult
-        self._op_result_pool = {}
+        self._op_pool.clear()
         self._request = request
         try:
             self._analytical_engine_config = self._get_engine_config()
@@ -262,6 +302,8 @@ class CoordinatorServiceServicer(
                 __version__,
             )
 
+        self._compression = negotiate_compression(self._request.compressions)
+
         return message_pb2.ConnectSessionResponse(
             session_id=self._session_id,
             cluster_type=self._launcher.type(),
@@ -269,6 +311,7 @@ class CoordinatorServiceServicer(
             engine_config=json.dumps(self._analytical_engine_config),
             pod_name_list=self._engine_hosts.split(","),
             namespace=self._k8s_namespace,
+            compression=self._compression,
         )
 
     def HeartBeat(self, request, context):
@@ -309,14 +352,26 @@ class CoordinatorServiceServicer(
                 f"Connect analytical engine failed with unknown exception, {traceback.format_exc()}"
             )
 
-        return message_pb2.HeartBeatResponse()
+        # the sizes of op pool, maintained as ops are put and retired
+        return message_pb2.HeartBeatResponse(
+            op_pool_stats=message_pb2.OpPoolStats(**self._op_pool.stats())
+        )
 
+    @tracing.traced
     def run_on_analytical_engine(  # noqa: C901
         self,
         dag_def: op_def_pb2.DagDef,
         dag_bodies,
         loader_op_bodies: dict,
+        emit=None,
     ):
+        """Run the dag on analytical engine.
+
+        The chunks of large results are relayed to `emit` as soon as they arrive
+        from the engine if it is given, otherwise collected and returned along with
+        the head.
+        """
+
         def _generate_runstep_request(session_id, dag_def, dag_bodies):
             runstep_requests = []
             # head
@@ -333,11 +388,11 @@ class CoordinatorServiceServicer(
 
         # preprocess of op before run on analytical engine
         for op in dag_def.op:
-            self._key_to_op[op.key] = op
+            self._op_pool.put_op(op)
             op_pre_process(
                 op,
-                self._op_result_pool,
-                self._key_to_op,
+                self._op_pool.results,
+                self._op_pool.ops,
                 engine_hosts=self._engine_hosts,
                 engine_config=self._analytical_engine_config,
             )
@@ -345,7 +400,7 @@ class CoordinatorServiceServicer(
             # Handle op that depends on loader (data source)
             if op.op == types_pb2.CREATE_GRAPH or op.op == types_pb2.ADD_LABELS:
                 for key_of_parent_op in op.parents:
-                    parent_op = self._key_to_op[key_of_parent_op]
+                    parent_op = self._op_pool.ops[key_of_parent_op]
                     if parent_op.op == types_pb2.DATA_SOURCE:
                         # handle bodies of loader op
                         if parent_op.key in loader_op_bodies:
@@ -359,16 +414,7 @@ class CoordinatorServiceServicer(
             # arrow property graph and project graph need to compile
             # If engine crashed, we will get a SocketClosed grpc Exception.
             # In that case, we should notify client the engine is dead.
-            if (
-                (
-                    op.op == types_pb2.CREATE_GRAPH
-                    and op.attr[types_pb2.GRAPH_TYPE].graph_type
-                    == graph_def_pb2.ARROW_PROPERTY
-                )
-                or op.op == types_pb2.TRANSFORM_GRAPH
-                or op.op == types_pb2.PROJECT_TO_SIMPLE
-                or op.op == types_pb2.ADD_LABELS
-            ):
+            if self._requires_graph_frame(op):
                 op = self._maybe_register_graph(op, self._session_id)
 
         # generate runstep requests, and run on analytical engine
@@ -376,13 +422,30 @@ class CoordinatorServiceServicer(
         # response
         response_head = None
         response_bodies = []
+        start, chunks, chunk_bytes = time.time_ns(), 0, 0
         try:
             responses = self._analytical_engine_stub.RunStep(requests)
+            # keys of the large results, in the order of chunks
+            keys, cursor = [], 0
             for response in responses:
                 if response.HasField("head"):
                     response_head = response
-                else:
+                    keys = [
+                        op_result.key
+                        for op_result in response.head.results
+                        if op_result.has_large_result
+                    ]
+                    continue
+                if not response.body.op_key and cursor < len(keys):
+                    response.body.op_key = keys[cursor]
+                if not response.body.has_next:
+                    cursor += 1
+                chunks += 1
+                chunk_bytes += len(response.body.chunk)
+                if emit is None:
                     response_bodies.append(response)
+                else:
+                    emit(response)
         except grpc.RpcError as e:
             logger.error(
                 "Engine RunStep failed, code: %s, details: %s",
@@ -399,6 +462,15 @@ class CoordinatorServiceServicer(
                 raise AnalyticalEngineInternalError(msg)
             else:
                 raise
+        trace = tracing.current_trace()
+        if trace is not None:
+            trace.record(
+                "analytical_engine.RunStep",
+                start,
+                time.time_ns(),
+                chunks=chunks,
+                chunk_bytes=chunk_bytes,
+            )
 
         # handle result from response stream
         if response_head is None:
@@ -407,9 +479,9 @@ class CoordinatorServiceServicer(
             )
         for op_result in response_head.head.results:
             # record result in coordinator, which doesn't contains large data
-            self._op_result_pool[op_result.key] = op_result
+            self._op_pool.put_result(op_result)
             # get the op corresponding to the result
-            op = self._key_to_op[op_result.key]
+            op = self._op_pool.ops[op_result.key]
             # register graph and dump graph schema
             if op.op in (
                 types_pb2.CREATE_GRAPH,
@@ -452,17 +524,18 @@ class CoordinatorServiceServicer(
                 self._object_manager.pop(op.attr[types_pb2.APP_NAME].s.decode())
         return response_head, response_bodies
 
-    def run_on_interactive_engine(self, dag_def: op_def_pb2.DagDef):
+    @tracing.traced
+    def run_on_interactive_engine(self, dag_def: op_def_pb2.DagDef, emit=None):
         response_head = message_pb2.RunStepResponse(
             head=message_pb2.RunStepResponseHead()
         )
         response_bodies = []
         for op in dag_def.op:
-            self._key_to_op[op.key] = op
+            self._op_pool.put_op(op)
             op_pre_process(
                 op,
-                self._op_result_pool,
-                self._key_to_op,
+                self._op_pool.results,
+                self._op_pool.ops,
                 engine_hosts=self._engine_hosts,
                 engine_config=self._analytical_engine_config,
             )
@@ -484,28 +557,31 @@ class CoordinatorServiceServicer(
                 has_next = True
                 if i + 1 == len(splited_result):
                     has_next = False
-                response_bodies.append(
-                    message_pb2.RunStepResponse(
-                        body=message_pb2.RunStepResponseBody(
-                            chunk=chunk, has_next=has_next
-                        )
+                response_body = message_pb2.RunStepResponse(
+                    body=message_pb2.RunStepResponseBody(
+                        chunk=chunk, has_next=has_next, op_key=op.key
                     )
                 )
+                if emit is None:
+                    response_bodies.append(response_body)
+                else:
+                    emit(response_body)
             # record op result
-            self._op_result_pool[op.key] = op_result
+            self._op_pool.put_result(op_result)
         return response_head, response_bodies
 
+    @tracing.traced
     def run_on_learning_engine(self, dag_def: op_def_pb2.DagDef):
         response_head = message_pb2.RunStepResponse(
             head=message_pb2.RunStepResponseHead()
         )
         response_bodies = []
         for op in dag_def.op:
-            self._key_to_op[op.key] = op
+            self._op_pool.put_op(op)
             op_pre_process(
                 op,
-                self._op_result_pool,
-                self._key_to_op,
+                self._op_pool.results,
+                self._op_pool.ops,
                 engine_hosts=self._engine_hosts,
                 engine_config=self._analytical_engine_config,
             )
@@ -516,9 +592,10 @@ class CoordinatorServiceServicer(
             else:
                 raise RuntimeError("Unsupport op type: " + str(op.op))
             response_head.head.results.append(op_result)
-            self._op_result_pool[op.key] = op_result
+            self._op_pool.put_result(op_result)
         return response_head, response_bodies
 
+    @tracing.traced
     def run_on_coordinator(
         self,
         dag_def: op_def_pb2.DagDef,
@@ -530,11 +607,11 @@ class CoordinatorServiceServicer(
         )
         response_bodies = []
         for op in dag_def.op:
-            self._key_to_op[op.key] = op
+            self._op_pool.put_op(op)
             op_pre_process(
                 op,
-                self._op_result_pool,
-                self._key_to_op,
+                self._op_pool.results,
+                self._op_pool.ops,
                 engine_hosts=self._engine_hosts,
                 engine_config=self._analytical_engine_config,
             )
@@ -545,78 +622,205 @@ class CoordinatorServiceServicer(
             else:
                 raise RuntimeError("Unsupport op type: " + str(op.op))
             response_head.head.results.append(op_result)
-            self._op_result_pool[op.key] = op_result
+            self._op_pool.put_result(op_result)
         return response_head, response_bodies
 
     def RunStep(self, request_iterator, context):
+        start = time.time_ns()
         # split dag
         dag_manager = DAGManager(request_iterator)
         loader_op_bodies = {}
+        # spans are recorded and returned when the client traces the run
+        trace = None
+        if dag_manager.trace_id:
+            trace = tracing.Trace(dag_manager.trace_id, process="coordinator")
+            trace.record(
+                "RunStep.receive_and_split",
+                start,
+                time.time_ns(),
+                dags=len(dag_manager),
+            )
 
-        # response list for stream
-        responses = []
-        # head
-        responses.append(
-            message_pb2.RunStepResponse(head=message_pb2.RunStepResponseHead())
-        )
-
-        while not dag_manager.empty():
-            run_dag_on, dag, dag_bodies = dag_manager.next_dag()
+        # chunks of large results are relayed to the client as soon as they
+        # arrive from engines, keyed by op, and the head follows at the end,
+        # so at most a few chunks are held in the coordinator.
+        bodies = queue.Queue(maxsize=RELAY_QUEUE_SIZE)
+        cancelled = threading.Event()
+        compressor = BodyCompressor(self._compression)
+
+        def _emit(response):
+            if response is not None:
+                # compressed by the producers, rather than the sending thread
+                compressor.compress(response.body)
+            while not cancelled.is_set():
+                try:
+                    bodies.put(response, timeout=1)
+                    return
+                except queue.Full:
+                    pass
+
+        def _run_dag(run_dag_on, dag, dag_bodies):
+            with tracing.activate(trace):
+                return _run_dag_on(run_dag_on, dag, dag_bodies)
+
+        def _run_dag_on(run_dag_on, dag, dag_bodies):
+            # run on analytical engine
+            if run_dag_on == GSEngine.analytical_engine:
+                # need dag_bodies to load graph from pandas/numpy
+                return self.run_on_analytical_engine(
+                    dag, dag_bodies, loader_op_bodies, _emit
+                )
+            # run on interactive engine
+            if run_dag_on == GSEngine.interactive_engine:
+                return self.run_on_interactive_engine(dag, _emit)
+            # run on learning engine
+            if run_dag_on == GSEngine.learning_engine:
+                return self.run_on_learning_engine(dag)
+            # run on coordinator
+            return self.run_on_coordinator(dag, dag_bodies, loader_op_bodies)
+
+        def _run_dags():
             try:
-                # run on analytical engine
-                if run_dag_on == GSEngine.analytical_engine:
-                    # need dag_bodies to load graph from pandas/numpy
-                    error_code = error_codes_pb2.ANALYTICAL_ENGINE_INTERNAL_ERROR
-                    head, bodies = self.run_on_analytical_engine(
-                        dag, dag_bodies, loader_op_bodies
-                    )
-                # run on interactive engine
-                elif run_dag_on == GSEngine.interactive_engine:
-                    error_code = error_codes_pb2.INTERACTIVE_ENGINE_INTERNAL_ERROR
-                    head, bodies = self.run_on_interactive_engine(dag)
-                # run on learning engine
-                elif run_dag_on == GSEngine.learning_engine:
-                    error_code = error_codes_pb2.LEARNING_ENGINE_INTERNAL_ERROR
-                    head, bodies = self.run_on_learning_engine(dag)
-                # run on coordinator
-                elif run_dag_on == GSEngine.coordinator:
-                    error_code = error_codes_pb2.COORDINATOR_INTERNAL_ERROR
-                    head, bodies = self.run_on_coordinator(
-                        dag, dag_bodies, loader_op_bodies
-                    )
-                # merge the responses
-                responses[0].head.results.extend(head.head.results)
-                responses.extend(bodies)
-            except grpc.RpcError as exc:
+                with tracing.activate(trace):
+                    self._compile_ahead(dag_manager)
+                return dag_manager.run(_run_dag, self._dag_executor, cancelled)
+            finally:
+                # drop the ops that are no longer referred to, before the head is
+                # sent, and even if the client is gone
+                self._op_pool.retire(dag_manager.op_keys())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Op pool after step: %s", self._op_pool.stats())
+                _emit(None)
+
+        runner = futures.Future()
+
+        def _run():
+            try:
+                runner.set_result(_run_dags())
+            except Exception as exc:  # pylint: disable=broad-except
+                runner.set_exception(exc)
+
+        threading.Thread(target=_run, daemon=True).start()
+        try:
+            while True:
+                response = bodies.get()
+                if response is None:
+                    break
+                yield response
+        finally:
+            # the client may be gone
+            cancelled.set()
+        results, failure = runner.result()
+
+        response_head = message_pb2.RunStepResponse(
+            head=message_pb2.RunStepResponseHead()
+        )
+        # merge the heads in the order of dags
+        for result in results:
+            if result is not None:
+                head, _ = result
+                response_head.head.results.extend(head.head.results)
+
+        if failure is not None:
+            run_dag_on, exc = failure
+            if isinstance(exc, grpc.RpcError):
                 # Not raised by graphscope, maybe socket closed, etc
                 context.set_code(exc.code())
                 context.set_details(exc.details())
-                for response in responses:
-                    yield response
-            except Exception as exc:
-                response_head = responses[0]
-                response_head.head.code = error_code
+            else:
+                response_head.head.code = self._engine_error_codes[run_dag_on]
                 response_head.head.error_msg = (
                     "Error occurred during preprocessing, The traceback is: {0}".format(
-                        traceback.format_exc()
+                        "".join(
+                            traceback.format_exception(
+                                type(exc), exc, exc.__traceback__
+                            )
+                        )
                     )
                 )
                 response_head.head.full_exception = pickle.dumps(exc)
-                for response in responses:
-                    yield response
 
-        for response in responses:
-            yield response
+        if trace is not None:
+            trace.record("RunStep", start, time.time_ns())
+            response_head.head.trace_events = json.dumps(trace.events).encode("utf-8")
+        yield response_head
+
+    @staticmethod
+    def _requires_graph_frame(op):
+        # arrow property graph and project graph need to compile
+        return (
+            (
+                op.op == types_pb2.CREATE_GRAPH
+                and op.attr[types_pb2.GRAPH_TYPE].graph_type
+                == graph_def_pb2.ARROW_PROPERTY
+            )
+            or op.op == types_pb2.TRANSFORM_GRAPH
+            or op.op == types_pb2.PROJECT_TO_SIMPLE
+            or op.op == types_pb2.ADD_LABELS
+        )
+
+    def _workspace_of(self, op):
+        if types_pb2.GAR in op.attr:
+            return self._udf_app_workspace
+        return self._builtin_workspace
 
+    @tracing.traced
+    def _compile_ahead(self, dag_manager):
+        """Compile the apps and graph frames of the dags concurrently before the
+        dags run, as the analytical engine runs the dags one by one.
+
+        Only the ops whose parents have been evaluated are compiled ahead, as their
+        signatures depend on the results of parents. The others are compiled when
+        they run, as usual.
+        """
+        key_to_op = dict(self._op_pool.ops)
+        key_to_op.update((op.key, op) for op in dag_manager.ops())
+        builds = {}
+        for op in dag_manager.ops():
+            if op.op == types_pb2.BIND_APP:
+                compile_func, get_sha256 = compile_app, get_app_sha256
+            elif self._requires_graph_frame(op):
+                compile_func, get_sha256 = compile_graph_frame, get_graph_sha256
+            else:
+                continue
+            op = copy.deepcopy(op)
+            try:
+                op_pre_process(
+                    op,
+                    self._op_pool.results,
+                    key_to_op,
+                    engine_hosts=self._engine_hosts,
+                    engine_config=self._analytical_engine_config,
+                )
+                sig = get_sha256(op.attr)
+            except Exception:  # pylint: disable=broad-except
+                # the parents are not evaluated yet
+                continue
+            space = self._workspace_of(op)
+            lib_path = get_lib_path(os.path.join(space, sig), sig)
+            precompiled_lib_path = get_lib_path(
+                os.path.join(GRAPHSCOPE_HOME, "precompiled", "builtin", sig), sig
+            )
+            if not os.path.isfile(lib_path) and not os.path.isfile(
+                precompiled_lib_path
+            ):
+                builds[sig] = functools.partial(
+                    self._compile_lib, compile_func, sig, op
+                )
+        if builds:
+            logger.info("Compiling %d libraries ahead", len(builds))
+            self._compilation_service.submit_all(list(builds.items()))
+
+    @tracing.traced
     def _maybe_compile_app(self, op):
         app_sig = get_app_sha256(op.attr)
+        # the library may be being compiled ahead
+        self._compilation_service.wait(app_sig)
         # try to get compiled file from GRAPHSCOPE_HOME/precompiled
         space = os.path.join(GRAPHSCOPE_HOME, "precompiled", "builtin")
         app_lib_path = get_lib_path(os.path.join(space, app_sig), app_sig)
         if not os.path.isfile(app_lib_path):
-            space = self._builtin_workspace
-            if types_pb2.GAR in op.attr:
-                space = self._udf_app_workspace
+            space = self._workspace_of(op)
             # try to get compiled file from workspace
             app_lib_path = get_lib_path(os.path.join(space, app_sig), app_sig)
             if not os.path.isfile(app_lib_path):
@@ -633,8 +837,11 @@ class CoordinatorServiceServicer(
         )
         return op, app_sig, app_lib_path
 
+    @tracing.traced
     def _maybe_register_graph(self, op, session_id):
         graph_sig = get_graph_sha256(op.attr)
+        # the library may be being compiled ahead
+        self._compilation_service.wait(graph_sig)
         # try to get compiled file from GRAPHSCOPE_HOME/precompiled
         space = os.path.join(GRAPHSCOPE_HOME, "precompiled", "builtin")
         graph_lib_path = get_lib_path(os.path.join(space, graph_sig), graph_sig)
@@ -775,9 +982,11 @@ class CoordinatorServiceServicer(
                 return op_def_pb2.OpResult(
                     code=error_codes_pb2.OK,
                     key=op.key,
-                    result=maxgraph_external_endpoint.encode("utf-8")
-                    if maxgraph_external_endpoint
-                    else maxgraph_endpoint.encode("utf-8"),
+                    result=(
+                        maxgraph_external_endpoint.encode("utf-8")
+                        if maxgraph_external_endpoint
+                        else maxgraph_endpoint.encode("utf-8")
+                    ),
                     extra_info=str(object_id).encode("utf-8"),
                 )
             raise RuntimeError("Error code: {0}, message {1}".format(return_code, outs))
@@ -1098,6 +1307,7 @@ class CoordinatorServiceServicer(
                     )
 
         self._object_manager.clear()
+        self._op_pool.clear()
 
         self._request = None
 
@@ -1145,18 +1355,31 @@ class CoordinatorServiceServicer(
         return config
 
     def _compile_lib_and_distribute(self, compile_func, lib_name, op):
-        space = self._builtin_workspace
-        if types_pb2.GAR in op.attr:
-            space = self._udf_app_workspace
-        app_lib_path, java_jar_path, java_ffi_path, app_type = compile_func(
-            space, lib_name, op.attr, self._analytical_engine_config
+        # waits for the build of the same library that is submitted ahead
+        return self._compilation_service.submit(
+            lib_name, functools.partial(self._compile_lib, compile_func, lib_name, op)
+        ).result()
+
+    def _compile_lib(self, compile_func, lib_name, op, jobs):
+        space = self._workspace_of(op)
+
+        def _compile():
+            app_lib_path, java_jar_path, java_ffi_path, app_type = compile_func(
+                space, lib_name, op.attr, self._analytical_engine_config, jobs
+            )
+            # for java app compilation, we need to distribute the jar and ffi generated
+            if app_type == "java_pie":
+                self._launcher.distribute_file(java_jar_path)
+                self._launcher.distribute_file(java_ffi_path)
+            # the jar and ffi of java apps are not shared
+            return app_lib_path, app_type != "java_pie"
+
+        return self._artifact_cache.fetch_or_build(
+            lib_name,
+            get_lib_path(os.path.join(space, lib_name), lib_name),
+            _compile,
+            distribute=self._launcher.distribute_file,
         )
-        # for java app compilation, we need to distribute the jar and ffi generated
-        if app_type == "java_pie":
-            self._launcher.distribute_file(java_jar_path)
-            self._launcher.distribute_file(java_ffi_path)
-        self._launcher.distribute_file(app_lib_path)
-        return app_lib_path
 
 
 def parse_sys_args():
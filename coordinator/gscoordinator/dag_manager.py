@@ -16,12 +16,13 @@
 # limitations under the License.
 #
 
-import copy
 import os
-import queue
+from collections import defaultdict
+from concurrent import futures
 from enum import Enum
 from typing import Sequence
 
+from graphscope.client.utils import decompress_body
 from graphscope.proto import message_pb2
 from graphscope.proto import op_def_pb2
 from graphscope.proto import types_pb2
@@ -42,100 +43,202 @@ class GSEngine(Enum):
 
 
 class DAGManager(object):
-    _analytical_engine_split_op = [
-        types_pb2.CREATE_GRAPH,  # spawn an io stream to read/write data from/to vineyard
-        types_pb2.BIND_APP,  # need loaded graph to compile
-        types_pb2.ADD_LABELS,  # need loaded graph
-        types_pb2.RUN_APP,  # need loaded app
-        types_pb2.CONTEXT_TO_NUMPY,  # need loaded graph to transform selector
-        types_pb2.CONTEXT_TO_DATAFRAME,  # need loaded graph to transform selector
-        types_pb2.GRAPH_TO_NUMPY,  # need loaded graph to transform selector
-        types_pb2.GRAPH_TO_DATAFRAME,  # need loaded graph to transform selector
-        types_pb2.TO_VINEYARD_TENSOR,  # need loaded graph to transform selector
-        types_pb2.TO_VINEYARD_DATAFRAME,  # need loaded graph to transform selector
-        types_pb2.PROJECT_GRAPH,  # need loaded graph to transform selector
-        types_pb2.PROJECT_TO_SIMPLE,  # need loaded graph schema information
-        types_pb2.ADD_COLUMN,  # need ctx result
-        types_pb2.UNLOAD_GRAPH,  # need loaded graph information
-        types_pb2.UNLOAD_APP,  # need loaded app information
-    ]
-
-    _interactive_engine_split_op = [
-        types_pb2.CREATE_INTERACTIVE_QUERY,
-        types_pb2.SUBGRAPH,
-        types_pb2.GREMLIN_QUERY,
-        types_pb2.FETCH_GREMLIN_RESULT,
-        types_pb2.CLOSE_INTERACTIVE_QUERY,
-    ]
-
-    _learning_engine_split_op = [
-        types_pb2.CREATE_LEARNING_INSTANCE,
-        types_pb2.CLOSE_LEARNING_INSTANCE,
-    ]
-
-    _coordinator_split_op = [
-        types_pb2.DATA_SOURCE,  # spawn an io stream to read/write data from/to vineyard
-        types_pb2.OUTPUT,  # spawn an io stream to read/write data from/to vineyard
-    ]
+    _analytical_engine_split_op = frozenset(
+        [
+            types_pb2.CREATE_GRAPH,  # spawn an io stream to read/write data from/to vineyard
+            types_pb2.BIND_APP,  # need loaded graph to compile
+            types_pb2.ADD_LABELS,  # need loaded graph
+            types_pb2.RUN_APP,  # need loaded app
+            types_pb2.CONTEXT_TO_NUMPY,  # need loaded graph to transform selector
+            types_pb2.CONTEXT_TO_DATAFRAME,  # need loaded graph to transform selector
+            types_pb2.GRAPH_TO_NUMPY,  # need loaded graph to transform selector
+            types_pb2.GRAPH_TO_DATAFRAME,  # need loaded graph to transform selector
+            types_pb2.TO_VINEYARD_TENSOR,  # need loaded graph to transform selector
+            types_pb2.TO_VINEYARD_DATAFRAME,  # need loaded graph to transform selector
+            types_pb2.PROJECT_GRAPH,  # need loaded graph to transform selector
+            types_pb2.PROJECT_TO_SIMPLE,  # need loaded graph schema information
+            types_pb2.ADD_COLUMN,  # need ctx result
+            types_pb2.UNLOAD_GRAPH,  # need loaded graph information
+            types_pb2.UNLOAD_APP,  # need loaded app information
+        ]
+    )
+
+    _interactive_engine_split_op = frozenset(
+        [
+            types_pb2.CREATE_INTERACTIVE_QUERY,
+            types_pb2.SUBGRAPH,
+            types_pb2.GREMLIN_QUERY,
+            types_pb2.FETCH_GREMLIN_RESULT,
+            types_pb2.CLOSE_INTERACTIVE_QUERY,
+        ]
+    )
+
+    _learning_engine_split_op = frozenset(
+        [
+            types_pb2.CREATE_LEARNING_INSTANCE,
+            types_pb2.CLOSE_LEARNING_INSTANCE,
+        ]
+    )
+
+    _coordinator_split_op = frozenset(
+        [
+            types_pb2.DATA_SOURCE,  # spawn an io stream to read/write data from/to vineyard
+            types_pb2.OUTPUT,  # spawn an io stream to read/write data from/to vineyard
+        ]
+    )
+
+    # op type -> the engine that runs the dag starts from the op
+    _exec_engine_of_op = {
+        **dict.fromkeys(_analytical_engine_split_op, GSEngine.analytical_engine),
+        **dict.fromkeys(_interactive_engine_split_op, GSEngine.interactive_engine),
+        **dict.fromkeys(_learning_engine_split_op, GSEngine.learning_engine),
+        **dict.fromkeys(_coordinator_split_op, GSEngine.coordinator),
+    }
+
+    # ops that release the objects of their parents
+    _release_op = frozenset(
+        [
+            types_pb2.UNLOAD_GRAPH,
+            types_pb2.UNLOAD_APP,
+            types_pb2.UNLOAD_CONTEXT,
+            types_pb2.CLOSE_INTERACTIVE_QUERY,
+            types_pb2.CLOSE_LEARNING_INSTANCE,
+        ]
+    )
 
     def __init__(self, request_iterator: Sequence[message_pb2.RunStepRequest]):
-        self._dag_queue = queue.Queue()
+        # a list of (dag_for, dag, dag_bodies)
+        self._dags = []
         req_head = None
-        # a list of chunks
-        req_bodies = []
+        # op key -> chunks of the op
+        req_bodies = defaultdict(list)
         for req in request_iterator:
             if req.HasField("head"):
                 req_head = req
             else:
-                req_bodies.append(req)
-        # split dag
-        dag = op_def_pb2.DagDef()
-        dag_for = GSEngine.analytical_engine
+                # decompressed as they arrive, engines take the raw chunks
+                decompress_body(req.body)
+                req_bodies[req.body.op_key].append(req)
+        self._trace_id = req_head.head.trace_id
+        # split dag, where a split op starts a new dag
+        ops = req_head.head.dag_def.op
+        dag_for, start = GSEngine.analytical_engine, 0
+        for index, op in enumerate(ops):
+            if op.op in self._exec_engine_of_op:
+                if index > start:
+                    self._add_dag(
+                        dag_for, req_head.head.dag_def, start, index, req_bodies
+                    )
+                dag_for, start = self._exec_engine_of_op[op.op], index
+        if len(ops) > start:
+            self._add_dag(dag_for, req_head.head.dag_def, start, len(ops), req_bodies)
+        self._dependencies = self._resolve_dependencies()
+
+    def _add_dag(self, dag_for, dag_def, start, stop, req_bodies):
+        if start == 0 and stop == len(dag_def.op):
+            # not split at all, take the dag as is
+            dag = dag_def
+        else:
+            dag = op_def_pb2.DagDef()
+            dag.op.extend(dag_def.op[start:stop])
         dag_bodies = []
-        for op in req_head.head.dag_def.op:
-            if self.is_splited_op(op):
-                if dag.op:
-                    self._dag_queue.put((dag_for, dag, dag_bodies))
-                # init empty dag
-                dag = op_def_pb2.DagDef()
-                dag_for = self.get_op_exec_engine(op)
-                dag_bodies = []
-            # select op
-            dag.op.extend([copy.deepcopy(op)])
-            for req_body in req_bodies:
-                # select chunks belong to this op
-                if req_body.body.op_key == op.key:
-                    dag_bodies.append(req_body)
-        if dag.op:
-            self._dag_queue.put((dag_for, dag, dag_bodies))
+        for op in dag.op:
+            # select chunks belong to this op
+            dag_bodies.extend(req_bodies.pop(op.key, ()))
+        self._dags.append((dag_for, dag, dag_bodies))
+
+    def _resolve_dependencies(self):
+        """Indices of the dags that each dag must wait for.
+
+        A dag depends on the dags that produce the parents of its ops, and on the
+        previous dag of the same engine, as each engine runs a dag at a time and
+        some ops refer to the objects in engine by name rather than by parents.
+        Dags that release objects are barriers, which wait for all dags before them
+        and are waited by all dags after them.
+        """
+        dependencies = []
+        # op key -> index of the dag that contains the op
+        producer = {}
+        last_of_engine = {}
+        barrier = None
+        for index, (dag_for, dag, _) in enumerate(self._dags):
+            if any(op.op in self._release_op for op in dag.op):
+                start = 0 if barrier is None else barrier
+                deps = set(range(start, index))
+                barrier = index
+            else:
+                deps = set() if barrier is None else {barrier}
+                if dag_for in last_of_engine:
+                    deps.add(last_of_engine[dag_for])
+                for op in dag.op:
+                    deps.update(producer[key] for key in op.parents if key in producer)
+                deps.discard(index)
+            dependencies.append(deps)
+            for op in dag.op:
+                producer[op.key] = index
+            last_of_engine[dag_for] = index
+        return dependencies
 
     def is_splited_op(self, op):
-        return op.op in (
-            self._analytical_engine_split_op
-            + self._interactive_engine_split_op
-            + self._learning_engine_split_op
-            + self._coordinator_split_op
-        )
+        return op.op in self._exec_engine_of_op
 
     def get_op_exec_engine(self, op):
-        op_type = op.op
-        if op_type in self._analytical_engine_split_op:
-            return GSEngine.analytical_engine
-        if op_type in self._interactive_engine_split_op:
-            return GSEngine.interactive_engine
-        if op_type in self._learning_engine_split_op:
-            return GSEngine.learning_engine
-        if op_type in self._coordinator_split_op:
-            return GSEngine.coordinator
-        raise RuntimeError("Op {0} get execution engine failed.".format(op_type))
-
-    def empty(self):
-        return self._dag_queue.empty()
-
-    def next_dag(self):
-        if not self._dag_queue.empty():
-            return self._dag_queue.get()
-        raise RuntimeError("Get element from empty queue.")
+        try:
+            return self._exec_engine_of_op[op.op]
+        except KeyError:
+            raise RuntimeError("Op {0} get execution engine failed.".format(op.op))
+
+    def __len__(self):
+        return len(self._dags)
+
+    @property
+    def trace_id(self):
+        return self._trace_id
+
+    def ops(self):
+        for _, dag, _ in self._dags:
+            yield from dag.op
+
+    def op_keys(self):
+        return [op.key for op in self.ops()]
+
+    def run(self, run_dag, executor, cancelled=None):
+        """Run the dags by `run_dag(dag_for, dag, dag_bodies)` in `executor`, where
+        the dags that don't depend on each other, e.g., a gremlin query on one graph and
+        an app on another graph, are run concurrently.
+
+        Once a dag fails, or the event `cancelled` is set, e.g., the client is gone,
+        no more dags will be scheduled.
+
+        Returns:
+            A tuple of (results, failure). Results of dags are in the order of dags,
+            where the ones not finished are None, and the failure is a tuple of
+            (dag_for, exception) of the first failed dag, or None.
+        """
+        results = [None] * len(self._dags)
+        pending = list(range(len(self._dags)))
+        finished = set()
+        running = {}
+        failure = None
+        while pending or running:
+            if failure is None and not (cancelled is not None and cancelled.is_set()):
+                ready = [i for i in pending if self._dependencies[i] <= finished]
+                for i in ready:
+                    running[executor.submit(run_dag, *self._dags[i])] = i
+                pending = [i for i in pending if i not in ready]
+            if not running:
+                break
+            done, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                try:
+                    results[i] = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    if failure is None:
+                        failure = (self._dags[i][0], exc)
+                else:
+                    finished.add(i)
+        return results, failure
 
 
 def split_op_result(op_result: op_def_pb2.OpResult):
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+""" Distribute the compiled libraries to the hosts or pods of engines.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import tarfile
+import time
+from abc import ABCMeta
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("graphscope")
+
+
+class FileDistributor(metaclass=ABCMeta):
+    """Copy a file or directory to the same path on many targets concurrently.
+
+    The file is shipped as a gzipped tar stream piped into a shell on the target,
+    which is built once and shared by all targets. Targets that already hold
+    identical files, by the sha256 checksums, are skipped.
+    """
+
+    def __init__(self, max_workers=16, compresslevel=1):
+        self._max_workers = max_workers
+        self._compresslevel = compresslevel
+
+    @abstractmethod
+    def _remote_command(self, target, script):
+        """The command that runs the shell `script` on `target`."""
+        raise NotImplementedError
+
+    def _root_of(self, target):
+        """The directory on `target` that the paths are relative to."""
+        return "/"
+
+    def distribute(self, path, targets, dest=None):
+        """Distribute `path` to `targets`, at `dest` on the targets if given,
+        otherwise the same path.
+
+        Returns:
+            dict: The seconds spent on each target, and whether it is skipped.
+
+        Raises:
+            RuntimeError: If failed to distribute to any of the targets.
+        """
+        targets = list(targets)
+        if not targets:
+            return {}
+        path = os.path.abspath(path)
+        dest = path if dest is None else os.path.abspath(dest)
+        manifest = _manifest_of(path, os.path.basename(dest))
+        start = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(targets)),
+            thread_name_prefix="distribute",
+        ) as executor:
+            checks = list(
+                executor.map(lambda t: self._matches(t, dest, manifest), targets)
+            )
+            stale = [t for t, (matched, _) in zip(targets, checks) if not matched]
+            transfers = []
+            if stale:
+                archive = self._archive(path, os.path.basename(dest))
+                transfers = list(
+                    executor.map(lambda t: self._transfer(t, dest, archive), stale)
+                )
+        timings = {}
+        for target, (matched, seconds) in zip(targets, checks):
+            timings[target] = (seconds, matched)
+        errors = []
+        for target, (error, seconds) in zip(stale, transfers):
+            timings[target] = (timings[target][0] + seconds, False)
+            if error is not None:
+                errors.append("%s: %s" % (target, error))
+        for target, (seconds, skipped) in timings.items():
+            logger.debug(
+                "%s %s on %s in %.3fs",
+                "Skipped" if skipped else "Distributed",
+                path,
+                target,
+                seconds,
+            )
+        if errors:
+            raise RuntimeError(
+                "Failed to distribute %s to %s" % (path, ", ".join(errors))
+            )
+        logger.info(
+            "Distributed %s to %d of %d targets in %.3fs",
+            path,
+            len(stale),
+            len(targets),
+            time.perf_counter() - start,
+        )
+        return timings
+
+    def _matches(self, target, path, manifest):
+        start = time.perf_counter()
+        directory, name = self._split(target, path)
+        script = "cd %s && find %s -type f -exec sha256sum {} + | LC_ALL=C sort" % (
+            shlex.quote(directory),
+            shlex.quote(name),
+        )
+        proc = subprocess.run(
+            self._remote_command(target, script),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        matched = proc.returncode == 0 and proc.stdout.decode("utf-8") == manifest
+        return matched, time.perf_counter() - start
+
+    def _transfer(self, target, path, archive):
+        start = time.perf_counter()
+        directory, _ = self._split(target, path)
+        script = "mkdir -p {0} && tar -xzf - -C {0}".format(shlex.quote(directory))
+        proc = subprocess.run(
+            self._remote_command(target, script),
+            input=archive,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+        )
+        error = None
+        if proc.returncode != 0:
+            error = proc.stderr.decode("utf-8", errors="replace").strip()
+        return error, time.perf_counter() - start
+
+    def _split(self, target, path):
+        directory, name = os.path.split(path)
+        return os.path.join(self._root_of(target), directory.lstrip("/")), name
+
+    def _archive(self, path, name):
+        buffer = io.BytesIO()
+        with tarfile.open(
+            fileobj=buffer, mode="w:gz", compresslevel=self._compresslevel
+        ) as tar:
+            tar.add(path, arcname=name)
+        return buffer.getvalue()
+
+
+def _manifest_of(path, name):
+    """The output of `find <name> -type f -exec sha256sum {} + | sort` in the
+    parent directory of `path`, where `path` is named `name`.
+    """
+    files = []
+    if os.path.isdir(path):
+        for root, _, filenames in os.walk(path):
+            for filename in filenames:
+                # symlinks are not regular files for `find`
+                if not os.path.islink(os.path.join(root, filename)):
+                    files.append(os.path.join(root, filename))
+    else:
+        files.append(path)
+    lines = []
+    for f in files:
+        sha256 = hashlib.sha256()
+        with open(f, "rb") as fp:
+            for block in iter(lambda: fp.read(1 << 20), b""):
+                sha256.update(block)
+        relpath = os.path.normpath(os.path.join(name, os.path.relpath(f, path)))
+        lines.append("%s  %s\n" % (sha256.hexdigest(), relpath))
+    return "".join(sorted(lines))
+
+
+class SSHFileDistributor(FileDistributor):
+    def _remote_command(self, target, script):
+        return [shutil.which("ssh"), target, script]
+
+
+class KubectlFileDistributor(FileDistributor):
+    def __init__(self, container, **kwargs):
+        super().__init__(**kwargs)
+        self._container = container
+
+    def _remote_command(self, target, script):
+        return [
+            shutil.which("kubectl"),
+            "exec",
+            "-i",
+            target,
+            "-c",
+            self._container,
+            "--",
+            "sh",
+            "-c",
+            script,
+        ]
@@ -34,6 +34,7 @@ from graphscope.framework.utils import get_tempdir
 from graphscope.framework.utils import is_free_port
 from graphscope.proto import types_pb2
 
+from gscoordinator.distributor import SSHFileDistributor
 from gscoordinator.utils import ANALYTICAL_ENGINE_PATH
 from gscoordinator.utils import GRAPHSCOPE_HOME
 from gscoordinator.utils import INTERACTIVE_ENGINE_SCRIPT
@@ -185,16 +186,13 @@ class LocalLauncher(Launcher):
         self._session_workspace = os.path.join(self._instance_workspace, session_id)
         os.makedirs(self._session_workspace, exist_ok=True)
 
-    def distribute_file(self, path):
-        d = os.path.dirname(path)
-        for host in self._hosts.split(","):
-            if host not in ("localhost", "127.0.0.1"):
-                subprocess.check_call(
-                    [shutil.which("ssh"), host, "mkdir -p {}".format(d)]
-                )
-                subprocess.check_call(
-                    [shutil.which("scp"), "-r", path, "{}:{}".format(host, path)]
-                )
+    def distribute_file(self, path, dest=None):
+        hosts = [
+            host
+            for host in self._hosts.split(",")
+            if host not in ("localhost", "127.0.0.1")
+        ]
+        SSHFileDistributor().distribute(path, hosts, dest)
 
     def poll(self):
         if self._analytical_engine_process:
@@ -16,6 +16,10 @@
 # limitations under the License.
 #
 
+import threading
+from collections import OrderedDict
+
+from graphscope.proto import types_pb2
 from gremlin_python.driver.client import Client
 
 
@@ -94,3 +98,192 @@ class ObjectManager(object):
 
     def __contains__(self, key):
         return key in self._objects
+
+
+class OpPool(object):
+    """Hold the ops of a session and their results, by which the successors of
+    the ops are preprocessed.
+
+    An op is live as long as the object it produces, i.e., a graph, a bound app,
+    a context, an interactive or learning instance, is not released by the client,
+    or any of its successors is live. The result set of a gremlin query is live
+    until its interactive instance is closed, as it may be fetched at any time. The other ops are retired once the step that
+    evaluates them finishes and kept in a LRU of at most `capacity` ones, since they
+    are rarely referred to again, e.g., an app that is bound to another graph. A
+    retired op that is referred to again is live again along with its ancestors.
+
+    Only the op that produces a graph lastly is live for the graph, and the ops
+    that modify a graph in place, e.g., the ops of nx graphs, are never live.
+
+    The objects kept in `object_manager` under the key of an op, e.g., the
+    result sets of gremlin queries, are dropped along with the op.
+    """
+
+    _release_types = (
+        types_pb2.UNLOAD_GRAPH,
+        types_pb2.UNLOAD_APP,
+        types_pb2.UNLOAD_CONTEXT,
+        types_pb2.CLOSE_INTERACTIVE_QUERY,
+        types_pb2.CLOSE_LEARNING_INSTANCE,
+    )
+    _object_types = (
+        types_pb2.BOUND_APP,
+        types_pb2.INTERACTIVE_QUERY,
+        types_pb2.LEARNING_GRAPH,
+    )
+
+    def __init__(self, capacity=1024, object_manager=None):
+        # op key -> op_def_pb2.OpDef
+        self.ops = {}
+        # op key -> op_def_pb2.OpResult
+        self.results = {}
+        self._capacity = capacity
+        self._object_manager = object_manager
+        self._children = {}
+        self._alive = set()
+        # graph key -> key of the op that produces it lastly
+        self._graphs = {}
+        self._released = set()
+        self._retired = OrderedDict()
+        # serialized sizes of the ops and results, kept as they are put, retired
+        # and removed rather than walking the pool
+        self._op_sizes = {}
+        self._result_sizes = {}
+        self._op_bytes = 0
+        self._result_bytes = 0
+        self._lock = threading.RLock()
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __len__(self):
+        return len(self.ops)
+
+    def put_op(self, op):
+        with self._lock:
+            if op.key not in self.ops:
+                self._children[op.key] = set()
+                self._link(op.key, op.parents)
+            self.ops[op.key] = op
+            self._resize_op(op.key)
+
+    def put_result(self, op_result):
+        with self._lock:
+            key = op_result.key
+            self.results[key] = op_result
+            size = op_result.ByteSize()
+            self._result_bytes += size - self._result_sizes.get(key, 0)
+            self._result_sizes[key] = size
+            op = self.ops.get(key)
+            if op is None:
+                return
+            if op.op in self._release_types:
+                for parent in op.parents:
+                    self._release(parent)
+                    if op.op == types_pb2.CLOSE_INTERACTIVE_QUERY:
+                        for child in self._children.get(parent, ()):
+                            if self.ops[child].op == types_pb2.GREMLIN_QUERY:
+                                self._release(child)
+            elif op.output_type == types_pb2.GRAPH:
+                # the ops that modify a graph in place produce no graph_def
+                graph_key = op_result.graph_def.key
+                if graph_key:
+                    self._alive.add(key)
+                    previous = self._graphs.get(graph_key)
+                    if previous is not None and previous != key:
+                        self._alive.discard(previous)
+                        self._released.add(previous)
+                    self._graphs[graph_key] = key
+            elif op.output_type in self._object_types or op.op in (
+                types_pb2.RUN_APP,
+                types_pb2.GREMLIN_QUERY,
+            ):
+                self._alive.add(key)
+
+    def retire(self, keys):
+        """Retire the ops of `keys`, e.g., the ops of a finished step, as well as
+        the released ones, and then their ancestors that are no longer live.
+        """
+        with self._lock:
+            # the ops are preprocessed in place after they are put
+            for key in keys:
+                if key in self.ops:
+                    self._resize_op(key)
+            stack = list(keys)
+            stack.extend(self._released)
+            self._released.clear()
+            while stack:
+                key = stack.pop()
+                if (
+                    key not in self.ops
+                    or key in self._alive
+                    or key in self._retired
+                    or self._children[key]
+                ):
+                    continue
+                self._retired[key] = None
+                for parent in self.ops[key].parents:
+                    if parent in self._children:
+                        self._children[parent].discard(key)
+                        stack.append(parent)
+            while len(self._retired) > self._capacity:
+                key, _ = self._retired.popitem(last=False)
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.ops.clear()
+            self.results.clear()
+            self._children.clear()
+            self._alive.clear()
+            self._graphs.clear()
+            self._released.clear()
+            self._retired.clear()
+            self._op_sizes.clear()
+            self._result_sizes.clear()
+            self._op_bytes = 0
+            self._result_bytes = 0
+
+    def stats(self):
+        """Sizes of the pool, the bytes are the serialized sizes of ops and results."""
+        with self._lock:
+            return {
+                "ops": len(self.ops),
+                "live": len(self.ops) - len(self._retired),
+                "retired": len(self._retired),
+                "op_bytes": self._op_bytes,
+                "result_bytes": self._result_bytes,
+            }
+
+    def _resize_op(self, key):
+        size = self.ops[key].ByteSize()
+        self._op_bytes += size - self._op_sizes.get(key, 0)
+        self._op_sizes[key] = size
+
+    def _link(self, key, parents):
+        for parent in parents:
+            if parent not in self.ops:
+                continue
+            self._children[parent].add(key)
+            if parent in self._retired:
+                del self._retired[parent]
+                self._link(parent, self.ops[parent].parents)
+
+    def _release(self, key):
+        self._alive.discard(key)
+        self._released.add(key)
+        result = self.results.get(key)
+        if result is not None and result.graph_def.key:
+            if self._graphs.get(result.graph_def.key) == key:
+                del self._graphs[result.graph_def.key]
+
+    def _remove(self, key):
+        self.ops.pop(key, None)
+        self.results.pop(key, None)
+        self._op_bytes -= self._op_sizes.pop(key, 0)
+        self._result_bytes -= self._result_sizes.pop(key, 0)
+        self._children.pop(key, None)
+        self._alive.discard(key)
+        if self._object_manager is not None:
+            self._object_manager.pop(key)
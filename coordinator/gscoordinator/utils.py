@@ -130,6 +130,9 @@ LLVM4JNI_HOME = os.environ.get("LLVM4JNI_HOME", None)
 LLVM4JNI_USER_OUT_DIR_BASE = "user-llvm4jni-output"
 PROCESSOR_MAIN_CLASS = "com.alibaba.graphscope.annotation.Main"
 JAVA_CODEGNE_OUTPUT_PREFIX = "gs-ffi"
+# libraries are linked in this subdirectory of the directory of the library, and
+# moved to their places once complete
+BUILD_DIR = ".build"
 GRAPE_PROCESSOR_JAR = os.path.join(
     GRAPHSCOPE_HOME, "lib", "grape-runtime-0.1-shaded.jar"
 )
@@ -192,7 +195,9 @@ def get_graph_sha256(attr):
     return hashlib.sha256(graph_class.encode("utf-8")).hexdigest()
 
 
-def compile_app(workspace: str, library_name, attr, engine_config: dict):
+def compile_app(
+    workspace: str, library_name, attr, engine_config: dict, jobs: int = None
+):
     """Compile an application.
 
     Args:
@@ -200,6 +205,8 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
         library_name (str): name of library
         attr (`AttrValue`): All information needed to compile an app.
         engine_config (dict): for options of NETWORKX
+        jobs (int, optional): Number of parallel jobs of make, defaults to the
+            number of cpus.
 
     Returns:
         str: Path of the built library.
@@ -239,8 +246,6 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
     graph_header, graph_type, graph_oid_type = _codegen_graph_info(attr)
     logger.info("Codegened graph type: %s, Graph header: %s", graph_type, graph_header)
 
-    os.chdir(app_dir)
-
     module_name = ""
     # Output directory for java codegen
     java_codegen_out_dir = ""
@@ -251,6 +256,7 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
         ".",
         f"-DNETWORKX={engine_config['networkx']}",
         f"-DCMAKE_PREFIX_PATH='{GRAPHSCOPE_HOME};{OPAL_PREFIX}'",
+        f"-DCMAKE_LIBRARY_OUTPUT_DIRECTORY={os.path.join(app_dir, BUILD_DIR)}",
     ]
     if app_type == "java_pie":
         if not os.path.isfile(GRAPE_PROCESSOR_JAR):
@@ -275,7 +281,9 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
             cmake_commands += [
                 "-DRUN_LLVM4JNI_SH={}".format(os.path.join(LLVM4JNI_HOME, "run.sh")),
                 "-DLLVM4JNI_OUTPUT={}".format(llvm4jni_user_out_dir),
-                "-DLIB_PATH={}".format(get_lib_path(app_dir, library_name)),
+                "-DLIB_PATH={}".format(
+                    get_lib_path(os.path.join(app_dir, BUILD_DIR), library_name)
+                ),
             ]
         else:
             logger.info(
@@ -330,6 +338,7 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
     logger.info("Building app ...")
     cmake_process = subprocess.Popen(
         cmake_commands,
+        cwd=app_dir,
         env=os.environ.copy(),
         encoding="utf-8",
         errors="replace",
@@ -342,8 +351,13 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
     setattr(cmake_process, "stderr_watcher", cmake_stderr_watcher)
     cmake_process.wait()
 
+    lib_path = get_lib_path(os.path.join(app_dir, BUILD_DIR), library_name)
+    # a library left by a killed build looks up to date to make
+    if os.path.exists(lib_path):
+        os.remove(lib_path)
     make_process = subprocess.Popen(
-        [shutil.which("make"), "-j4"],
+        [shutil.which("make"), "-j%d" % (jobs or os.cpu_count() or 1)],
+        cwd=app_dir,
         env=os.environ.copy(),
         encoding="utf-8",
         errors="replace",
@@ -355,7 +369,6 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
     make_stderr_watcher = PipeWatcher(make_process.stderr, sys.stderr)
     setattr(make_process, "stderr_watcher", make_stderr_watcher)
     make_process.wait()
-    lib_path = get_lib_path(app_dir, library_name)
     if not os.path.isfile(lib_path):
         raise CompilationError(
             f"Failed to compile app {app_class} on platform {get_platform_info()}"
@@ -363,7 +376,9 @@ def compile_app(workspace: str, library_name, attr, engine_config: dict):
     return lib_path, java_jar_path, java_codegen_out_dir, app_type
 
 
-def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config: dict):
+def compile_graph_frame(
+    workspace: str, library_name, attr: dict, engine_config: dict, jobs: int = None
+):
     """Compile an application.
 
     Args:
@@ -371,6 +386,8 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
         library_name (str): name of library
         attr (`AttrValue`): All information needed to compile a graph library.
         engine_config (dict): for options of NETWORKX
+        jobs (int, optional): Number of parallel jobs of make, defaults to the
+            number of cpus.
 
     Raises:
         ValueError: When graph_type is not supported.
@@ -389,8 +406,6 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
     library_dir = os.path.join(workspace, library_name)
     os.makedirs(library_dir, exist_ok=True)
 
-    os.chdir(library_dir)
-
     graph_type = attr[types_pb2.GRAPH_TYPE].graph_type
 
     # set OPAL_PREFIX in CMAKE_PREFIX_PATH
@@ -400,6 +415,7 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
         ".",
         f"-DNETWORKX={engine_config['networkx']}",
         f"-DCMAKE_PREFIX_PATH='{GRAPHSCOPE_HOME};{OPAL_PREFIX}'",
+        f"-DCMAKE_LIBRARY_OUTPUT_DIRECTORY={os.path.join(library_dir, BUILD_DIR)}",
     ]
     if graph_type == graph_def_pb2.ARROW_PROPERTY:
         cmake_commands += ["-DPROPERTY_GRAPH_FRAME=True"]
@@ -428,6 +444,7 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
     logger.info("Building graph library ...")
     cmake_process = subprocess.Popen(
         cmake_commands,
+        cwd=library_dir,
         env=os.environ.copy(),
         encoding="utf-8",
         errors="replace",
@@ -440,8 +457,13 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
     setattr(cmake_process, "stderr_watcher", cmake_stderr_watcher)
     cmake_process.wait()
 
+    lib_path = get_lib_path(os.path.join(library_dir, BUILD_DIR), library_name)
+    # a library left by a killed build looks up to date to make
+    if os.path.exists(lib_path):
+        os.remove(lib_path)
     make_process = subprocess.Popen(
-        [shutil.which("make"), "-j4"],
+        [shutil.which("make"), "-j%d" % (jobs or os.cpu_count() or 1)],
+        cwd=library_dir,
         env=os.environ.copy(),
         encoding="utf-8",
         errors="replace",
@@ -453,7 +475,6 @@ def compile_graph_frame(workspace: str, library_name, attr: dict, engine_config:
     make_stderr_watcher = PipeWatcher(make_process.stderr, sys.stderr)
     setattr(make_process, "stderr_watcher", make_stderr_watcher)
     make_process.wait()
-    lib_path = get_lib_path(library_dir, library_name)
     if not os.path.isfile(lib_path):
         raise CompilationError(
             f"Failed to compile graph {graph_class} on platform {get_platform_info()}"
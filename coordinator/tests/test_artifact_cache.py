@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+
+import pytest
+
+from gscoordinator.artifact_cache import ArtifactCache
+
+
+def _build_to(path, content=b"lib"):
+    def _build():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path, True
+
+    return _build
+
+
+def test_published_after_distributed(tmp_path):
+    lib_path = str(tmp_path / "workspace" / "sig" / "libsig.so")
+    built = str(tmp_path / "workspace" / "sig" / ".build" / "libsig.so")
+    distributed = []
+
+    def _distribute(path, dest):
+        # not visible at its place until it is distributed
+        assert not os.path.exists(dest)
+        with open(path, "rb") as f:
+            distributed.append((f.read(), dest))
+
+    cache = ArtifactCache.from_uri(str(tmp_path / "store"))
+    path = cache.fetch_or_build("sig", lib_path, _build_to(built), _distribute)
+    assert path == lib_path
+    assert distributed == [(b"lib", lib_path)]
+    with open(lib_path, "rb") as f:
+        assert f.read() == b"lib"
+    assert not [f for f in os.listdir(os.path.dirname(lib_path)) if f.endswith(".tmp")]
+
+    # fetched from the store by another workspace, and distributed as well
+    another = str(tmp_path / "another" / "sig" / "libsig.so")
+    distributed.clear()
+
+    def _fail():
+        raise AssertionError("should be fetched")
+
+    assert cache.fetch_or_build("sig", another, _fail, _distribute) == another
+    assert distributed == [(b"lib", another)]
+
+
+def test_failed_build_not_published(tmp_path):
+    lib_path = str(tmp_path / "workspace" / "sig" / "libsig.so")
+
+    def _distribute(path, dest):
+        raise RuntimeError("unreachable")
+
+    cache = ArtifactCache()
+    built = str(tmp_path / "workspace" / "sig" / ".build" / "libsig.so")
+    with pytest.raises(RuntimeError, match="unreachable"):
+        cache.fetch_or_build("sig", lib_path, _build_to(built), _distribute)
+    assert not os.path.exists(lib_path)
+    assert not [f for f in os.listdir(os.path.dirname(lib_path)) if f.endswith(".tmp")]
+    # built again rather than taken as a hit
+    assert cache.fetch_or_build("sig", lib_path, _build_to(built, b"new")) == lib_path
+    with open(lib_path, "rb") as f:
+        assert f.read() == b"new"
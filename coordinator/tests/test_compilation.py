@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+
+from gscoordinator.compilation import CompilationService
+
+
+def test_build_slots_are_shared():
+    service = CompilationService(parallelism=4)
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def _build(jobs):
+        with lock:
+            running[0] += jobs
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= jobs
+        return jobs
+
+    ahead = service.submit_all([("a%d" % i, _build) for i in range(4)])
+    # a build at runtime takes the slots that are free
+    runtime = service.submit("b", _build)
+    assert [f.result() for f in ahead] == [1] * 4
+    assert 1 <= runtime.result() <= 4
+    assert running[1] <= 4
+
+    # deduplicated by the signature
+    first, second = service.submit_all([("c", _build), ("c", _build)])
+    assert first is second
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from concurrent import futures
+
+import grpc
+import numpy as np
+import pytest
+from graphscope.client import utils
+from graphscope.client.utils import BodyCompressor
+from graphscope.client.utils import GRPCUtils
+from graphscope.client.utils import available_compressions
+from graphscope.client.utils import compress_body
+from graphscope.client.utils import negotiate_compression
+from graphscope.proto import coordinator_service_pb2_grpc
+from graphscope.proto import message_pb2
+from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
+
+from gscoordinator.dag_manager import DAGManager
+
+
+class _EchoCoordinator(coordinator_service_pb2_grpc.CoordinatorServiceServicer):
+    """Stand-in of the coordinator, which returns the chunks of each op as its
+    large result, the way the coordinator relays chunks from engines.
+    """
+
+    def __init__(self):
+        self.compression = ""
+        self.received = []
+
+    def ConnectSession(self, request, context):
+        self.compression = negotiate_compression(request.compressions)
+        return message_pb2.ConnectSessionResponse(
+            session_id="session", compression=self.compression
+        )
+
+    def RunStep(self, request_iterator, context):
+        def _record(requests):
+            for request in requests:
+                if request.HasField("body"):
+                    self.received.append(request.body.compression)
+                yield request
+
+        dag_manager = DAGManager(_record(request_iterator))
+        head = message_pb2.RunStepResponse(head=message_pb2.RunStepResponseHead())
+        for _, dag, dag_bodies in dag_manager._dags:
+            for op in dag.op:
+                head.head.results.add(key=op.key, has_large_result=True)
+            for request in dag_bodies:
+                response = message_pb2.RunStepResponse(
+                    body=message_pb2.RunStepResponseBody(
+                        chunk=request.body.chunk,
+                        op_key=request.body.op_key,
+                        has_next=request.body.has_next,
+                    )
+                )
+                compress_body(response.body, self.compression)
+                yield response
+        yield head
+
+
+@pytest.fixture
+def coordinator():
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    servicer = _EchoCoordinator()
+    coordinator_service_pb2_grpc.add_CoordinatorServiceServicer_to_server(
+        servicer, server
+    )
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    with grpc.insecure_channel("localhost:%d" % port) as channel:
+        yield servicer, coordinator_service_pb2_grpc.CoordinatorServiceStub(channel)
+    server.stop(None)
+
+
+def _run(stub, compressions, buffers, chunk_size):
+    response = stub.ConnectSession(
+        message_pb2.ConnectSessionRequest(compressions=compressions)
+    )
+    grpc_utils = GRPCUtils(response.compression)
+    grpc_utils.CHUNK_SIZE = chunk_size
+    dag_def = op_def_pb2.DagDef()
+    for i, buffer in enumerate(buffers):
+        op = dag_def.op.add(key="op%d" % i, op=types_pb2.DATA_SOURCE)
+        op.large_attr.chunk_list.items.add(buffer=buffer)
+    requests = grpc_utils.generate_runstep_requests("session", dag_def)
+    _, large_results = grpc_utils.parse_runstep_responses(stub.RunStep(requests))
+    return response.compression, large_results
+
+
+@pytest.mark.parametrize("compression", available_compressions())
+def test_compressed_round_trip(coordinator, monkeypatch, compression):
+    monkeypatch.setattr(utils, "GS_GRPC_COMPRESSION_MIN_SIZE", 1024)
+    servicer, stub = coordinator
+    compressible = np.arange(100000, dtype=np.int64).tobytes()
+    random = np.random.default_rng(0).bytes(100000)
+    tiny = b"tiny"
+    negotiated, large_results = _run(
+        stub, [compression], [compressible, random, tiny], 64 * 1024
+    )
+    assert negotiated == compression
+    assert bytes(large_results["op0"]) == compressible
+    assert bytes(large_results["op1"]) == random
+    assert bytes(large_results["op2"]) == tiny
+    # the compressible chunk are sent in 13 pieces, the random one is sent as is
+    # after the first piece, and the tiny one is too small to compress
+    assert servicer.received == [compression] * 13 + [""] * 3
+
+
+def test_compression_not_negotiated(coordinator):
+    servicer, stub = coordinator
+    buffer = bytes(4 * 1024 * 1024)
+    negotiated, large_results = _run(stub, ["unknown"], [buffer], 1024 * 1024)
+    assert negotiated == ""
+    assert bytes(large_results["op0"]) == buffer
+    assert servicer.received == [""] * 4
+
+
+@pytest.mark.parametrize("compression", available_compressions())
+def test_body_compressor(monkeypatch, compression):
+    monkeypatch.setattr(utils, "GS_GRPC_COMPRESSION_MIN_SIZE", 1024)
+    compressor = BodyCompressor(compression)
+    random = np.random.default_rng(0).bytes(4096)
+    compressible = bytes(4096)
+    compressed = []
+    for op_key, chunk in [
+        ("random", random),
+        ("zeros", compressible),
+        ("random", compressible),
+        ("zeros", compressible),
+    ]:
+        body = message_pb2.RunStepResponseBody(chunk=chunk, op_key=op_key)
+        compressed.append(compressor.compress(body))
+        assert utils.decompressed_chunk(body) == chunk
+    # the pieces of an op are sent as is after a poorly compressed one
+    assert compressed == [False, True, False, True]
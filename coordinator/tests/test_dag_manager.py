@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+from concurrent import futures
+
+from graphscope.proto import message_pb2
+from graphscope.proto import types_pb2
+
+from gscoordinator.dag_manager import DAGManager
+
+
+def _dag_manager(*op_types):
+    head = message_pb2.RunStepRequest(head=message_pb2.RunStepRequestHead())
+    for i, op_type in enumerate(op_types):
+        op = head.head.dag_def.op.add(key="op%d" % i, op=op_type)
+        if i > 0:
+            op.parents.append("op%d" % (i - 1))
+    return DAGManager([head])
+
+
+def test_run_cancelled():
+    dag_manager = _dag_manager(
+        types_pb2.CREATE_GRAPH, types_pb2.BIND_APP, types_pb2.RUN_APP
+    )
+    assert len(dag_manager) == 3
+    cancelled = threading.Event()
+    ran = []
+
+    def run_dag(dag_for, dag, dag_bodies):
+        ran.append(dag.op[0].key)
+        # the client is gone while the first dag is running
+        cancelled.set()
+        return dag.op[0].key
+
+    with futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results, failure = dag_manager.run(run_dag, executor, cancelled)
+    assert ran == ["op0"]
+    assert results == ["op0", None, None]
+    assert failure is None
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+
+import pytest
+
+from gscoordinator.distributor import FileDistributor
+
+
+class _FakeHostDistributor(FileDistributor):
+    """Each host is a directory on local, where the script runs by `sh`."""
+
+    def __init__(self, root, broken=(), **kwargs):
+        super().__init__(**kwargs)
+        self._root = root
+        self._broken = broken
+        self.commands = []
+
+    def _root_of(self, target):
+        return os.path.join(self._root, target)
+
+    def _remote_command(self, target, script):
+        self.commands.append((target, script))
+        if target in self._broken:
+            return ["sh", "-c", "echo unreachable >&2; exit 255"]
+        return ["sh", "-c", script]
+
+
+def _on_host(distributor, host, path):
+    return os.path.join(distributor._root_of(host), path.lstrip("/"))
+
+
+def test_distribute_file(tmp_path):
+    lib = tmp_path / "workspace" / "sig" / "libsig.so"
+    lib.parent.mkdir(parents=True)
+    lib.write_bytes(os.urandom(1024) * 16)
+    hosts = ["host-%d" % i for i in range(8)]
+    distributor = _FakeHostDistributor(str(tmp_path / "hosts"), max_workers=4)
+
+    timings = distributor.distribute(str(lib), hosts)
+    assert set(timings) == set(hosts)
+    assert not any(skipped for _, skipped in timings.values())
+    for host in hosts:
+        with open(_on_host(distributor, host, str(lib)), "rb") as f:
+            assert f.read() == lib.read_bytes()
+
+    # identical checksums are skipped, and only the changed host is shipped
+    with open(_on_host(distributor, hosts[0], str(lib)), "wb") as f:
+        f.write(b"stale")
+    timings = distributor.distribute(str(lib), hosts)
+    assert [h for h, (_, skipped) in timings.items() if not skipped] == hosts[:1]
+    with open(_on_host(distributor, hosts[0], str(lib)), "rb") as f:
+        assert f.read() == lib.read_bytes()
+
+
+def test_distribute_directory(tmp_path):
+    ffi = tmp_path / "workspace" / "gs-ffi-sig"
+    (ffi / "sub").mkdir(parents=True)
+    (ffi / "a.java").write_text("class A {}")
+    (ffi / "sub" / "b.java").write_text("class B {}")
+    distributor = _FakeHostDistributor(str(tmp_path / "hosts"))
+
+    distributor.distribute(str(ffi), ["host-0", "host-1"])
+    for host in ("host-0", "host-1"):
+        root = _on_host(distributor, host, str(ffi))
+        with open(os.path.join(root, "sub", "b.java")) as f:
+            assert f.read() == "class B {}"
+    timings = distributor.distribute(str(ffi), ["host-0", "host-1"])
+    assert all(skipped for _, skipped in timings.values())
+
+
+def test_distribute_failure(tmp_path):
+    lib = tmp_path / "libsig.so"
+    lib.write_bytes(b"lib")
+    distributor = _FakeHostDistributor(str(tmp_path / "hosts"), broken=["host-1"])
+    with pytest.raises(RuntimeError, match="host-1: unreachable"):
+        distributor.distribute(str(lib), ["host-0", "host-1", "host-2"])
+    # the other hosts are still served
+    for host in ("host-0", "host-2"):
+        assert os.path.isfile(_on_host(distributor, host, str(lib)))
+
+
+def test_distribute_to_another_path(tmp_path):
+    staged = tmp_path / "workspace" / "sig" / "libsig.so.0123.tmp"
+    staged.parent.mkdir(parents=True)
+    staged.write_bytes(b"lib")
+    lib = str(tmp_path / "workspace" / "sig" / "libsig.so")
+    distributor = _FakeHostDistributor(str(tmp_path / "hosts"))
+
+    distributor.distribute(str(staged), ["host-0"], dest=lib)
+    with open(_on_host(distributor, "host-0", lib), "rb") as f:
+        assert f.read() == b"lib"
+    assert not os.path.exists(_on_host(distributor, "host-0", str(staged)))
+    timings = distributor.distribute(str(staged), ["host-0"], dest=lib)
+    assert all(skipped for _, skipped in timings.values())
+
+
+def test_remote_command_is_abstract():
+    with pytest.raises(TypeError, match="_remote_command"):
+        FileDistributor()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
+
+from gscoordinator.object_manager import ObjectManager
+from gscoordinator.object_manager import OpPool
+
+
+def _walk(pool):
+    return (
+        sum(op.ByteSize() for op in pool.ops.values()),
+        sum(r.ByteSize() for r in pool.results.values()),
+    )
+
+
+def test_op_pool_stats():
+    pool = OpPool(capacity=1)
+    for i in range(3):
+        op = op_def_pb2.OpDef(
+            key="op%d" % i,
+            op=types_pb2.CONTEXT_TO_NUMPY,
+            output_type=types_pb2.RESULTS,
+        )
+        pool.put_op(op)
+        # preprocessed in place
+        op.attr[types_pb2.SELECTOR].s = b"r" * (i + 1)
+        pool.put_result(op_def_pb2.OpResult(key=op.key, result=b"0" * i))
+        pool.retire([op.key])
+        stats = pool.stats()
+        assert (stats["op_bytes"], stats["result_bytes"]) == _walk(pool)
+    # the retired ones are evicted beyond the capacity
+    assert pool.stats()["ops"] == pool.stats()["retired"] == 1
+
+    pool.clear()
+    assert pool.stats()["op_bytes"] == pool.stats()["result_bytes"] == 0
+
+
+def test_gremlin_result_sets():
+    objects = ObjectManager()
+    pool = OpPool(capacity=0, object_manager=objects)
+
+    def _run(key, op_type, output_type, parents=()):
+        pool.put_op(
+            op_def_pb2.OpDef(
+                key=key, op=op_type, output_type=output_type, parents=parents
+            )
+        )
+        pool.put_result(op_def_pb2.OpResult(key=key))
+        objects.put(key, key)
+        pool.retire([key])
+
+    _run("gie", types_pb2.CREATE_INTERACTIVE_QUERY, types_pb2.INTERACTIVE_QUERY)
+    _run("query", types_pb2.GREMLIN_QUERY, types_pb2.RESULTS, ["gie"])
+    _run("fetch", types_pb2.FETCH_GREMLIN_RESULT, types_pb2.RESULTS, ["query"])
+    # the result set can be fetched again as long as the instance is open
+    assert "query" in pool.ops and "query" in objects
+    assert "fetch" not in pool.ops and "fetch" not in objects
+
+    _run("close", types_pb2.CLOSE_INTERACTIVE_QUERY, types_pb2.NULL_OUTPUT, ["gie"])
+    assert len(pool) == 0
+    assert not objects.keys()
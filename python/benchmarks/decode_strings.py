@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare the batched string decoder of :class:`OutArchive` with decoding
+strings one by one, for strings in variable width and in fixed width.
+
+    python3 benchmarks/decode_strings.py --num 10000000
+"""
+
+import argparse
+import struct
+import time
+
+import numpy as np
+
+from graphscope.client.archive import OutArchive
+from graphscope.framework.utils import decode_string_array
+
+
+def generate(num, fixed_width):
+    rng = np.random.default_rng(0)
+    if fixed_width:
+        strings = ["%016x" % v for v in rng.integers(0, 1 << 40, size=num)]
+    else:
+        strings = [str(v) for v in rng.integers(0, 1 << 40, size=num)]
+    return b"".join(struct.pack("q", len(s)) + s.encode("utf-8") for s in strings)
+
+
+def decode_one_by_one(buffer, num):
+    archive = OutArchive(buffer)
+    return np.array([archive.get_string() for _ in range(num)], dtype=object)
+
+
+def decode_batched(buffer, num):
+    archive = OutArchive(buffer)
+    return decode_string_array(archive, num).to_numpy(zero_copy_only=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num", type=int, default=1000000)
+    args = parser.parse_args()
+
+    for fixed_width in (False, True):
+        buffer = generate(args.num, fixed_width)
+        results = []
+        for name, fn in [
+            ("one-by-one", decode_one_by_one),
+            ("batched", decode_batched),
+        ]:
+            start = time.perf_counter()
+            results.append(fn(buffer, args.num))
+            print(
+                "%-14s %-12s %.3fs"
+                % (
+                    "fixed-width" if fixed_width else "variable-width",
+                    name,
+                    time.perf_counter() - start,
+                )
+            )
+        assert np.array_equal(results[0], results[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare the peak memory of sending numpy arrays in COO format as a loader,
+from the arrays to the requests of RunStep, by transposing a DataFrame and
+copying the arrow ipc stream into bytes, and by the column-wise arrow table
+serialized into the chunk directly.
+
+Each way runs in a process of its own, and the memory on top of the arrays
+is reported.
+
+    python3 benchmarks/loader_memory.py --num 50000000
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from graphscope.client.utils import GRPCUtils
+from graphscope.framework.loader import Loader
+from graphscope.proto import attr_value_pb2
+from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
+
+
+def generate(num):
+    rng = np.random.default_rng(0)
+    return [
+        rng.integers(0, num, size=num, dtype=np.int64),
+        rng.integers(0, num, size=num, dtype=np.int64),
+        rng.random(size=num),
+    ]
+
+
+def transpose(source, chunk_size):
+    col_names = ["f%s" % i for i in range(len(source))]
+    df = pd.DataFrame(source, col_names).T
+    df = df.astype({name: array.dtype for name, array in zip(col_names, source)})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    chunk = attr_value_pb2.Chunk()
+    chunk.buffer = bytes(memoryview(sink.getvalue()))
+    for i in range(0, len(chunk.buffer), chunk_size):
+        yield chunk.buffer[i : i + chunk_size]
+
+
+def zero_copy(source, chunk_size):
+    loader = Loader(source)
+    dag_def = op_def_pb2.DagDef()
+    op = dag_def.op.add(key="loader", op=types_pb2.DATA_SOURCE)
+    op.large_attr.chunk_list.items.add().MergeFromString(
+        memoryview(loader.get_attr()[types_pb2.VALUES])
+    )
+    del loader
+    grpc_utils = GRPCUtils()
+    grpc_utils.CHUNK_SIZE = chunk_size
+    for request in grpc_utils.generate_runstep_requests("session", dag_def):
+        yield request.body.chunk
+
+
+def max_rss():
+    # in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(name, num, chunk_size):
+    source = generate(num)
+    baseline = max_rss()
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in globals()[name](source, chunk_size))
+    print(
+        "%-10s %.3fs, sent %d MB, peak %d MB on top of %d MB of arrays"
+        % (
+            name,
+            time.perf_counter() - start,
+            size >> 20,
+            (max_rss() - baseline) >> 20,
+            sum(array.nbytes for array in source) >> 20,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num", type=int, default=10000000)
+    parser.add_argument("--chunk-size", type=int, default=GRPCUtils.CHUNK_SIZE)
+    parser.add_argument("--run", choices=["transpose", "zero_copy"])
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run(args.run, args.num, args.chunk_size)
+        return
+    for name in ("transpose", "zero_copy"):
+        subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--num",
+                str(args.num),
+                "--chunk-size",
+                str(args.chunk_size),
+                "--run",
+                name,
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the edges/sec ingested through :meth:`nx.Graph.add_edges_from`,
+with the pending edges shipped to engine in json and in columnar layout,
+and with the edges given as a dataframe.
+
+Without `--engine`, only the client-side encoding of the batch is measured:
+
+    python3 benchmarks/nx_add_edges.py --num 1000000
+    python3 benchmarks/nx_add_edges.py --num 1000000 --engine
+"""
+
+import argparse
+import time
+
+import numpy as np
+import orjson as json
+import pandas as pd
+
+from graphscope.nx.utils.misc import columns_of
+from graphscope.nx.utils.misc import encode_columns
+from graphscope.nx.utils.misc import encode_edges
+
+
+def generate(num, weighted):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "source": rng.integers(0, num // 10 + 1, size=num),
+            "target": rng.integers(0, num // 10 + 1, size=num),
+        }
+    )
+    if not weighted:
+        return df, list(zip(df["source"].tolist(), df["target"].tolist()))
+    df["weight"] = rng.random(num)
+    edges = zip(df["source"].tolist(), df["target"].tolist(), df["weight"].tolist())
+    return df, [(u, v, {"weight": w}) for u, v, w in edges]
+
+
+def encode(edges, mode):
+    if mode == "json":
+        return json.dumps(edges, option=json.OPT_SERIALIZE_NUMPY)
+    if mode == "columnar":
+        return encode_edges(edges)
+    return encode_columns(*columns_of(edges, ["source", "target"], True))
+
+
+def ingest(edges, mode):
+    from graphscope import nx
+
+    G = nx.Graph()
+    G.columnar_modification = mode != "json"
+    if mode == "dataframe":
+        G.add_edges_from(edges, edge_attr=True)
+    else:
+        G.add_edges_from(edges)
+    # flush the pending edges to engine
+    return G.number_of_edges()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num", type=int, default=1000000)
+    parser.add_argument(
+        "--engine", action="store_true", help="ingest into a local session"
+    )
+    args = parser.parse_args()
+
+    if args.engine:
+        import graphscope
+
+        sess = graphscope.session(cluster_type="hosts", num_workers=1)
+        sess.as_default()
+
+    for weighted in (False, True):
+        df, edges = generate(args.num, weighted)
+        for mode in ("json", "columnar", "dataframe"):
+            data = df if mode == "dataframe" else edges
+            start = time.perf_counter()
+            if args.engine:
+                ingest(data, mode)
+            else:
+                size = len(encode(data, mode))
+            elapsed = time.perf_counter() - start
+            print(
+                "%-10s %-10s %12.0f edges/s"
+                % ("weighted" if weighted else "unweighted", mode, args.num / elapsed),
+                "" if args.engine else "(%d bytes)" % size,
+            )
+
+    if args.engine:
+        sess.close()
+
+
+if __name__ == "__main__":
+    main()
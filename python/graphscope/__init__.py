@@ -31,6 +31,7 @@ from graphscope.client.session import set_option
 from graphscope.framework.errors import *
 from graphscope.framework.graph import Graph
 from graphscope.framework.graph_builder import load_from
+from graphscope.framework.tracing import trace
 from graphscope.version import __version__
 
 __doc__ = """
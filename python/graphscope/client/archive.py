@@ -19,6 +19,8 @@
 
 import struct
 
+import numpy as np
+
 
 class OutArchive(object):
     """A python equivalent for the :code:`Archive` serialization protocol."""
@@ -29,6 +31,7 @@ class OutArchive(object):
         self._head = 0
         # assume all size is int64_t
         self._size_of_int64 = struct.calcsize("q")
+        self._size_struct = struct.Struct("q")
 
     @property
     def buffer(self):
@@ -75,3 +78,63 @@ class OutArchive(object):
         size_of_int = struct.calcsize("i")
         i = struct.unpack("i", self.get_block(size_of_int))[0]
         return i
+
+    def get_string_block(self, count):
+        """Peek `count` strings at once.
+
+        The position of each string depends on the lengths of all strings
+        before it, so in general the length prefixes are read one after
+        another, and only the payload of strings is gathered into a contiguous
+        buffer in a vectorized pass. When all strings share the same length,
+        which is common for string ids, the whole block is decoded vectorized.
+
+        Returns:
+            tuple: A numpy array of `count + 1` int64 offsets, and a numpy array
+            of uint8 that holds the utf-8 encoded strings back to back, i.e.,
+            the i-th string is `data[offsets[i]:offsets[i + 1]]`.
+        """
+        if count == 0:
+            return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+        unpack_from = self._size_struct.unpack_from
+        buffer, begin = self._buffer, self._head
+        sizeof = self._size_of_int64
+
+        # fast path: strings are in the same length, then the i-th length
+        # prefix must be at a fixed stride.
+        length = unpack_from(buffer, begin)[0]
+        stride = sizeof + length
+        if begin + stride * count <= len(buffer):
+            prefixes = np.ndarray(
+                shape=(count,),
+                dtype=np.int64,
+                buffer=buffer,
+                offset=begin,
+                strides=(stride,),
+            )
+            if np.all(prefixes == length):
+                self._head = begin + stride * count
+                raw = np.frombuffer(
+                    buffer, dtype=np.uint8, count=stride * count, offset=begin
+                )
+                data = raw.reshape(count, stride)[:, sizeof:].ravel()
+                return np.arange(count + 1, dtype=np.int64) * length, data
+
+        head = begin
+        lengths = []
+        append = lengths.append
+        for _ in range(count):
+            size = unpack_from(buffer, head)[0]
+            append(size)
+            head += sizeof + size
+        self._head = head
+
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=head - begin, offset=begin)
+        # mask out the length prefixes, the prefix of the i-th string starts
+        # at `offsets[i] + i * sizeof(int64)` of the raw block.
+        prefix = offsets[:-1] + np.arange(count, dtype=np.int64) * sizeof
+        prefix = prefix[:, np.newaxis] + np.arange(sizeof, dtype=np.int64)
+        mask = np.ones(raw.shape[0], dtype=bool)
+        mask[prefix.ravel()] = False
+        return offsets, raw[mask]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+""" Cache of the results of evaluated operations in a session.
+"""
+
+from collections import OrderedDict
+
+from graphscope.proto import types_pb2
+
+__all__ = ["ResultCache"]
+
+
+class ResultCache(object):
+    """LRU cache of the fetched results of a session, keyed by the
+    :attr:`graphscope.framework.operation.Operation.signature` of the fetches.
+
+    Only the results that are determined by the signature are cached, i.e., graphs,
+    contexts of apps and the tensors and dataframes retrieved from them, and only
+    when all of their root operations load graphs or apps from scratch. The operations
+    that refer to an existing engine object by name, as the nx graphs do, are never
+    cached, since the object may be modified in place, and so are the graphs loaded
+    from files, streams or named vineyard objects, which may change between loads,
+    whereas the dataframes and numpy arrays carried by the op and the vineyard
+    objects referred by id are immutable.
+
+    A hit returns the very object of the previous evaluation. Results that depend
+    on an unloaded graph, app or context are dropped, and an evicted graph or context
+    is unloaded by itself once there are no other references to it.
+    """
+
+    _root_types = (types_pb2.CREATE_APP, types_pb2.CREATE_GRAPH, types_pb2.DATA_SOURCE)
+    _unload_types = (
+        types_pb2.UNLOAD_APP,
+        types_pb2.UNLOAD_GRAPH,
+        types_pb2.UNLOAD_CONTEXT,
+    )
+
+    def __init__(self, maxsize=0):
+        self._maxsize = maxsize
+        # signature -> (keys of the op and its ancestors, result)
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._maxsize = value
+        self._evict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, fetches):
+        """Get the cached results of all `fetches`, or None if any of them misses."""
+        if not self._maxsize:
+            return None
+        signatures = [self._signature_of(fetch) for fetch in fetches]
+        if any(
+            signature is None or signature not in self._results
+            for signature in signatures
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        results = []
+        for signature in signatures:
+            self._results.move_to_end(signature)
+            results.append(self._results[signature][1])
+        return results
+
+    def put(self, fetches, results):
+        if not self._maxsize:
+            return
+        for fetch, result in zip(fetches, results):
+            signature = self._signature_of(fetch)
+            if signature is not None:
+                self._results[signature] = (self._keys_of(fetch.op), result)
+                self._results.move_to_end(signature)
+        self._evict()
+
+    def discard(self, dag_def):
+        """Drop the results that depend on the objects unloaded by `dag_def`."""
+        unloaded = set()
+        for op_def in dag_def.op:
+            if op_def.op in self._unload_types:
+                unloaded.update(op_def.parents)
+        if not unloaded or not self._results:
+            return
+        for signature, (keys, _) in list(self._results.items()):
+            if not unloaded.isdisjoint(keys):
+                del self._results[signature]
+
+    def clear(self):
+        self._results.clear()
+
+    def _evict(self):
+        while len(self._results) > self._maxsize:
+            self._results.popitem(last=False)
+
+    def _signature_of(self, fetch):
+        # raw operations are fetched by the internals, e.g., the nx graphs
+        op = getattr(fetch, "op", None)
+        if op is None or not self._cacheable(op):
+            return None
+        return op.signature
+
+    def _cacheable(self, op):
+        if op.output_types == types_pb2.RESULTS:
+            if op.type != types_pb2.RUN_APP:
+                return False
+        elif op.output_types not in (
+            types_pb2.GRAPH,
+            types_pb2.TENSOR,
+            types_pb2.DATAFRAME,
+        ):
+            return False
+        stack, visited = [op], set()
+        while stack:
+            op = stack.pop()
+            if op.key in visited:
+                continue
+            visited.add(op.key)
+            if not op.parents and op.type not in self._root_types:
+                return False
+            if self._external(op):
+                return False
+            stack.extend(op.parents)
+        return True
+
+    @staticmethod
+    def _external(op):
+        """Whether the op reads a source outside of the op when evaluated."""
+        op_def = op.as_op_def()
+        if op.type == types_pb2.DATA_SOURCE:
+            for chunk in op_def.large_attr.chunk_list.items:
+                if types_pb2.VALUES in chunk.attr:
+                    continue
+                if (
+                    types_pb2.PROTOCOL not in chunk.attr
+                    or chunk.attr[types_pb2.PROTOCOL].s != b"vineyard"
+                ):
+                    return True
+        elif op.type == types_pb2.CREATE_GRAPH:
+            for key in (types_pb2.VINEYARD_NAME, types_pb2.E_FILE, types_pb2.V_FILE):
+                if key in op_def.attr and op_def.attr[key].s:
+                    return True
+        return False
+
+    def _keys_of(self, op):
+        keys, stack = set(), [op]
+        while stack:
+            op = stack.pop()
+            if op.key not in keys:
+                keys.add(op.key)
+                stack.extend(op.parents)
+        return keys
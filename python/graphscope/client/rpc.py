@@ -18,6 +18,7 @@
 
 
 import functools
+import inspect
 import json
 import logging
 import pickle
@@ -28,6 +29,8 @@ import grpc
 
 from graphscope.client.utils import GS_GRPC_MAX_MESSAGE_LENGTH
 from graphscope.client.utils import GRPCUtils
+from graphscope.client.utils import available_compressions
+from graphscope.framework import tracing
 from graphscope.framework.errors import FatalError
 from graphscope.framework.errors import GRPCError
 from graphscope.proto import coordinator_service_pb2_grpc
@@ -38,29 +41,46 @@ from graphscope.version import __version__
 logger = logging.getLogger("graphscope")
 
 
+def _raise_from_grpc_error(fn, exc):
+    if grpc.StatusCode.INTERNAL == exc.code():
+        raise GRPCError("Internal Error: " + exc.details()) from None
+    elif (
+        grpc.StatusCode.UNKNOWN == exc.code()
+        or grpc.StatusCode.UNAVAILABLE == exc.code()
+    ):
+        logger.error(
+            "rpc %s: failed with error code %s, details: %s"
+            % (fn.__name__, exc.code(), exc.details())
+        )
+        raise FatalError("The analytical engine server may down.") from None
+    else:
+        raise GRPCError("rpc %s failed: status %s" % (str(fn.__name__), exc)) from None
+
+
 def catch_grpc_error(fn):
-    """Print error info from a :class:`grpc.RpcError`."""
+    """Print error info from a :class:`grpc.RpcError`.
+
+    Generator functions are supported as well, in which case the error
+    raised during the iteration will be caught.
+    """
+
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def with_grpc_catch_generator(*args, **kwargs):
+            try:
+                yield from fn(*args, **kwargs)
+            except grpc.RpcError as exc:
+                _raise_from_grpc_error(fn, exc)
+
+        return with_grpc_catch_generator
 
     @functools.wraps(fn)
     def with_grpc_catch(*args, **kwargs):
         try:
             return fn(*args, **kwargs)
         except grpc.RpcError as exc:
-            if grpc.StatusCode.INTERNAL == exc.code():
-                raise GRPCError("Internal Error: " + exc.details()) from None
-            elif (
-                grpc.StatusCode.UNKNOWN == exc.code()
-                or grpc.StatusCode.UNAVAILABLE == exc.code()
-            ):
-                logger.error(
-                    "rpc %s: failed with error code %s, details: %s"
-                    % (fn.__name__, exc.code(), exc.details())
-                )
-                raise FatalError("The analytical engine server may down.") from None
-            else:
-                raise GRPCError(
-                    "rpc %s failed: status %s" % (str(fn.__name__), exc)
-                ) from None
+            _raise_from_grpc_error(fn, exc)
 
     return with_grpc_catch
 
@@ -143,11 +163,21 @@ class GRPCClient(object):
     def __repr__(self):
         return str(self)
 
-    def run(self, dag_def):
-        runstep_requests = self._grpc_utils.generate_runstep_requests(
-            self._session_id, dag_def
-        )
-        return self._run_step_impl(runstep_requests)
+    def run(self, dag_def, stream=False, trace=None):
+        """Run `dag_def`, and record the spans of the coordinator as well into
+        `trace`, defaults to the active one.
+        """
+        if trace is None:
+            trace = tracing.current_trace()
+        trace_id = "" if trace is None else trace.trace_id
+        with tracing.activate(trace), tracing.span("GRPCClient.serialize"):
+            # the dag is split here, and the chunks are sliced as they are sent
+            runstep_requests = self._grpc_utils.generate_runstep_requests(
+                self._session_id, dag_def, trace_id
+            )
+        if stream:
+            return self._run_step_stream_impl(runstep_requests, trace)
+        return self._run_step_impl(runstep_requests, trace)
 
     def fetch_logs(self):
         if self._logs_fetching_thread is None:
@@ -185,11 +215,13 @@ class GRPCClient(object):
             dangling_timeout_seconds=dangling_timeout_seconds,
             version=__version__,
             reconnect=self._reconnect,
+            compressions=available_compressions(),
         )
 
         response = self._stub.ConnectSession(request)
 
         self._session_id = response.session_id
+        self._grpc_utils.compression = response.compression
         return (
             response.session_id,
             response.cluster_type,
@@ -217,11 +249,9 @@ class GRPCClient(object):
         response = self._stub.CloseSession(request)
         return response
 
-    @catch_grpc_error
-    def _run_step_impl(self, runstep_requests):
-        response = self._grpc_utils.parse_runstep_responses(
-            self._stub.RunStep(runstep_requests)
-        )
+    def _check_runstep_response(self, response, trace=None):
+        if trace is not None and response.trace_events:
+            trace.extend(json.loads(response.trace_events))
         if response.code != error_codes_pb2.OK:
             logger.error(
                 "Runstep failed with code: %s, message: %s",
@@ -230,4 +260,25 @@ class GRPCClient(object):
             )
             if response.full_exception:
                 raise pickle.loads(response.full_exception)
-        return response
+
+    @catch_grpc_error
+    def _run_step_impl(self, runstep_requests, trace=None):
+        with tracing.activate(trace), tracing.span("GRPCClient.RunStep") as span:
+            response, large_results = self._grpc_utils.parse_runstep_responses(
+                self._stub.RunStep(iter(runstep_requests))
+            )
+            span.set(large_result_bytes=sum(len(r) for r in large_results.values()))
+        self._check_runstep_response(response, trace)
+        return response, large_results
+
+    @catch_grpc_error
+    def _run_step_stream_impl(self, runstep_requests, trace=None):
+        chunks = self._grpc_utils.iter_runstep_responses(
+            self._stub.RunStep(iter(runstep_requests)),
+            functools.partial(self._check_runstep_response, trace=trace),
+        )
+        return self._fetch_chunks_impl(chunks)
+
+    @catch_grpc_error
+    def _fetch_chunks_impl(self, chunks):
+        yield from chunks
@@ -19,6 +19,7 @@
 """ Manage sessions to the GraphScope coordinator.
 """
 
+import asyncio
 import atexit
 import base64
 import contextlib
@@ -31,6 +32,7 @@ import threading
 import time
 import uuid
 import warnings
+from concurrent import futures
 
 try:
     from kubernetes import client as kube_client
@@ -40,6 +42,7 @@ except ImportError:
     kube_config = None
 
 import graphscope
+from graphscope.client.cache import ResultCache
 from graphscope.client.rpc import GRPCClient
 from graphscope.client.utils import CaptureKeyboardInterrupt
 from graphscope.client.utils import GSLogger
@@ -48,7 +51,9 @@ from graphscope.client.utils import set_defaults
 from graphscope.config import GSConfig as gs_config
 from graphscope.deploy.hosts.cluster import HostsClusterLauncher
 from graphscope.deploy.kubernetes.cluster import KubernetesClusterLauncher
+from graphscope.framework import tracing
 from graphscope.framework.dag import Dag
+from graphscope.framework.dag import optimize
 from graphscope.framework.errors import FatalError
 from graphscope.framework.errors import InteractiveEngineInternalError
 from graphscope.framework.errors import InvalidArgumentError
@@ -56,8 +61,11 @@ from graphscope.framework.errors import K8sError
 from graphscope.framework.graph import Graph
 from graphscope.framework.graph import GraphDAGNode
 from graphscope.framework.operation import Operation
+from graphscope.framework.utils import decode_arrow_table
 from graphscope.framework.utils import decode_dataframe
+from graphscope.framework.utils import decode_dataframe_blocks
 from graphscope.framework.utils import decode_numpy
+from graphscope.framework.utils import decode_numpy_blocks
 from graphscope.interactive.query import InteractiveQuery
 from graphscope.interactive.query import InteractiveQueryDAGNode
 from graphscope.interactive.query import InteractiveQueryStatus
@@ -98,7 +106,7 @@ class _FetchHandler(object):
                 raise ValueError("Expect an `Operation` in sess run method.")
             self._ops.append(fetch)
         # extract sub dag
-        self._sub_dag = dag.extract_subdag_for(self._ops)
+        self._sub_dag, self._aliases = optimize(dag.extract_subdag_for(self._ops))
         if "debug" in os.environ:
             logger.info("sub_dag: %s", self._sub_dag)
 
@@ -106,6 +114,17 @@ class _FetchHandler(object):
     def targets(self):
         return self._sub_dag
 
+    @property
+    def fetches(self):
+        return self._fetches
+
+    def pack_results(self, rets):
+        return rets[0] if self._unpack else rets
+
+    def _result_key_of(self, op):
+        # the op may be merged into an identical one
+        return self._aliases.get(op.key, op.key)
+
     def _rebuild_graph(self, seq, op: Operation, op_result: op_def_pb2.OpResult):
         if isinstance(self._fetches[seq], Operation):
             # for nx Graph
@@ -181,19 +200,23 @@ class _FetchHandler(object):
         result_set_dag_node = self._fetches[seq]
         return ResultSet(result_set_dag_node)
 
-    def wrap_results(self, response: message_pb2.RunStepResponse):
+    def wrap_results(self, response: message_pb2.RunStepResponse, large_results=None):
         rets = list()
+        if large_results is None:
+            large_results = {}
         for seq, op in enumerate(self._ops):
             for op_result in response.results:
-                if op.key == op_result.key:
+                if self._result_key_of(op) == op_result.key:
+                    # large result is received separately from the response head
+                    result = large_results.get(op_result.key, op_result.result)
                     if op.output_types == types_pb2.RESULTS:
                         if op.type == types_pb2.RUN_APP:
                             rets.append(self._rebuild_context(seq, op, op_result))
                         elif op.type == types_pb2.FETCH_GREMLIN_RESULT:
-                            rets.append(pickle.loads(op_result.result))
+                            rets.append(pickle.loads(result))
                         else:
                             # for nx Graph
-                            rets.append(op_result.result.decode("utf-8"))
+                            rets.append(bytes(result).decode("utf-8"))
                     if op.output_types == types_pb2.GREMLIN_RESULTS:
                         rets.append(self._rebuild_gremlin_results(seq, op, op_result))
                     if op.output_types == types_pb2.GRAPH:
@@ -212,29 +235,53 @@ class _FetchHandler(object):
                             json.loads(op_result.result.decode("utf-8"))["object_id"]
                         )
                     if op.output_types in (types_pb2.TENSOR, types_pb2.DATAFRAME):
+                        if op.type == types_pb2.REPORT_GRAPH:
+                            # for nx Graph
+                            rets.append(decode_arrow_table(result))
                         if (
                             op.type == types_pb2.CONTEXT_TO_DATAFRAME
                             or op.type == types_pb2.GRAPH_TO_DATAFRAME
                         ):
-                            rets.append(decode_dataframe(op_result.result))
+                            rets.append(decode_dataframe(result))
                         if (
                             op.type == types_pb2.CONTEXT_TO_NUMPY
                             or op.type == types_pb2.GRAPH_TO_NUMPY
                         ):
-                            rets.append(decode_numpy(op_result.result))
+                            rets.append(decode_numpy(result))
                     if op.output_types == types_pb2.INTERACTIVE_QUERY:
                         rets.append(self._rebuild_interactive_query(seq, op, op_result))
                     if op.output_types == types_pb2.NULL_OUTPUT:
                         rets.append(None)
                     break
-        return rets[0] if self._unpack else rets
+        return rets
+
+    def check_streamable(self):
+        if (
+            not self._unpack
+            or self._ops[0].output_types not in (types_pb2.TENSOR, types_pb2.DATAFRAME)
+            or self._ops[0].type == types_pb2.REPORT_GRAPH
+        ):
+            raise InvalidArgumentError(
+                "Only a single fetch of tensor or dataframe could be streamed."
+            )
+
+    def wrap_results_stream(self, chunks):
+        """Decode the large result of the fetch incrementally from `chunks`,
+        which is a generator of `(op_key, chunk)`.
+        """
+        op = self._ops[0]
+        key = self._result_key_of(op)
+        chunks = (chunk for op_key, chunk in chunks if op_key == key)
+        if op.type in (types_pb2.CONTEXT_TO_DATAFRAME, types_pb2.GRAPH_TO_DATAFRAME):
+            return decode_dataframe_blocks(chunks)
+        return decode_numpy_blocks(chunks)
 
     def get_dag_for_unload(self):
         """Unload operations (graph, app, context) in dag which are not
         existed in fetches.
         """
         unload_dag = op_def_pb2.DagDef()
-        keys_of_fetches = set([op.key for op in self._ops])
+        keys_of_fetches = set([self._result_key_of(op) for op in self._ops])
         mapping = {
             types_pb2.CREATE_GRAPH: types_pb2.UNLOAD_GRAPH,
             types_pb2.CREATE_APP: types_pb2.UNLOAD_APP,
@@ -347,6 +394,7 @@ class Session(object):
         dangling_timeout_seconds=gs_config.dangling_timeout_seconds,
         with_mars=gs_config.with_mars,
         mount_dataset=gs_config.mount_dataset,
+        result_cache_size=gs_config.result_cache_size,
         reconnect=False,
         **kw,
     ):
@@ -498,6 +546,12 @@ class Session(object):
                 Expect this value to be greater than 5 (heartbeat interval).
                 Disable dangling check by setting -1.
 
+            result_cache_size (int, optional): Cache the results of at most this number of fetches,
+                keyed by the signature of operations, then an identical query, e.g., running the same
+                app on the same graph with the same arguments, returns the previous result without
+                evaluating in engines. The cached graphs and contexts are kept alive until evicted.
+                Disable the cache by setting 0. Defaults to 0.
+
             k8s_waiting_for_delete (bool, optional): Waiting for service delete or not. Defaults to False.
 
             **kw (dict, optional): Other optional parameters will be put to :code:`**kw`.
@@ -578,6 +632,7 @@ class Session(object):
             "dangling_timeout_seconds",
             "mount_dataset",
             "k8s_dataset_image",
+            "result_cache_size",
         )
         self._deprecated_params = (
             "show_log",
@@ -612,6 +667,17 @@ class Session(object):
         # initial dag
         self._dag = Dag()
 
+        # cache of the fetched results, disabled by default
+        self._result_cache = ResultCache(self._config_params["result_cache_size"])
+
+        # serializes the runs, including the ones submitted by `run_async`
+        self._run_lock = threading.RLock()
+        self._run_executor = None
+        # unload ops of lazy mode, which are sent along with the next run, or on
+        # their own once the session is idle
+        self._pending_unload = op_def_pb2.DagDef()
+        self._last_run = time.time()
+
         # mars cannot work with run-on-local mode
         if self._cluster_type == types_pb2.HOSTS and self._config_params["with_mars"]:
             raise NotImplementedError(
@@ -666,6 +732,8 @@ class Session(object):
 
         self._launcher = None
         self._heartbeat_sending_thread = None
+        # sizes of the op pool of coordinator, reported by the last heartbeat
+        self._op_pool_stats = None
 
         self._grpc_client = None
         self._session_id = None  # unique identifier across sessions
@@ -770,6 +838,11 @@ class Session(object):
         info["num_workers"] = self._config_params["num_workers"]
         info["coordinator_endpoint"] = self._coordinator_endpoint
         info["engine_config"] = self._engine_config
+        if self._op_pool_stats is not None:
+            info["op_pool"] = {
+                field.name: getattr(self._op_pool_stats, field.name)
+                for field in self._op_pool_stats.DESCRIPTOR.fields
+            }
         return info
 
     @property
@@ -783,12 +856,18 @@ class Session(object):
         while not self._closed:
             if self._grpc_client:
                 try:
-                    self._grpc_client.send_heartbeat()
+                    response = self._grpc_client.send_heartbeat()
                 except Exception as exc:
                     logger.warning(exc)
                     self._disconnected = True
                 else:
                     self._disconnected = False
+                    self._op_pool_stats = response.op_pool_stats
+                if time.time() - self._last_run >= self._heartbeat_interval_seconds:
+                    try:
+                        self._flush_pending_unload()
+                    except Exception as exc:
+                        logger.warning("Failed to unload the objects: %s", exc)
             time.sleep(self._heartbeat_interval_seconds)
 
     def close(self):
@@ -804,7 +883,16 @@ class Session(object):
     def _close(self):
         if self._closed:
             return
+        # release the cached graphs and contexts while the session is alive
+        self._result_cache.clear()
+        try:
+            self._flush_pending_unload()
+        except Exception:
+            pass
         self._closed = True
+        if self._run_executor is not None:
+            self._run_executor.shutdown(wait=False)
+            self._run_executor = None
         self._coordinator_endpoint = None
 
         self._deregister_default()
@@ -924,10 +1012,14 @@ class Session(object):
             return self.run(dag_node)
         return dag_node
 
-    def run(self, fetches, debug=False):
+    def run(self, fetches, debug=False, stream=False):
         """Run operations of `fetch`.
         Args:
             fetch: :class:`Operation`
+            stream (bool, optional): If True, return a generator which yields the
+                decoded blocks of rows of the result as chunks arrive, rather than
+                waiting for the whole payload. Only available for a single fetch
+                that produces a tensor or dataframe. Defaults to False.
 
         Raises:
             RuntimeError:
@@ -943,25 +1035,164 @@ class Session(object):
         Returns:
             Different values for different output types of :class:`Operation`
         """
+        # the dag is extracted under the lock, after the queued async runs have
+        # marked their ops as evaluated
+        with tracing.span("Session.run"), self._run_lock:
+            fetch_handler = self._fetch_handler_of(fetches)
+            if stream:
+                fetch_handler.check_streamable()
+                return self._run_stream(fetch_handler, tracing.current_trace())
+            return self._run_fetches(fetch_handler)
+
+    def run_async(self, fetches):
+        """Run operations of `fetch` without waiting for the results.
+
+        The runs submitted by this method are evaluated one by one in the order of
+        submission, in a background thread of the session, so the caller may build
+        and submit the following operations in the meantime.
+
+        Args:
+            fetch: :class:`Operation`
+
+        Raises:
+            RuntimeError:
+                Client disconnect to the service. Or run on a closed session.
+
+        Returns:
+            :class:`concurrent.futures.Future`: The future of the values that
+            :meth:`run` returns for `fetch`, which raises :class:`ValueError` if
+            fetch is not a instance of :class:`Operation`.
+        """
+        self._check_connected()
+        with self._run_lock:
+            if self._run_executor is None:
+                self._run_executor = futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="session-run"
+                )
+            return self._run_executor.submit(
+                self._run_async, fetches, tracing.current_trace()
+            )
+
+    def _run_async(self, fetches, trace):
+        # the dag is extracted when the run starts rather than on submission, so
+        # the ops evaluated by the runs submitted before are not run again
+        with tracing.activate(trace), self._run_lock:
+            return self._run_fetches(self._fetch_handler_of(fetches))
+
+    async def arun(self, fetches):
+        """The asyncio flavor of :meth:`run_async`, which can be awaited in an
+        event loop without blocking it.
+        """
+        return await asyncio.wrap_future(self.run_async(fetches))
+
+    def _check_connected(self):
         if self._closed:
             raise RuntimeError("Attempted to use a closed Session.")
         if not self._grpc_client:
             raise RuntimeError("Session disconnected.")
-        fetch_handler = _FetchHandler(self.dag, fetches)
+
+    def _fetch_handler_of(self, fetches):
+        self._check_connected()
+        with tracing.span("Session.build_dag"):
+            return _FetchHandler(self.dag, fetches)
+
+    def _run_fetches(self, fetch_handler, trace=None):
+        # async runs are evaluated in another thread, with the trace of the caller
+        with tracing.activate(trace or tracing.current_trace()), self._run_lock:
+            self._result_cache.discard(fetch_handler.targets)
+            rets = self._result_cache.get(fetch_handler.fetches)
+            if rets is not None:
+                return fetch_handler.pack_results(rets)
+            unloads = self._take_pending_unload()
+            try:
+                response, large_results = self._grpc_client.run(
+                    self._with_unload(unloads, fetch_handler.targets)
+                )
+            except FatalError:
+                self.close()
+                raise
+            except Exception:
+                self._restore_pending_unload(unloads)
+                raise
+            self._unload_untouchable(fetch_handler)
+            with tracing.span("Session.wrap_results"):
+                rets = fetch_handler.wrap_results(response, large_results)
+            self._result_cache.put(fetch_handler.fetches, rets)
+        return fetch_handler.pack_results(rets)
+
+    def _run_stream(self, fetch_handler, trace=None):
+        with self._run_lock:
+            self._result_cache.discard(fetch_handler.targets)
+            unloads = self._take_pending_unload()
         try:
-            response = self._grpc_client.run(fetch_handler.targets)
+            chunks = self._grpc_client.run(
+                self._with_unload(unloads, fetch_handler.targets),
+                stream=True,
+                trace=trace,
+            )
+            yield from fetch_handler.wrap_results_stream(chunks)
         except FatalError:
             self.close()
             raise
+        except Exception:
+            self._restore_pending_unload(unloads)
+            raise
+        finally:
+            # even if the caller stops consuming the generator halfway
+            self._unload_untouchable(fetch_handler)
+
+    def _unload_untouchable(self, fetch_handler):
         if not self.eager():
-            # Unload operations that cannot be touched anymore
-            dag_to_unload = fetch_handler.get_dag_for_unload()
+            # Unload operations that cannot be touched anymore, along with the
+            # next run, rather than in a round-trip of their own.
+            with self._run_lock:
+                self._pending_unload.op.extend(fetch_handler.get_dag_for_unload().op)
+
+    def _take_pending_unload(self):
+        """Take the pending unload ops out, which are restored by
+        :meth:`_restore_pending_unload` if the run that carries them fails.
+        """
+        with self._run_lock:
+            self._last_run = time.time()
+            unloads = op_def_pb2.DagDef()
+            unloads.CopyFrom(self._pending_unload)
+            self._pending_unload.Clear()
+            return unloads
+
+    def _restore_pending_unload(self, unloads):
+        with self._run_lock:
+            unloads.op.extend(self._pending_unload.op)
+            self._pending_unload.CopyFrom(unloads)
+
+    @staticmethod
+    def _with_unload(unloads, dag_def):
+        """Prepend the `unloads` ops to `dag_def`, which release the objects of
+        previous runs before evaluating `dag_def`, as they used to be.
+        """
+        if not unloads.op:
+            return dag_def
+        merged = op_def_pb2.DagDef()
+        merged.op.extend(unloads.op)
+        merged.op.extend(dag_def.op)
+        return merged
+
+    def _flush_pending_unload(self):
+        """Send the pending unload ops on their own, unless a run is in progress,
+        which will carry them.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._pending_unload.op or not self._grpc_client:
+                return
+            unloads = self._take_pending_unload()
             try:
-                self._grpc_client.run(dag_to_unload)
-            except FatalError:
-                self.close()
+                self._grpc_client.run(unloads)
+            except Exception:
+                self._restore_pending_unload(unloads)
                 raise
-        return fetch_handler.wrap_results(response)
+        finally:
+            self._run_lock.release()
 
     def _connect(self):
         if self._config_params["addr"] is not None:
@@ -1301,6 +1532,8 @@ def set_option(**kwargs):
         - engine_params
         - initializing_interactive_engine
         - timeout_seconds
+        - result_cache_size
+        - dataset_snapshot_dir
 
     Args:
         kwargs: dict
@@ -1355,6 +1588,8 @@ def get_option(key):
         - engine_params
         - initializing_interactive_engine
         - timeout_seconds
+        - result_cache_size
+        - dataset_snapshot_dir
 
     Args:
         key: str
@@ -21,17 +21,151 @@ import logging
 import os
 import signal
 import sys
+import uuid
+import weakref
 from functools import wraps
 
+import pyarrow as pa
+
 from graphscope.config import GSConfig as gs_config
 from graphscope.proto import attr_value_pb2
 from graphscope.proto import message_pb2
+from graphscope.proto import types_pb2
 
 logger = logging.getLogger("graphscope")
 
 # 2GB
 GS_GRPC_MAX_MESSAGE_LENGTH = 2 * 1024 * 1024 * 1024 - 1
 
+# codecs of arrow to compress the chunks of RunStep with, in the order of
+# preference, or empty to disable the compression
+GS_GRPC_COMPRESSIONS = [
+    c for c in os.environ.get("GS_GRPC_COMPRESSION", "lz4,zstd").split(",") if c
+]
+# chunks smaller than that are not worth compressing, defaults to 1MB
+GS_GRPC_COMPRESSION_MIN_SIZE = int(
+    os.environ.get("GS_GRPC_COMPRESSION_MIN_SIZE", 1024 * 1024)
+)
+# chunks that don't shrink below the ratio are sent as is
+_max_compression_ratio = 0.9
+
+
+def available_compressions():
+    """The codecs that could be used to compress chunks, in the order of preference."""
+    return [c for c in GS_GRPC_COMPRESSIONS if pa.Codec.is_available(c)]
+
+
+def negotiate_compression(offered):
+    """The first codec that is both `offered` by the peer and available here,
+    or empty if none."""
+    available = available_compressions()
+    for compression in offered:
+        if compression in available:
+            return compression
+    return ""
+
+
+def compress_body(body, compression):
+    """Compress the chunk of a RunStep request or response `body` in place with
+    the codec `compression`, if it's large enough and compressed well.
+
+    Returns:
+        bool: Whether the chunk is compressed.
+    """
+    chunk = body.chunk
+    if not compression or len(chunk) < GS_GRPC_COMPRESSION_MIN_SIZE:
+        return False
+    compressed = pa.Codec(compression).compress(chunk, asbytes=True)
+    if len(compressed) > len(chunk) * _max_compression_ratio:
+        return False
+    body.chunk = compressed
+    body.compression = compression
+    body.uncompressed_size = len(chunk)
+    return True
+
+
+class BodyCompressor(object):
+    """Compress the chunks of RunStep request or response bodies in place by
+    :func:`compress_body`, where the following pieces of an op are sent as is
+    once a large piece of it is not compressed well, as they are likely alike.
+    """
+
+    def __init__(self, compression):
+        self.compression = compression
+        # keys of the ops whose pieces are no longer compressed
+        self._skipped = set()
+
+    def compress(self, body):
+        """Returns whether the chunk of `body` is compressed."""
+        if body.op_key in self._skipped:
+            return False
+        if compress_body(body, self.compression):
+            return True
+        if len(body.chunk) >= GS_GRPC_COMPRESSION_MIN_SIZE:
+            self._skipped.add(body.op_key)
+        return False
+
+
+def decompressed_chunk(body):
+    """The chunk of a RunStep request or response `body`, decompressed."""
+    if not body.compression:
+        return body.chunk
+    return pa.Codec(body.compression).decompress(
+        body.chunk, decompressed_size=body.uncompressed_size, asbytes=True
+    )
+
+
+def decompress_body(body):
+    """Decompress the chunk of a RunStep request or response `body` in place."""
+    if body.compression:
+        body.chunk = decompressed_chunk(body)
+        body.ClearField("compression")
+        body.ClearField("uncompressed_size")
+
+
+# key -> the streams alive, which are removed once no loader or op refers to them
+_chunk_streams = weakref.WeakValueDictionary()
+_stream_prefix = "stream://"
+
+
+class ChunkStream(object):
+    """A chunk whose buffer is generated by `write(chunk_size)` in pieces when the
+    dag is sent, rather than held in the chunk. The chunk refers to the stream by
+    `key` as its `SOURCE`.
+
+    The stream is registered as long as the loaders and ops that hold it are alive,
+    and it is shared rather than copied by `deepcopy`. A stream that isn't `reusable`,
+    e.g., of an iterator, can only be sent once.
+    """
+
+    def __init__(self, write, reusable=False):
+        self.key = _stream_prefix + uuid.uuid4().hex
+        self.reusable = reusable
+        self.sent = False
+        self._write = write
+        _chunk_streams[self.key] = self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def write(self, chunk_size):
+        if self.sent and not self.reusable:
+            raise RuntimeError(
+                "The stream of loader has been sent, "
+                "a loader of iterator cannot be reused"
+            )
+        self.sent = True
+        return self._write(chunk_size)
+
+
+def get_chunk_stream(source):
+    """The stream referred by `source` of a chunk, or None if it isn't a stream."""
+    if not source.startswith(_stream_prefix):
+        return None
+    if source not in _chunk_streams:
+        raise RuntimeError("The stream of loader %s has been released" % source)
+    return _chunk_streams[source]
+
 
 class GRPCUtils(object):
     # default to 256MB
@@ -41,87 +175,183 @@ class GRPCUtils(object):
         else 256 * 1024 * 1024 - 1
     )
 
-    def _generate_chunk_meta(self, chunk):
+    def __init__(self, compression=""):
+        # the codec negotiated with the coordinator to compress chunks
+        self.compression = compression
+
+    def _generate_chunk_meta(self, chunk, size):
         chunk_meta = attr_value_pb2.ChunkMeta()
-        chunk_meta.size = len(chunk.buffer)
+        chunk_meta.size = size
         for k, v in chunk.attr.items():
             chunk_meta.attr[k].CopyFrom(v)
         return chunk_meta
 
     def split(self, dag_def):
-        """Traverse `large_attr` of op and split into a list of chunks.
+        """Traverse `large_attr` of op and take out the buffers of chunks.
 
         Note that this method will modify `large_attr` attribute of op in dag_def.
 
+        The buffer of a registered stream is an iterator of pieces, and its size
+        is -1 as it is unknown until the stream ends.
+
         Returns:
-            Sequence[Sequence[bytes]]: splited chunks.
+            Sequence[Tuple[bytes, str]]: buffers of chunks, and the key of their op.
         """
-        chunks_list = []
+        buffers = []
         for op in dag_def.op:
             large_attr = attr_value_pb2.LargeAttrValue()
             for chunk in op.large_attr.chunk_list.items:
-                # construct chunk meta
+                source = ""
+                if types_pb2.SOURCE in chunk.attr:
+                    source = chunk.attr[types_pb2.SOURCE].s.decode()
+                stream = get_chunk_stream(source)
+                if stream is not None:
+                    buffer, size = stream.write(self.CHUNK_SIZE), -1
+                else:
+                    # each access of `chunk.buffer` returns a new copy of the buffer
+                    buffer = chunk.buffer
+                    size = len(buffer)
                 large_attr.chunk_meta_list.items.extend(
-                    [self._generate_chunk_meta(chunk)]
-                )
-                # split buffer
-                chunks_list.append(
-                    (
-                        [
-                            chunk.buffer[i : i + self.CHUNK_SIZE]
-                            for i in range(0, len(chunk.buffer), self.CHUNK_SIZE)
-                        ],
-                        op.key,
-                    )
+                    [self._generate_chunk_meta(chunk, size)]
                 )
+                buffers.append((buffer, op.key))
             # replace chunk with chunk_meta
             op.large_attr.CopyFrom(large_attr)
-        return chunks_list
-
-    def generate_runstep_requests(self, session_id, dag_def):
-        runstep_requests = []
-        chunks_list = self.split(dag_def)
-        # head
-        runstep_request = message_pb2.RunStepRequest(
-            head=message_pb2.RunStepRequestHead(session_id=session_id, dag_def=dag_def)
+        return buffers
+
+    def generate_runstep_requests(self, session_id, dag_def, trace_id=""):
+        """Generate the requests of RunStep, i.e., a head followed by the bodies that
+        carry the large attributes of ops in pieces of `CHUNK_SIZE`.
+
+        The dag is split right away, while the pieces are sliced lazily as the
+        requests are consumed, thus only a couple of pieces are alive at a time.
+        """
+        buffers = self.split(dag_def)
+        head = message_pb2.RunStepRequest(
+            head=message_pb2.RunStepRequestHead(
+                session_id=session_id, dag_def=dag_def, trace_id=trace_id
+            )
         )
-        runstep_requests.append(runstep_request)
-        # bodies
-        for chunks, op_key in chunks_list:
-            for i, chunk in enumerate(chunks):
-                # check the last element
-                has_next = True
-                if i + 1 == len(chunks):
-                    has_next = False
-                runstep_request = message_pb2.RunStepRequest(
-                    body=message_pb2.RunStepRequestBody(
-                        chunk=chunk, op_key=op_key, has_next=has_next
-                    )
+        return self._iter_runstep_requests(head, buffers)
+
+    def _iter_runstep_requests(self, head, buffers):
+        yield head
+        for buffer, op_key in buffers:
+            pieces = buffer
+            if isinstance(buffer, bytes):
+                # slicing the whole bytes returns itself without copy
+                pieces = (
+                    buffer[i : i + self.CHUNK_SIZE]
+                    for i in range(0, len(buffer), self.CHUNK_SIZE)
                 )
-                runstep_requests.append(runstep_request)
-        # return a generator for stream request
-        for item in runstep_requests:
-            yield item
+            # look ahead a piece to tell the last one
+            previous = None
+            for body in self._compress_pieces(pieces, op_key):
+                if previous is not None:
+                    previous.has_next = True
+                    yield message_pb2.RunStepRequest(body=previous)
+                previous = body
+            if previous is not None:
+                yield message_pb2.RunStepRequest(body=previous)
+
+    def _compress_pieces(self, pieces, op_key):
+        """Bodies of the pieces of a chunk, where the rest are no longer compressed
+        once a large piece is not compressed well.
+        """
+        compressor = BodyCompressor(self.compression)
+        for piece in pieces:
+            body = message_pb2.RunStepRequestBody(chunk=piece, op_key=op_key)
+            compressor.compress(body)
+            yield body
 
     def parse_runstep_responses(self, responses):
-        chunks = []
+        """Parse the response stream of RunStep.
+
+        Chunks of a large result are appended in place to a single buffer as
+        they arrive, the chunk is released right after, so the peak memory is
+        about the size of the result plus one chunk. A result that fits into
+        one chunk is kept as is, without any copy.
+
+        Large results are not written back into the response head, as that
+        would copy the whole buffer into the protobuf message once more.
+
+        The head may come before or after the chunks. Chunks that carry the key
+        of op are grouped by it, otherwise they are matched with the large
+        results in the head by order.
+
+        Returns:
+            tuple: The :class:`RunStepResponseHead`, and a dict that maps the key
+            of op to the buffer (bytes or bytearray) of its large result.
+        """
+        keyed_buffers = {}
+        buffers = []
         response_head = None
-        has_next = True
+        has_next = False
         for response in responses:
             if response.HasField("head"):
-                response_head = response
-            else:
-                if not chunks or not has_next:
-                    chunks.append(response.body.chunk)
+                response_head = response.head
+                continue
+            chunk, op_key = decompressed_chunk(response.body), response.body.op_key
+            if op_key:
+                if op_key not in keyed_buffers:
+                    keyed_buffers[op_key] = chunk
                 else:
-                    chunks[-1] += response.body.chunk
-                has_next = response.body.has_next
+                    if not isinstance(keyed_buffers[op_key], bytearray):
+                        keyed_buffers[op_key] = bytearray(keyed_buffers[op_key])
+                    keyed_buffers[op_key] += chunk
+            elif not has_next:
+                buffers.append(chunk)
+            else:
+                if not isinstance(buffers[-1], bytearray):
+                    buffers[-1] = bytearray(buffers[-1])
+                buffers[-1] += chunk
+            has_next = response.body.has_next
+        large_results = {}
         cursor = 0
-        for op_result in response_head.head.results:
-            if op_result.has_large_result:
-                op_result.result = chunks[cursor]
+        for op_result in response_head.results:
+            if not op_result.has_large_result:
+                continue
+            if op_result.key in keyed_buffers:
+                large_results[op_result.key] = keyed_buffers[op_result.key]
+            elif cursor < len(buffers):
+                large_results[op_result.key] = buffers[cursor]
+                cursor += 1
+        return response_head, large_results
+
+    def iter_runstep_responses(self, responses, check=None):
+        """Parse the response stream of RunStep lazily.
+
+        The chunks of large results are yielded as soon as they arrive, which
+        makes it possible to decode the result incrementally. The head may come
+        first, where the chunks are matched with the large results by order, or
+        come last, where each chunk carries the key of its op.
+
+        Args:
+            check (callable, optional): Called with the :class:`RunStepResponseHead`
+                once it arrives, e.g., to raise the error of the run.
+
+        Returns:
+            A generator of `(op_key, chunk)` in the order of arrival.
+        """
+        keys, cursor = [], 0
+        for response in responses:
+            if response.HasField("head"):
+                if check is not None:
+                    check(response.head)
+                keys = [
+                    op_result.key
+                    for op_result in response.head.results
+                    if op_result.has_large_result
+                ]
+                continue
+            op_key = response.body.op_key
+            if not op_key:
+                if cursor >= len(keys):
+                    raise RuntimeError("Missing the key of chunk in RunStep response.")
+                op_key = keys[cursor]
+            yield op_key, decompressed_chunk(response.body)
+            if not response.body.has_next:
                 cursor += 1
-        return response_head.head
 
 
 class ConditionalFormatter(logging.Formatter):
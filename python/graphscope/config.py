@@ -94,6 +94,10 @@ class GSConfig(object):
 
     timeout_seconds = 600
 
+    # cache the results of at most this number of fetches in a session,
+    # disabled if 0
+    result_cache_size = 0
+
     # kill GraphScope instance after seconds of client disconnect
     # disable dangling check by setting -1.
     dangling_timeout_seconds = 600
@@ -103,3 +107,7 @@ class GSConfig(object):
     k8s_dataset_image = (
         f"registry.cn-hongkong.aliyuncs.com/graphscope/dataset:{__version__}"
     )
+
+    # take snapshots of the graphs loaded from builtin datasets in this directory,
+    # and restore them in later loads rather than loading from files, disabled if None
+    dataset_snapshot_dir = None
@@ -21,6 +21,7 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import load_with_snapshot
 from graphscope.framework.loader import Loader
 
 
@@ -76,7 +77,9 @@ def load_ldbc(sess=None, prefix=None, directed=True):
     vertices = {
         "comment": (
             Loader(
-                os.path.join(prefix, "comment_0_0.csv"), header_row=True, delimiter="|"
+                os.path.join(prefix, "comment_0_0.csv"),
+                header_row=True,
+                delimiter="|",
             ),
             ["creationDate", "locationIP", "browserUsed", "content", "length"],
             "id",
@@ -92,14 +95,18 @@ def load_ldbc(sess=None, prefix=None, directed=True):
         ),
         "tagclass": (
             Loader(
-                os.path.join(prefix, "tagclass_0_0.csv"), header_row=True, delimiter="|"
+                os.path.join(prefix, "tagclass_0_0.csv"),
+                header_row=True,
+                delimiter="|",
             ),
             ["name", "url"],
             "id",
         ),
         "person": (
             Loader(
-                os.path.join(prefix, "person_0_0.csv"), header_row=True, delimiter="|"
+                os.path.join(prefix, "person_0_0.csv"),
+                header_row=True,
+                delimiter="|",
             ),
             [
                 "firstName",
@@ -114,14 +121,18 @@ def load_ldbc(sess=None, prefix=None, directed=True):
         ),
         "forum": (
             Loader(
-                os.path.join(prefix, "forum_0_0.csv"), header_row=True, delimiter="|"
+                os.path.join(prefix, "forum_0_0.csv"),
+                header_row=True,
+                delimiter="|",
             ),
             ["title", "creationDate"],
             "id",
         ),
         "place": (
             Loader(
-                os.path.join(prefix, "place_0_0.csv"), header_row=True, delimiter="|"
+                os.path.join(prefix, "place_0_0.csv"),
+                header_row=True,
+                delimiter="|",
             ),
             ["name", "url", "type"],
             "id",
@@ -409,4 +420,8 @@ def load_ldbc(sess=None, prefix=None, directed=True):
             )
         ],
     }
-    return sess.load_from(edges, vertices, directed, generate_eid=True)
+
+    def _load():
+        return sess.load_from(edges, vertices, directed, generate_eid=True)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges), directed)
@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 from graphscope.framework.loader import Loader
 
 
@@ -72,37 +74,42 @@ def load_modern_graph(sess=None, prefix=None, directed=True):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g(directed=directed)
-    graph = (
-        graph.add_vertices(
-            Loader(os.path.join(prefix, "person.csv"), delimiter="|"),
-            "person",
-            ["name", ("age", "int")],
-            "id",
-        )
-        .add_vertices(
-            Loader(os.path.join(prefix, "software.csv"), delimiter="|"),
-            "software",
-            ["name", "lang"],
-            "id",
-        )
-        .add_edges(
-            Loader(os.path.join(prefix, "knows.csv"), delimiter="|"),
-            "knows",
-            ["weight"],
-            src_label="person",
-            dst_label="person",
-            src_field="src_id",
-            dst_field="dst_id",
-        )
-        .add_edges(
-            Loader(os.path.join(prefix, "created.csv"), delimiter="|"),
-            "created",
-            ["weight"],
-            src_label="person",
-            dst_label="software",
-            src_field="src_id",
-            dst_field="dst_id",
-        )
-    )
-    return graph
+    vertices = [
+        {
+            "vertices": Loader(os.path.join(prefix, "person.csv"), delimiter="|"),
+            "label": "person",
+            "properties": ["name", ("age", "int")],
+            "vid_field": "id",
+        },
+        {
+            "vertices": Loader(os.path.join(prefix, "software.csv"), delimiter="|"),
+            "label": "software",
+            "properties": ["name", "lang"],
+            "vid_field": "id",
+        },
+    ]
+    edges = [
+        {
+            "edges": Loader(os.path.join(prefix, "knows.csv"), delimiter="|"),
+            "label": "knows",
+            "properties": ["weight"],
+            "src_label": "person",
+            "dst_label": "person",
+            "src_field": "src_id",
+            "dst_field": "dst_id",
+        },
+        {
+            "edges": Loader(os.path.join(prefix, "created.csv"), delimiter="|"),
+            "label": "created",
+            "properties": ["weight"],
+            "src_label": "person",
+            "dst_label": "software",
+            "src_field": "src_id",
+            "dst_field": "dst_id",
+        },
+    ]
+
+    def _load():
+        return add_labels(sess.g(directed=directed), vertices, edges)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges), directed)
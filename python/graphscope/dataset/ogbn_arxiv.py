@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 
 
 def load_ogbn_arxiv(sess=None, prefix=None):
@@ -75,9 +77,10 @@ def load_ogbn_arxiv(sess=None, prefix=None):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g()
-    graph = graph.add_vertices(os.path.join(prefix, "nodes.csv"), "paper").add_edges(
-        os.path.join(prefix, "edge.csv"), "citation"
-    )
+    vertices = [{"vertices": os.path.join(prefix, "nodes.csv"), "label": "paper"}]
+    edges = [{"edges": os.path.join(prefix, "edge.csv"), "label": "citation"}]
 
-    return graph
+    def _load():
+        return add_labels(sess.g(), vertices, edges)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges))
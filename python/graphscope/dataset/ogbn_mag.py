@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 
 
 def load_ogbn_mag(sess=None, prefix=None):
@@ -74,36 +76,26 @@ def load_ogbn_mag(sess=None, prefix=None):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g()
-    graph = (
-        graph.add_vertices(os.path.join(prefix, "paper.csv"), "paper")
-        .add_vertices(os.path.join(prefix, "author.csv"), "author")
-        .add_vertices(os.path.join(prefix, "institution.csv"), "institution")
-        .add_vertices(os.path.join(prefix, "field_of_study.csv"), "field_of_study")
-        .add_edges(
-            os.path.join(prefix, "author_affiliated_with_institution.csv"),
-            "affiliated",
-            src_label="author",
-            dst_label="institution",
+    vertices = [
+        {"vertices": os.path.join(prefix, "%s.csv" % label), "label": label}
+        for label in ("paper", "author", "institution", "field_of_study")
+    ]
+    edges = [
+        {
+            "edges": os.path.join(prefix, "%s_%s_%s.csv" % (src, relation, dst)),
+            "label": label,
+            "src_label": src,
+            "dst_label": dst,
+        }
+        for src, relation, dst, label in (
+            ("author", "affiliated_with", "institution", "affiliated"),
+            ("paper", "has_topic", "field_of_study", "hasTopic"),
+            ("paper", "cites", "paper", "cites"),
+            ("author", "writes", "paper", "writes"),
         )
-        .add_edges(
-            os.path.join(prefix, "paper_has_topic_field_of_study.csv"),
-            "hasTopic",
-            src_label="paper",
-            dst_label="field_of_study",
-        )
-        .add_edges(
-            os.path.join(prefix, "paper_cites_paper.csv"),
-            "cites",
-            src_label="paper",
-            dst_label="paper",
-        )
-        .add_edges(
-            os.path.join(prefix, "author_writes_paper.csv"),
-            "writes",
-            src_label="author",
-            dst_label="paper",
-        )
-    )
+    ]
+
+    def _load():
+        return add_labels(sess.g(), vertices, edges)
 
-    return graph
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges))
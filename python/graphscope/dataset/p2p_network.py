@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 
 
 def load_p2p_network(sess=None, prefix=None, directed=False):
@@ -76,14 +78,19 @@ def load_p2p_network(sess=None, prefix=None, directed=False):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g(directed=directed)
-    graph = graph.add_vertices(
-        os.path.join(prefix, "p2p-31_property_v_0"), "host"
-    ).add_edges(
-        os.path.join(prefix, "p2p-31_property_e_0"),
-        "connect",
-        src_label="host",
-        dst_label="host",
-    )
+    vertices = [
+        {"vertices": os.path.join(prefix, "p2p-31_property_v_0"), "label": "host"}
+    ]
+    edges = [
+        {
+            "edges": os.path.join(prefix, "p2p-31_property_e_0"),
+            "label": "connect",
+            "src_label": "host",
+            "dst_label": "host",
+        }
+    ]
 
-    return graph
+    def _load():
+        return add_labels(sess.g(directed=directed), vertices, edges)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges), directed)
@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 
 
 def load_ppi(sess=None, prefix=None, directed=False):
@@ -77,12 +79,17 @@ def load_ppi(sess=None, prefix=None, directed=False):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g(directed=directed)
-    graph = graph.add_vertices(os.path.join(prefix, "node.csv"), "protein").add_edges(
-        os.path.join(prefix, "edge.csv"),
-        "link",
-        src_label="protein",
-        dst_label="protein",
-    )
+    vertices = [{"vertices": os.path.join(prefix, "node.csv"), "label": "protein"}]
+    edges = [
+        {
+            "edges": os.path.join(prefix, "edge.csv"),
+            "label": "link",
+            "src_label": "protein",
+            "dst_label": "protein",
+        }
+    ]
 
-    return graph
+    def _load():
+        return add_labels(sess.g(directed=directed), vertices, edges)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges), directed)
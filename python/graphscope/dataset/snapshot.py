@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Snapshots of the graphs loaded from datasets, which are restored by later loads
+of the same dataset rather than parsing the files and building the fragments again.
+
+Snapshots are disabled by default, and enabled by
+
+.. code:: python
+
+    >>> graphscope.set_option(dataset_snapshot_dir="~/.graphscope/snapshots")
+
+A snapshot is keyed by the hashes of the files of the dataset, the specs of the
+loaders that load the graph, `directed`, `oid_type` and the number of workers, and
+written by :meth:`Graph.save_to` once the graph is loaded in eager mode, where the
+engines are on the same host as the client.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import shutil
+import socket
+import uuid
+from collections.abc import Mapping
+
+from graphscope.config import GSConfig as gs_config
+from graphscope.dataset.io_utils import _hash_file
+from graphscope.framework.graph import Graph
+from graphscope.framework.loader import Loader
+from graphscope.version import __version__
+
+logger = logging.getLogger("graphscope")
+
+# written after the snapshot is complete
+_META_FILE = "snapshot.json"
+# path -> (size, mtime, sha256) of the files hashed before
+_HASHES_FILE = "hashes.json"
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock of the file `path` against other processes."""
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _hash_files(prefix, snapshot_dir):
+    """Hash the files under `prefix`, where the ones that don't change since they
+    are hashed last time are not read again.
+    """
+    hashes_file = os.path.join(snapshot_dir, _HASHES_FILE)
+    with _file_lock(hashes_file + ".lock"):
+        try:
+            with open(hashes_file, "r") as f:
+                known = json.load(f)
+        except (OSError, ValueError):
+            known = {}
+        hashes = []
+        for root, dirs, files in os.walk(prefix):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.abspath(os.path.join(root, name))
+                stat = os.stat(path)
+                stamp = [stat.st_size, stat.st_mtime_ns]
+                if path in known and known[path][:2] == stamp:
+                    digest = known[path][2]
+                else:
+                    digest = _hash_file(path)
+                    known[path] = stamp + [digest]
+                hashes.append((os.path.relpath(path, prefix), digest))
+        tmp = "%s.%s.tmp" % (hashes_file, uuid.uuid4().hex)
+        with open(tmp, "w") as f:
+            json.dump(known, f)
+        os.replace(tmp, hashes_file)
+    return hashes
+
+
+def _spec_of(spec, prefix):
+    """The json form of the loader `spec`, where the paths under `prefix` are
+    relative to it.
+    """
+    if isinstance(spec, Loader):
+        return {
+            "source": _spec_of(spec.source, prefix),
+            "protocol": spec.protocol,
+            "options": spec.options.to_dict(),
+            "format": spec.format,
+            "filter": None if spec.filter is None else str(spec.filter),
+            "storage_options": _spec_of(spec.storage_options, prefix),
+        }
+    if isinstance(spec, str) and spec.startswith(os.path.join(prefix, "")):
+        return os.path.relpath(spec, prefix)
+    if isinstance(spec, Mapping):
+        return {str(k): _spec_of(v, prefix) for k, v in spec.items()}
+    if isinstance(spec, (list, tuple)):
+        return [_spec_of(v, prefix) for v in spec]
+    return spec
+
+
+def snapshot_key(
+    prefix, specs, snapshot_dir, directed=True, oid_type="int64_t", num_workers=1
+):
+    """The key of the snapshot of graph loaded by the loader `specs` from files
+    under `prefix`.
+    """
+    key = {
+        "version": __version__,
+        "specs": _spec_of(specs, prefix),
+        "files": _hash_files(prefix, snapshot_dir),
+        "directed": directed,
+        "oid_type": oid_type,
+        "num_workers": num_workers,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def add_labels(graph, vertices, edges):
+    """Add the labels of `vertices` and `edges` to `graph` in order, which are the
+    keyword arguments of :meth:`add_vertices` and :meth:`add_edges`.
+    """
+    for spec in vertices:
+        graph = graph.add_vertices(**spec)
+    for spec in edges:
+        graph = graph.add_edges(**spec)
+    return graph
+
+
+def _engines_local(sess):
+    """Whether the engines are on the host of the client, where the snapshots are
+    saved by the engines and restored by the client.
+    """
+    info = sess.info
+    if info["type"] != "hosts":
+        return False
+    local = {"localhost", "127.0.0.1", socket.gethostname(), socket.getfqdn()}
+    hosts = info["engine_hosts"]
+    if isinstance(hosts, str):
+        hosts = hosts.split(",")
+    return all(host.strip() in local for host in hosts)
+
+
+def load_with_snapshot(sess, prefix, load, specs, directed=True, oid_type="int64_t"):
+    """Restore the graph of dataset under `prefix` from its snapshot if there is
+    one, otherwise load it by `load()` and take a snapshot of it.
+
+    The `specs` are the ones that `load()` loads the graph by, e.g., the labels,
+    the paths or :class:`Loader` of files, and the fields and properties of them,
+    from which the key of snapshot is derived.
+
+    Snapshots are skipped when `dataset_snapshot_dir` is not set, the files are not
+    accessible by the client, the engines are not on the host of the client, e.g.,
+    in the pods of kubernetes, or the session is in lazy mode when there's no
+    snapshot, as the graph isn't loaded yet.
+    """
+    snapshot_dir = gs_config.dataset_snapshot_dir
+    if snapshot_dir is None or not os.path.isdir(prefix) or not _engines_local(sess):
+        return load()
+    snapshot_dir = os.path.expanduser(snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    key = snapshot_key(
+        prefix, specs, snapshot_dir, directed, oid_type, sess.info["num_workers"]
+    )
+    path = os.path.join(snapshot_dir, key)
+    if os.path.isfile(os.path.join(path, _META_FILE)):
+        try:
+            graph = Graph.load_from(os.path.join(path, "graph"), sess)
+            logger.info("Restored the graph from snapshot %s", path)
+            return graph
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("Failed to restore snapshot %s, reloading: %s", path, e)
+            shutil.rmtree(path, ignore_errors=True)
+
+    graph = load()
+    if not sess.eager():
+        return graph
+    # saved aside and moved into place once complete, thus a snapshot that is
+    # being saved, or failed to save, is never restored
+    tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+    try:
+        os.makedirs(tmp)
+        graph.save_to(os.path.join(tmp, "graph"))
+        with open(os.path.join(tmp, _META_FILE), "w") as f:
+            json.dump({"dataset": load.__qualname__, "prefix": prefix}, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        logger.info("Saved snapshot of the graph to %s", path)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning("Failed to save snapshot to %s: %s", path, e)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return graph
@@ -21,6 +21,8 @@ import os
 from graphscope.client.session import get_default_session
 from graphscope.dataset.io_utils import DATA_SITE
 from graphscope.dataset.io_utils import download_file
+from graphscope.dataset.snapshot import add_labels
+from graphscope.dataset.snapshot import load_with_snapshot
 from graphscope.framework.loader import Loader
 
 
@@ -80,37 +82,37 @@ def load_u2i(sess=None, prefix=None, directed=True):
     if sess is None:
         sess = get_default_session()
 
-    graph = sess.g(directed=directed)
-    graph = (
-        graph.add_vertices(
-            Loader(os.path.join(prefix, "node.csv"), delimiter="\t"),
-            label="u",
-            properties=[("feature", "str")],
-            vid_field="id",
-        )
-        .add_vertices(
-            Loader(os.path.join(prefix, "node.csv"), delimiter="\t"),
-            label="i",
-            properties=[("feature", "str")],
-            vid_field="id",
-        )
-        .add_edges(
-            Loader(os.path.join(prefix, "edge.csv"), delimiter="\t"),
-            label="u-i",
-            properties=["weight"],
-            src_label="u",
-            dst_label="i",
-            src_field="src_id",
-            dst_field="dst_id",
-        )
-        .add_edges(
-            Loader(os.path.join(prefix, "edge.csv"), delimiter="\t"),
-            label="u-i_reverse",
-            properties=["weight"],
-            src_label="i",
-            dst_label="u",
-            src_field="dst_id",
-            dst_field="src_id",
-        )
-    )
-    return graph
+    vertices = [
+        {
+            "vertices": Loader(os.path.join(prefix, "node.csv"), delimiter="\t"),
+            "label": label,
+            "properties": [("feature", "str")],
+            "vid_field": "id",
+        }
+        for label in ("u", "i")
+    ]
+    edges = [
+        {
+            "edges": Loader(os.path.join(prefix, "edge.csv"), delimiter="\t"),
+            "label": "u-i",
+            "properties": ["weight"],
+            "src_label": "u",
+            "dst_label": "i",
+            "src_field": "src_id",
+            "dst_field": "dst_id",
+        },
+        {
+            "edges": Loader(os.path.join(prefix, "edge.csv"), delimiter="\t"),
+            "label": "u-i_reverse",
+            "properties": ["weight"],
+            "src_label": "i",
+            "dst_label": "u",
+            "src_field": "dst_id",
+            "dst_field": "src_id",
+        },
+    ]
+
+    def _load():
+        return add_labels(sess.g(directed=directed), vertices, edges)
+
+    return load_with_snapshot(sess, prefix, _load, (vertices, edges), directed)
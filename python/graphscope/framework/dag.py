@@ -19,11 +19,13 @@
 """ Classes and functions used to manage dags.
 """
 
-
-import queue
+import hashlib
+from collections import defaultdict
+from collections import deque
 
 from graphscope.framework.operation import Operation
 from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
 
 
 class Dag(object):
@@ -111,22 +113,178 @@ class Dag(object):
                 - an op is depended by multiple ops
                 - an op occurs multiple times in target_keys
         """
-        op_keys_to_keep = set()
-        next_to_visit = queue.Queue()
-        for key in op_keys:
-            next_to_visit.put(key)
-        while not next_to_visit.empty():
-            next_op = next_to_visit.get()
-            if next_op in op_keys_to_keep:
-                continue
-            op_keys_to_keep.add(next_op)
+        op_keys_to_keep = set(op_keys)
+        next_to_visit = deque(op_keys_to_keep)
+        while next_to_visit:
+            next_op = next_to_visit.popleft()
             for parent_op in self._ops_by_key[next_op].parents:
-                if not parent_op.evaluated:
-                    parent_key = parent_op.key
-                    next_to_visit.put(parent_key)
+                if not parent_op.evaluated and parent_op.key not in op_keys_to_keep:
+                    op_keys_to_keep.add(parent_op.key)
+                    next_to_visit.append(parent_op.key)
         return list(op_keys_to_keep)
 
 
+# ops that talk to the outside world, where two of the same are not the same
+_stateful_op_types = frozenset(
+    [
+        types_pb2.CREATE_INTERACTIVE_QUERY,
+        types_pb2.GREMLIN_QUERY,
+        types_pb2.FETCH_GREMLIN_RESULT,
+        types_pb2.SUBGRAPH,
+        types_pb2.CREATE_LEARNING_INSTANCE,
+        types_pb2.OUTPUT,
+    ]
+)
+
+# the fetched results that are plain values, rather than objects in engines
+_value_output_types = frozenset(
+    [
+        types_pb2.RESULTS,
+        types_pb2.TENSOR,
+        types_pb2.DATAFRAME,
+        types_pb2.NULL_OUTPUT,
+    ]
+)
+
+
+def optimize(dag_def):
+    """Optimize the dag extracted by :meth:`Dag.extract_subdag_for` before
+    submission, which
+
+        - merges the structurally identical ops, and rewires their consumers,
+        - fuses the chains of `add_vertices` and `add_edges` into one `ADD_LABELS`.
+
+    The `dag_def` is optimized in place, as copying the ops would copy the data
+    of loaders as well.
+
+    Returns:
+        tuple: The optimized :class:`DagDef`, and a dict that maps the key of each
+        merged op to the key of the op that produces its result instead.
+    """
+    op_defs, canonical_of_key = _eliminate_common_subexpressions(dag_def.op)
+    op_defs = _fuse_add_labels(op_defs)
+    kept = set(op_def.key for op_def in op_defs)
+    for index in reversed(range(len(dag_def.op))):
+        if dag_def.op[index].key not in kept:
+            del dag_def.op[index]
+    return dag_def, canonical_of_key
+
+
+def _signature_of(op_def):
+    op_def_without_key = op_def_pb2.OpDef()
+    op_def_without_key.CopyFrom(op_def)
+    op_def_without_key.ClearField("key")
+    op_def_without_key.ClearField("fetch")
+    return hashlib.sha224(
+        op_def_without_key.SerializeToString(deterministic=True)
+    ).hexdigest()
+
+
+def _carries_values(op_def):
+    """Whether the op carries the data of numpy arrays or dataframes, which is
+    too large to be hashed.
+    """
+    for chunk in op_def.large_attr.chunk_list.items:
+        if (
+            types_pb2.PROTOCOL in chunk.attr
+            and chunk.attr[types_pb2.PROTOCOL].s == b"pandas"
+        ):
+            return True
+    return False
+
+
+def _eliminate_common_subexpressions(op_defs):
+    """Ops are visited in the topological order, thus parents of an op have been
+    rewired before its signature is taken.
+
+    The ops that produce objects in engines, e.g., graphs and contexts, are owned by
+    the fetches, which are never merged into others, but the intermediate ones could
+    be merged into them.
+    """
+    canonical_of_key = dict()
+    canonical_of_signature = dict()
+    kept = []
+    for op_def in op_defs:
+        parents = [canonical_of_key.get(key, key) for key in op_def.parents]
+        del op_def.parents[:]
+        op_def.parents.extend(parents)
+        if op_def.op in _stateful_op_types or _carries_values(op_def):
+            kept.append(op_def)
+            continue
+        signature = _signature_of(op_def)
+        canonical = canonical_of_signature.get(signature)
+        if canonical is None:
+            canonical_of_signature[signature] = op_def
+            kept.append(op_def)
+        elif not op_def.fetch or (
+            op_def.output_type in _value_output_types and op_def.op != types_pb2.RUN_APP
+        ):
+            canonical_of_key[op_def.key] = canonical.key
+            canonical.fetch = canonical.fetch or op_def.fetch
+        else:
+            kept.append(op_def)
+    return kept, canonical_of_key
+
+
+def _fuse_add_labels(op_defs):
+    """Fuse `ADD_LABELS(ADD_LABELS(g, loader1), loader2)` into
+    `ADD_LABELS(g, loader1 + loader2)` when the inner one is used by nothing else.
+    """
+    ops = {op_def.key: op_def for op_def in op_defs}
+    consumers = defaultdict(list)
+    for op_def in op_defs:
+        for key in op_def.parents:
+            consumers[key].append(op_def.key)
+
+    def _graph_and_loader_of(op_def):
+        graph, loader = None, None
+        for key in op_def.parents:
+            if key in ops and ops[key].op == types_pb2.DATA_SOURCE:
+                loader = ops[key]
+            else:
+                graph = key
+        return graph, loader
+
+    fused = set()
+    for op_def in op_defs:
+        if op_def.op != types_pb2.ADD_LABELS:
+            continue
+        graph, loader = _graph_and_loader_of(op_def)
+        inner = ops.get(graph)
+        if (
+            loader is None
+            or inner is None
+            or inner.op != types_pb2.ADD_LABELS
+            or inner.fetch
+            or inner.attr != op_def.attr
+            or consumers[inner.key] != [op_def.key]
+            or consumers[loader.key] != [op_def.key]
+        ):
+            continue
+        inner_graph, inner_loader = _graph_and_loader_of(inner)
+        if inner_loader is None or consumers[inner_loader.key] != [inner.key]:
+            continue
+        # the chunks are copied when merged, which is too costly for the ones
+        # that carry the data
+        if _carries_values(inner_loader) or _carries_values(loader):
+            continue
+        # merged into the inner loader, as the labels of it go first, and then
+        # vertices go before edges, as the loader of `add_edges` does
+        chunks = inner_loader.large_attr.chunk_list.items
+        chunks.extend(loader.large_attr.chunk_list.items)
+        chunks.sort(key=lambda chunk: chunk.attr[types_pb2.CHUNK_NAME].s != b"vertex")
+        renames = {inner.key: inner_graph, loader.key: inner_loader.key}
+        parents = [renames.get(key, key) for key in op_def.parents]
+        del op_def.parents[:]
+        op_def.parents.extend(parents)
+        consumers[inner_graph] = [
+            op_def.key if key == inner.key else key for key in consumers[inner_graph]
+        ]
+        consumers[inner_loader.key] = [op_def.key]
+        fused.update([inner.key, loader.key])
+    return [op_def for op_def in op_defs if op_def.key not in fused]
+
+
 class DAGNode(object):
     """Base class to own :class:`Operation` information which as a node in a DAG."""
 
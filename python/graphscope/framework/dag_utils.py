@@ -19,6 +19,7 @@
 import json
 import pickle
 
+from graphscope.client.utils import get_chunk_stream
 from graphscope.framework import utils
 from graphscope.framework.errors import check_argument
 from graphscope.framework.operation import Operation
@@ -149,13 +150,32 @@ def create_loader(vertex_or_edge_label_list):
     large_attr = attr_value_pb2.LargeAttrValue()
     for label in vertex_or_edge_label_list:
         large_attr.chunk_list.items.extend(label.attr())
+    session_id = vertex_or_edge_label_list[0]._session_id
+    streams = []
+    for chunk in large_attr.chunk_list.items:
+        if types_pb2.SOURCE in chunk.attr:
+            stream = get_chunk_stream(chunk.attr[types_pb2.SOURCE].s.decode())
+            if stream is not None:
+                streams.append(stream)
+    if any(not stream.reusable for stream in streams):
+        from graphscope.client.session import get_session_by_id
+
+        # graphs in lazy mode may be unloaded and loaded from the loader again
+        check_argument(
+            get_session_by_id(session_id).eager(),
+            "Loading from iterators is not supported in lazy mode, "
+            "as an iterator can only be read once, use a dataframe or "
+            "an arrow dataset instead",
+        )
     op = Operation(
-        vertex_or_edge_label_list[0]._session_id,
+        session_id,
         types_pb2.DATA_SOURCE,
         config={},
         large_attr=large_attr,
         output_types=types_pb2.NULL_OUTPUT,
     )
+    # the streams of chunks are alive as long as the op
+    op.chunk_streams = streams
     return op
 
 
@@ -286,13 +306,23 @@ def arrow_to_dynamic(graph):
     return op
 
 
-def modify_edges(graph, modify_type, edges, attr={}, weight=None):
+def _modification_to_large_attr(buffer, columnar):
+    large_attr = utils.bytes_to_large_attr(buffer)
+    if columnar:
+        chunk = large_attr.chunk_list.items[0]
+        chunk.attr[types_pb2.CHUNK_TYPE].CopyFrom(utils.s_to_attr("columnar"))
+    return large_attr
+
+
+def modify_edges(graph, modify_type, edges, attr={}, weight=None, columnar=False):
     """Create modify edges operation for nx graph.
 
     Args:
         graph (:class:`nx.Graph`): A nx graph.
         modify_type (`type_pb2.(NX_ADD_EDGES | NX_DEL_EDGES | NX_UPDATE_EDGES)`): The modify type
-        edges (list): List of edges to be inserted into or delete from graph based on `modify_type`
+        edges (bytes): Edges to be inserted into or delete from graph based on `modify_type`,
+            serialized in json, or in columnar layout if `columnar` is True.
+        columnar (bool, optional): Whether the edges are encoded in columnar layout.
 
     Returns:
         An op to modify edges on the graph.
@@ -308,19 +338,20 @@ def modify_edges(graph, modify_type, edges, attr={}, weight=None):
         graph.session_id,
         types_pb2.MODIFY_EDGES,
         config=config,
-        large_attr=utils.bytes_to_large_attr(edges),
+        large_attr=_modification_to_large_attr(edges, columnar),
         output_types=types_pb2.GRAPH,
     )
     return op
 
 
-def modify_vertices(graph, modify_type, vertices, attr={}):
+def modify_vertices(graph, modify_type, vertices, attr={}, columnar=False):
     """Create modify vertices operation for nx graph.
 
     Args:
         graph (:class:`nx.Graph`): A nx graph.
         modify_type (`type_pb2.(NX_ADD_NODES | NX_DEL_NODES | NX_UPDATE_NODES)`): The modify type
-        vertices (list): node list.
+        vertices (bytes): Nodes serialized in json, or in columnar layout if `columnar` is True.
+        columnar (bool, optional): Whether the nodes are encoded in columnar layout.
 
     Returns:
         An op to modify vertices on the graph.
@@ -334,7 +365,7 @@ def modify_vertices(graph, modify_type, vertices, attr={}):
         graph.session_id,
         types_pb2.MODIFY_VERTICES,
         config=config,
-        large_attr=utils.bytes_to_large_attr(vertices),
+        large_attr=_modification_to_large_attr(vertices, columnar),
         output_types=types_pb2.GRAPH,
     )
     return op
@@ -349,6 +380,7 @@ def report_graph(
     lid=None,
     key=None,
     label_id=None,
+    attrs=None,
 ):
     """Create report operation for nx graph.
 
@@ -376,12 +408,19 @@ def report_graph(
                       DEG_BY_LOC,
                       IN_DEG_BY_LOC,
                       OUT_DEG_BY_LOC,
-                      NODES_BY_LOC)
+                      NODES_BY_LOC,
+                      NODES_TO_DATAFRAME,
+                      EDGES_TO_DATAFRAME,
+                      DEG_TO_DATAFRAME,
+                      IN_DEG_TO_DATAFRAME,
+                      OUT_DEG_TO_DATAFRAME)
         node (str): node id, used as node id with 'NODE' report types. (optional)
         edge (str): an edge with 'EDGE' report types. (optional)
         fid (int): fragment id, with 'LOC' report types. (optional)
         lid (int): local id of node in grape_engine, with 'LOC; report types. (optional)
-        key (str): edge key for MultiGraph or MultiDiGraph, with 'EDGE' report types. (optional)
+        key (str): edge key for MultiGraph or MultiDiGraph, with 'EDGE' report types,
+            or the weight key with 'DEG' report types. (optional)
+        attrs (list of str): attributes to report, with 'TO_DATAFRAME' report types. (optional)
 
     Returns:
         An op to do reporting job.
@@ -404,12 +443,25 @@ def report_graph(
     if label_id is not None:
         config[types_pb2.V_LABEL_ID] = utils.i_to_attr(label_id)
 
+    if attrs is not None:
+        config[types_pb2.PROPERTIES] = utils.s_to_attr(json.dumps(attrs))
+
     config[types_pb2.EDGE_KEY] = utils.s_to_attr(str(key) if key is not None else "")
+    if report_type in (
+        types_pb2.NODES_TO_DATAFRAME,
+        types_pb2.EDGES_TO_DATAFRAME,
+        types_pb2.DEG_TO_DATAFRAME,
+        types_pb2.IN_DEG_TO_DATAFRAME,
+        types_pb2.OUT_DEG_TO_DATAFRAME,
+    ):
+        output_types = types_pb2.DATAFRAME
+    else:
+        output_types = types_pb2.RESULTS
     op = Operation(
         graph.session_id,
         types_pb2.REPORT_GRAPH,
         config=config,
-        output_types=types_pb2.RESULTS,
+        output_types=output_types,
     )
     return op
 
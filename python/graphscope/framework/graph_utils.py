@@ -17,6 +17,7 @@
 #
 
 from typing import Any
+from typing import Iterator
 from typing import Mapping
 from typing import Sequence
 from typing import Tuple
@@ -24,6 +25,7 @@ from typing import Union
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 try:
     import vineyard
@@ -43,6 +45,7 @@ if vineyard is not None:
         str,
         Sequence[np.ndarray],
         pd.DataFrame,
+        Iterator[Union[pd.DataFrame, pa.RecordBatch]],
         vineyard.Object,
         vineyard.ObjectID,
         vineyard.ObjectName,
@@ -54,6 +57,7 @@ else:
         str,
         Sequence[np.ndarray],
         pd.DataFrame,
+        Iterator[Union[pd.DataFrame, pa.RecordBatch]],
     ]
 
 
@@ -128,9 +132,9 @@ class VertexLabel(object):
         chunk.attr[types_pb2.VID].CopyFrom(utils.s_to_attr(str(self.vid_field)))
         # loader
         for k, v in self.loader.get_attr().items():
-            # raw bytes for pandas/numpy data
+            # serialized chunk that carries the pandas/numpy data
             if k == types_pb2.VALUES:
-                chunk.buffer = v
+                chunk.MergeFromString(memoryview(v))
             else:
                 chunk.attr[k].CopyFrom(v)
         return [chunk]
@@ -229,9 +233,9 @@ class EdgeSubLabel(object):
         chunk.attr[types_pb2.DST_VID].CopyFrom(utils.s_to_attr(str(self.dst_field)))
         # loader
         for k, v in self.loader.get_attr().items():
-            # raw bytes for pandas/numpy data
+            # serialized chunk that carries the pandas/numpy data
             if k == types_pb2.VALUES:
-                chunk.buffer = v
+                chunk.MergeFromString(memoryview(v))
             else:
                 chunk.attr[k].CopyFrom(v)
         return chunk
@@ -16,10 +16,16 @@
 # limitations under the License.
 #
 
+import functools
+import glob
+import itertools
 import json
 import logging
+import operator
 import pathlib
+import re
 from typing import Dict
+from typing import Iterator
 from typing import Sequence
 from typing import Tuple
 from urllib.parse import urlparse
@@ -28,6 +34,7 @@ import numpy as np
 import pandas as pd
 import pyarrow as pa
 
+from graphscope.client.utils import ChunkStream
 from graphscope.framework import utils
 from graphscope.framework.errors import check_argument
 from graphscope.proto import attr_value_pb2
@@ -38,6 +45,11 @@ try:
 except ImportError:
     vineyard = None
 
+try:
+    import pyarrow.dataset as pa_dataset
+except ImportError:
+    pa_dataset = None
+
 logger = logging.getLogger("graphscope")
 
 
@@ -94,7 +106,9 @@ class Loader(object):
     Loader can take various data sources, and assemble necessary information into a AttrValue.
     """
 
-    def __init__(self, source, delimiter=",", header_row=True, **kwargs):
+    def __init__(
+        self, source, delimiter=",", header_row=True, format=None, filter=None, **kwargs
+    ):
         """Initialize a loader with configurable options.
         Note: Loader cannot be reused since it may change inner state when constructing
         information for loading a graph.
@@ -107,8 +121,18 @@ class Loader(object):
                     * oss file: specified by URL :code:`oss://...`
                     * hdfs file: specified by URL :code:`hdfs://...`
                     * s3 file: specified by URL :code:`s3://...`
+                    * parquet, orc or arrow files, e.g., :code:`file:///data/edges/*.parquet`
                     * numpy ndarray, in CSR format
                     * pandas dataframe
+                    * iterator of pandas dataframes or arrow record batches, e.g.,
+                      a generator or :class:`pyarrow.RecordBatchReader`
+                    * arrow dataset, i.e., :class:`pyarrow.dataset.Dataset`
+
+                Iterators, datasets and columnar files are streamed to the engines in
+                chunks as they are read, rather than held in the memory of client as a
+                whole. Only the columns of the declared properties are read from
+                columnar files and datasets. As an iterator can only be read once,
+                loading from iterators is not supported in lazy mode.
 
                 Ordinary data sources can be loaded using vineyard stream as well, a :code:`vineyard://`
                 prefix can be used in the URL then the local file, oss object or HDFS file will be loaded
@@ -124,12 +148,23 @@ class Loader(object):
                 will be read from the first row of source, else they are named by 'f0', 'f1', ....
                 Defaults to True.
 
+            format (str, optional): Format of files, one of 'parquet', 'orc' and 'arrow',
+                deduced from the extension if not given. Defaults to None, i.e., csv files
+                that are read by engines.
+
+            filter (str or :class:`pyarrow.dataset.Expression`, optional): Predicate on rows
+                of columnar files or datasets, which is pushed down to skip the row groups
+                by statistics, e.g., :code:`"ts > 2021-01-01 and weight <= 0.5"`.
+                Defaults to None.
+
         Notes:
             Data is resolved by drivers in `vineyard <https://github.com/v6d-io/v6d>`_ .
             See more additional info in `Loading Graph` section of Docs, and implementations in `vineyard`.
         """
         self.protocol = ""
-        # For numpy or pandas, source is the serialized raw bytes
+        # For numpy or pandas, source is a serialized `Chunk`, whose buffer
+        # is the arrow ipc stream of the data
+        # For iterators and datasets, it's the key of the registered stream
         # For files, it's the location
         # For vineyard, it's the ID or name
         self.source = ""
@@ -143,12 +178,22 @@ class Loader(object):
         self.options.header_row = header_row
         # metas for data source is numpy or dataframe
         self.deduced_properties = None
+        # format and filter of columnar files or datasets
+        self.format = format
+        self.filter = filter
+        self._dataset = None
+        # stream of iterators or datasets that generates the chunk when sent
+        self._stream = None
         # extra args directly passed to storage system
         # find more details in fsspec
         #   https://filesystem-spec.readthedocs.io/en/latest/
         self.storage_options = kwargs
         # also parse protocol and source in `resolve` method
         self.resolve(source)
+        check_argument(
+            filter is None or self._dataset is not None,
+            "Filter is only supported by columnar files and datasets",
+        )
 
     def __str__(self) -> str:
         return "{}: {}".format(self.protocol, self.source)
@@ -180,6 +225,10 @@ class Loader(object):
             # Formats: [src_id, dst_id, prop_1, ..., prop_n]
             check_argument(all([isinstance(item, np.ndarray) for item in source]))
             self.process_numpy(source)
+        elif isinstance(source, (Iterator, pa.RecordBatchReader)) or (
+            pa_dataset is not None and isinstance(source, pa_dataset.Dataset)
+        ):
+            self.process_batches(source)
         else:
             raise RuntimeError("Not support source", source)
 
@@ -189,32 +238,84 @@ class Loader(object):
         if not self.protocol:
             self.protocol = "file"
         self.source = source
+        if self.protocol == "vineyard":
+            return
+        path = urlparse(source).path if self.protocol == "file" else source
+        if self.format is None:
+            self.format = _columnar_formats.get(pathlib.PurePath(path).suffix)
+        if self.format is not None:
+            check_argument(
+                pa_dataset is not None, "Reading %s requires pyarrow.dataset" % path
+            )
+            if self.protocol == "file" and any(c in path for c in "*?["):
+                path = sorted(glob.glob(path))
+                check_argument(path, "No files matched %s" % source)
+            # other locations are resolved by the filesystems of pyarrow
+            self.process_dataset(pa_dataset.dataset(path, format=self.format))
 
     def process_numpy(self, source: Sequence[np.ndarray]):
-        """Transform arrays to equivalent DataFrame,
-        note the transpose is necessary.
+        """Build the arrow table from arrays column by column, which shares the
+        memory of contiguous numeric arrays.
         """
         col_names = ["f%s" % i for i in range(len(source))]
-        df = pd.DataFrame(source, col_names).T
-        types = {}
-        for i, _ in enumerate(source):
-            types[col_names[i]] = source[i].dtype
-        df = df.astype(types)
-        return self.process_pandas(df)
+        table = pa.Table.from_arrays([pa.array(array) for array in source], col_names)
+        self._process_arrow(table)
 
     def process_pandas(self, source: pd.DataFrame):
+        table = pa.Table.from_pandas(source, preserve_index=False)
+        self._process_arrow(table)
+
+    def _process_arrow(self, table: pa.Table):
         self.protocol = "pandas"
-        col_names = list(source.columns.values)
-        col_types = [utils._from_numpy_dtype(dtype) for dtype in source.dtypes.values]
+        # deduced from the arrow types, which are what the engine receives
+        self.deduced_properties = _deduce_properties(table.schema)
+        self.source = _serialize_as_chunk(table)
 
-        table = pa.Table.from_pandas(source, preserve_index=False)
-        sink = pa.BufferOutputStream()
-        with pa.ipc.new_stream(sink, table.schema) as writer:
-            writer.write_table(table)
-        buf = sink.getvalue()
+    def process_batches(self, source):
+        """Stream record batches of an arrow dataset, or of an iterator of dataframes
+        or record batches, where the schema is taken from the first item.
+
+        Batches are pulled from the source only when the dag is sent, and sent as
+        one arrow ipc stream in chunks, as the flow control of grpc permits.
+        """
+        if pa_dataset is not None and isinstance(source, pa_dataset.Dataset):
+            return self.process_dataset(source)
+        if isinstance(source, pa.RecordBatchReader):
+            schema, batches = source.schema, source
+        else:
+            first = next(source, None)
+            check_argument(first is not None, "The iterator of source is empty")
+            if isinstance(first, pd.DataFrame):
+                schema = pa.Schema.from_pandas(first, preserve_index=False)
+                batches = (
+                    pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+                    for df in itertools.chain([first], source)
+                )
+            else:
+                check_argument(
+                    isinstance(first, pa.RecordBatch),
+                    "Expect dataframes or record batches, got %s" % type(first),
+                )
+                schema, batches = first.schema, itertools.chain([first], source)
+        self.protocol = "pandas"
+        self.deduced_properties = _deduce_properties(schema)
+        self._stream = ChunkStream(functools.partial(_write_batches, schema, batches))
+        self.source = self._stream.key
 
-        self.deduced_properties = list(zip(col_names, col_types))
-        self.source = bytes(memoryview(buf))
+    def process_dataset(self, source):
+        """Stream an arrow dataset, where the columns to read and the row groups to
+        skip are decided by the selected columns and the filter when the dag is sent.
+        """
+        self.protocol = "pandas"
+        self.deduced_properties = _deduce_properties(source.schema)
+        self.filter = _parse_filter(self.filter, source.schema)
+        self._dataset = source
+        # the dataset is scanned again each time the dag is sent
+        self._stream = ChunkStream(
+            functools.partial(_scan_dataset, source, self.options, self.filter),
+            reusable=True,
+        )
+        self.source = self._stream.key
 
     def process_vy_object(self, source):
         self.protocol = "vineyard"
@@ -247,7 +348,11 @@ class Loader(object):
         if self.protocol == "file":
             source = "{}#{}".format(self.source, self.options)
             config[types_pb2.SOURCE] = utils.s_to_attr(source)
+        elif self.protocol == "pandas" and isinstance(self.source, str):
+            # the chunk is filled by the stream when the dag is sent
+            config[types_pb2.SOURCE] = utils.s_to_attr(self.source)
         elif self.protocol == "pandas":
+            # parsed by `Chunk.MergeFromString`, without another copy of the data
             config[types_pb2.VALUES] = self.source
         else:  # Let vineyard handle other data source.
             config[types_pb2.SOURCE] = utils.s_to_attr(self.source)
@@ -260,3 +365,146 @@ class Loader(object):
                     json.dumps(self.options.to_dict())
                 )
         return config
+
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _serialize_as_chunk(table: pa.Table) -> pa.Buffer:
+    """Write `table` as an arrow ipc stream into the `buffer` field of a serialized
+    :class:`Chunk`, i.e., the tag and length of the field followed by the stream.
+
+    The protobuf message only takes bytes, so the stream is written once into a
+    preallocated buffer, rather than copied from a growing one into bytes.
+    """
+    mock = pa.MockOutputStream()
+    with pa.ipc.new_stream(mock, table.schema) as writer:
+        writer.write_table(table)
+    number = attr_value_pb2.Chunk.DESCRIPTOR.fields_by_name["buffer"].number
+    # wire type 2: length-delimited
+    header = _varint(number << 3 | 2) + _varint(mock.size())
+    buf = pa.allocate_buffer(len(header) + mock.size())
+    sink = pa.FixedSizeBufferWriter(buf)
+    sink.write(header)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return buf
+
+
+# extension -> format of pyarrow.dataset
+_columnar_formats = {
+    ".parquet": "parquet",
+    ".orc": "orc",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+_predicate = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*(.+?)\s*$")
+
+_comparisons = {
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _deduce_properties(schema: pa.Schema):
+    properties = []
+    for field in schema:
+        if not (
+            pa.types.is_integer(field.type)
+            or pa.types.is_floating(field.type)
+            or pa.types.is_boolean(field.type)
+            or pa.types.is_string(field.type)
+            or pa.types.is_large_string(field.type)
+        ):
+            # e.g., timestamps, which are not properties but could be filtered on,
+            # and lists or decimals, which are not strings in the stream
+            continue
+        try:
+            dtype = np.dtype(field.type.to_pandas_dtype())
+            properties.append((field.name, utils._from_numpy_dtype(dtype)))
+        except NotImplementedError:
+            # e.g., half floats
+            pass
+    return properties
+
+
+def _parse_filter(filter, schema: pa.Schema):
+    """Parse conjunctions of comparisons between a column and a value, e.g.,
+    `"ts > 2021-01-01 and weight <= 0.5"`, into an expression of pyarrow, where the
+    values are cast to the types of columns.
+    """
+    if filter is None or isinstance(filter, pa_dataset.Expression):
+        return filter
+    expression = None
+    for term in re.split(r"\s+and\s+", filter.strip(), flags=re.IGNORECASE):
+        match = _predicate.match(term)
+        check_argument(match is not None, "Invalid filter: %s" % filter)
+        name, op, value = match.groups()
+        check_argument(name in schema.names, "Column %s of filter doesn't exist" % name)
+        value = pa.scalar(value.strip("'\"")).cast(schema.field(name).type)
+        term = _comparisons[op](pa_dataset.field(name), value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+class _Sink(object):
+    """A file-like sink of the arrow ipc writer, which is drained by the reader."""
+
+    closed = False
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def _write_batches(schema, batches, chunk_size):
+    """Write `batches` as an arrow ipc stream, in pieces of `chunk_size` bytes
+    except the last one, thus the memory is bounded by a chunk and a batch.
+    """
+    sink = _Sink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            while len(sink.buffer) >= chunk_size:
+                yield bytes(sink.buffer[:chunk_size])
+                del sink.buffer[:chunk_size]
+    yield bytes(sink.buffer)
+
+
+def _scan_dataset(dataset, options, filter, chunk_size):
+    """Scan the columns selected by `options` and the rows matched by `filter` of
+    `dataset` as an arrow ipc stream.
+    """
+    names = dataset.schema.names
+    columns = None
+    if options.include_columns:
+        # id columns go first, and they may be referred by index
+        columns = [
+            names[int(c)] if c not in names and c.isdigit() else c
+            for c in options.include_columns
+        ]
+        columns = list(dict.fromkeys(columns))
+    # row groups are read in parallel by the threads of arrow
+    scanner = dataset.scanner(columns=columns, filter=filter, use_threads=True)
+    return _write_batches(scanner.projected_schema, scanner.to_batches(), chunk_size)
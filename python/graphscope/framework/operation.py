@@ -79,7 +79,7 @@ class Operation(object):
             self._op_def.large_attr.CopyFrom(large_attr)
         if config:
             for k, v in config.items():
-                self._op_def.attr[k].CopyFrom(v)
+                self.set_attr(k, v)
         if query_args is not None:
             self._op_def.query_args.CopyFrom(query_args)
         if inputs:
@@ -90,6 +90,8 @@ class Operation(object):
         self._output_types = output_types
         self._evaluated = False
         self._leaf = False
+        # (signatures of parents, signature) of the last evaluation
+        self._signature = None
 
     @property
     def key(self):
@@ -124,13 +126,25 @@ class Operation(object):
         Used to unique identify one `Operation` with fixed configuration,
         if the configuration changed, the signature will be changed accordingly.
 
-        Note that this method has not been used.
+        The randomly generated key is excluded, thus operations that are
+        constructed in the same way on the same inputs share the signature.
+        It is memoized, and taken again once the op is modified by `set_attr`
+        or the signature of any parent changes.
         """
-        content = ""
-        for op in self._parents:
-            content += str(op.as_op_def)
-        content += str(self.as_op_def())
-        return hashlib.sha224(content.encode()).hexdigest()
+        parents = tuple(op.signature for op in self._parents)
+        if self._signature is None or self._signature[0] != parents:
+            op_def = op_def_pb2.OpDef()
+            op_def.CopyFrom(self._op_def)
+            op_def.ClearField("key")
+            op_def.ClearField("parents")
+            # marked when the op is fetched
+            op_def.ClearField("fetch")
+            content = hashlib.sha224()
+            for signature in parents:
+                content.update(signature.encode("utf-8"))
+            content.update(op_def.SerializeToString(deterministic=True))
+            self._signature = (parents, content.hexdigest())
+        return self._signature[1]
 
     def is_leaf_op(self):
         return self._leaf
@@ -155,6 +169,12 @@ class Operation(object):
     def add_parent(self, op):
         self._parents.append(op)
         self._op_def.parents.extend([op.key])
+        self._signature = None
+
+    def set_attr(self, key, value):
+        """Set the attribute `key` of the op to `value`, an AttrValue."""
+        self._op_def.attr[key].CopyFrom(value)
+        self._signature = None
 
     def as_op_def(self):
         return self._op_def
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Spans of runs, from the client through the coordinator to engines, which
+could be exported as Chrome trace events or to OpenTelemetry.
+
+Spans are recorded into the trace that is active in the current thread, and
+cost nothing but a lookup of the thread local when there is no such trace.
+The client sends the id of its trace in the head of RunStep, and the coordinator
+returns the spans it has recorded in the head of the response.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+
+__all__ = ["Trace", "trace", "span", "traced", "activate", "current_trace"]
+
+_local = threading.local()
+
+
+class Trace(object):
+    """Spans of a trace identified by `trace_id`, recorded as the complete events
+    of the Chrome trace event format.
+    """
+
+    def __init__(self, trace_id=None, process="client"):
+        self._trace_id = trace_id or uuid.uuid4().hex
+        self._process = process
+        self._events = []
+        self._threads = set()
+        self._lock = threading.Lock()
+
+    @property
+    def trace_id(self):
+        return self._trace_id
+
+    @property
+    def events(self):
+        with self._lock:
+            return list(self._events)
+
+    def span(self, name, **args):
+        return _Span(self, name, args)
+
+    def record(self, name, start, end, **args):
+        """Record a span from `start` to `end`, in nanoseconds of :func:`time.time_ns`."""
+        pid, thread = os.getpid(), threading.current_thread()
+        event = {
+            "name": name,
+            "cat": self._process,
+            "ph": "X",
+            "ts": start / 1000,
+            "dur": (end - start) / 1000,
+            "pid": pid,
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            if not self._threads:
+                self._events.append(_metadata("process_name", pid, 0, self._process))
+            if thread.ident not in self._threads:
+                self._threads.add(thread.ident)
+                self._events.append(
+                    _metadata("thread_name", pid, thread.ident, thread.name)
+                )
+            self._events.append(event)
+
+    def extend(self, events):
+        """Add the events recorded by others, e.g., the coordinator."""
+        with self._lock:
+            self._events.extend(events)
+
+    def to_chrome_trace(self):
+        """The trace in the Chrome trace event format, which could be loaded by
+        `chrome://tracing` or https://ui.perfetto.dev.
+        """
+        return {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self._trace_id},
+        }
+
+    def dump(self, path):
+        """Write the trace to `path` as Chrome trace event json."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def to_opentelemetry(self, tracer=None):
+        """Replay the spans to an OpenTelemetry `tracer`, where a span is the child
+        of the innermost span that encloses it.
+        """
+        from opentelemetry import trace as otel_trace
+
+        if tracer is None:
+            tracer = otel_trace.get_tracer("graphscope")
+        events = [event for event in self.events if event["ph"] == "X"]
+        events.sort(key=lambda event: (event["ts"], -event["dur"]))
+        # (end in ns, span) of the enclosing spans
+        stack = []
+        for event in events:
+            start = int(event["ts"] * 1000)
+            end = start + int(event["dur"] * 1000)
+            while stack and stack[-1][0] < end:
+                stack.pop()
+            context = None
+            if stack:
+                context = otel_trace.set_span_in_context(stack[-1][1])
+            attributes = {k: str(v) for k, v in event["args"].items()}
+            attributes.update(
+                {"graphscope.trace_id": self._trace_id, "graphscope.cat": event["cat"]}
+            )
+            otel_span = tracer.start_span(
+                event["name"], context=context, start_time=start, attributes=attributes
+            )
+            otel_span.end(end_time=end)
+            stack.append((end, otel_span))
+
+
+def _metadata(name, pid, tid, value):
+    return {"name": name, "ph": "M", "pid": pid, "tid": tid, "args": {"name": value}}
+
+
+class _Span(object):
+    __slots__ = ("_trace", "_name", "_args", "_start")
+
+    def __init__(self, trace, name, args):
+        self._trace = trace
+        self._name = name
+        self._args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._trace.record(self._name, self._start, time.time_ns(), **self._args)
+
+    def set(self, **args):
+        """Attach `args` to the span."""
+        self._args.update(args)
+
+
+class _NoopSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        pass
+
+    def set(self, **args):
+        pass
+
+
+_noop_span = _NoopSpan()
+
+
+def current_trace():
+    """The trace active in the current thread, or None."""
+    return getattr(_local, "trace", None)
+
+
+@contextlib.contextmanager
+def activate(trace):
+    """Record spans of the current thread into `trace` in the block, which is
+    a no-op if `trace` is None.
+    """
+    if trace is None:
+        yield None
+        return
+    previous = getattr(_local, "trace", None)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def span(name, **args):
+    """A span of the active trace, used as a context manager."""
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return _noop_span
+    return _Span(trace, name, args)
+
+
+def traced(func):
+    """Decorator that records each call of `func` as a span."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = getattr(_local, "trace", None)
+        if trace is None:
+            return func(*args, **kwargs)
+        with _Span(trace, name, {}):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextlib.contextmanager
+def trace(path=None):
+    """Trace the runs of sessions in the block, and write the trace to `path`
+    as Chrome trace event json if given.
+
+    .. code:: python
+
+        >>> with graphscope.trace() as t:
+        ...     sess.run(ctx.to_numpy("r"))
+        >>> t.dump("trace.json")
+    """
+    t = Trace()
+    with activate(t):
+        yield t
+    if path is not None:
+        t.dump(path)
@@ -24,6 +24,7 @@ import re
 import shutil
 import socket
 import string
+import struct
 import subprocess
 import tempfile
 import threading
@@ -33,9 +34,11 @@ from queue import Queue
 import numpy as np
 import pandas as pd
 import psutil
+import pyarrow as pa
 from google.protobuf.any_pb2 import Any
 
 from graphscope.client.archive import OutArchive
+from graphscope.framework import tracing
 from graphscope.framework.errors import check_argument
 from graphscope.proto import attr_value_pb2
 from graphscope.proto import data_types_pb2
@@ -384,6 +387,20 @@ def _context_protocol_to_numpy_dtype(dtype):
     return npdtype
 
 
+def decode_string_array(archive, count):
+    """Decode `count` strings from the archive in a batch.
+
+    Returns:
+        :class:`pyarrow.LargeStringArray`: Built upon the offsets and the
+        contiguous data from the archive, without copy.
+    """
+    offsets, data = archive.get_string_block(count)
+    return pa.LargeStringArray.from_buffers(
+        count, pa.py_buffer(offsets), pa.py_buffer(data)
+    )
+
+
+@tracing.traced
 def decode_numpy(value):
     if not value:
         raise RuntimeError("Value to decode should not be empty")
@@ -396,10 +413,7 @@ def decode_numpy(value):
     array_size = archive.get_size()
     check_argument(array_size == np.prod(shape))
     if dtype is object:
-        data_copy = []
-        for _ in range(array_size):
-            data_copy.append(archive.get_string())
-        array = np.array(data_copy, dtype=dtype)
+        array = decode_string_array(archive, array_size).to_numpy(zero_copy_only=False)
     else:
         array = np.ndarray(
             shape=shape,
@@ -410,6 +424,7 @@ def decode_numpy(value):
     return array
 
 
+@tracing.traced
 def decode_dataframe(value):
     if not value:
         raise RuntimeError("Value to decode should not be empty")
@@ -422,10 +437,7 @@ def decode_dataframe(value):
         col_name = archive.get_string()
         dtype = _context_protocol_to_numpy_dtype(archive.get_int())
         if dtype is object:
-            data_copy = []
-            for _ in range(row_num):
-                data_copy.append(archive.get_string())
-            array = np.array(data_copy, dtype=dtype)
+            array = decode_string_array(archive, row_num).to_numpy(zero_copy_only=False)
         else:
             array = np.ndarray(
                 shape=(row_num,),
@@ -436,6 +448,143 @@ def decode_dataframe(value):
     return pd.DataFrame(arrays)
 
 
+@tracing.traced
+def decode_arrow_table(value):
+    """Decode a dataframe archive into a :class:`pyarrow.Table`.
+
+    Numeric columns are wrapped upon the buffer, and string columns are built
+    from the contiguous string data, both without copy. Besides the types of
+    :meth:`decode_dataframe`, the type id 9 stands for a column of json strings,
+    which holds values of mixed types, or missing values as `null`. Such a column
+    is decoded into python objects and converted by :meth:`pyarrow.array`, and
+    left as json strings if the objects cannot be converted.
+    """
+    if not value:
+        raise RuntimeError("Value to decode should not be empty")
+    archive = OutArchive(value)
+    column_num = archive.get_size()
+    row_num = archive.get_size()
+    arrays, names = [], []
+
+    for _ in range(column_num):
+        names.append(archive.get_string())
+        dtype_id = archive.get_int()
+        if dtype_id == types_pb2.COLUMN_TYPE_JSON:
+            array = decode_string_array(archive, row_num)
+            try:
+                array = pa.array([json.loads(s) for s in array.to_pylist()])
+            except pa.ArrowException:
+                pass
+        else:
+            dtype = _context_protocol_to_numpy_dtype(dtype_id)
+            if dtype is object:
+                array = decode_string_array(archive, row_num)
+            else:
+                array = pa.array(
+                    np.ndarray(
+                        shape=(row_num,),
+                        dtype=dtype,
+                        buffer=archive.get_block(row_num * dtype.itemsize),
+                    )
+                )
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def decode_numpy_blocks(chunks):
+    """Decode a tensor from an iterable of chunks of the archive, yields
+    blocks of rows as soon as they have been received completely.
+
+    The concatenation of all yielded blocks along the first axis equals to
+    the result of :meth:`decode_numpy` on the whole buffer.
+    """
+    chunks = iter(chunks)
+    # the chunk being decoded and the read offset in it, the chunk is dropped
+    # once consumed, rather than copied with the bytes left
+    data, pos = b"", 0
+
+    def _next_chunk():
+        try:
+            return next(chunks)
+        except StopIteration:
+            raise RuntimeError("Incomplete archive of tensor") from None
+
+    def _take(size):
+        nonlocal data, pos
+        if len(data) - pos >= size:
+            pos += size
+            return memoryview(data)[pos - size : pos]
+        # only the bytes that straddle chunks are copied
+        buffer = bytearray(memoryview(data)[pos:])
+        while len(buffer) < size:
+            data = _next_chunk()
+            pos = min(size - len(buffer), len(data))
+            buffer += memoryview(data)[:pos]
+        return buffer
+
+    shape = [
+        struct.unpack("q", _take(8))[0] for _ in range(struct.unpack("q", _take(8))[0])
+    ]
+    dtype = _context_protocol_to_numpy_dtype(struct.unpack("i", _take(4))[0])
+    array_size = struct.unpack("q", _take(8))[0]
+    check_argument(array_size == np.prod(shape))
+    if array_size == 0:
+        yield np.empty(shape, dtype=dtype)
+        return
+
+    # a scalar is treated as a single row
+    rows, row_shape = (shape[0], tuple(shape[1:])) if shape else (1, ())
+    row_items = int(np.prod(row_shape))
+    row_size = 0 if dtype is object else row_items * dtype.itemsize
+    while rows > 0:
+        if pos == len(data):
+            data, pos = _next_chunk(), 0
+        if dtype is object:
+            block, view = [], memoryview(data)
+            while rows > 0 and pos + 8 <= len(data):
+                size = struct.unpack_from("q", view, pos)[0]
+                if pos + 8 + size > len(data):
+                    break
+                block.append(view[pos + 8 : pos + 8 + size].tobytes().decode("utf-8"))
+                pos += 8 + size
+                rows -= 1
+            if not block:
+                # the string straddles chunks
+                size = struct.unpack("q", _take(8))[0]
+                block.append(bytes(_take(size)).decode("utf-8"))
+                rows -= 1
+            block = np.array(block, dtype=dtype)
+        else:
+            n = min((len(data) - pos) // row_size, rows)
+            if n > 0:
+                # a view of the chunk, without copying
+                block = np.frombuffer(
+                    data, dtype=dtype, count=n * row_items, offset=pos
+                )
+                pos += n * row_size
+            else:
+                # the row straddles chunks
+                n = 1
+                block = np.frombuffer(_take(row_size), dtype=dtype)
+            block = block.reshape((n,) + row_shape)
+            rows -= n
+        yield block if shape else block.reshape(())
+
+
+def decode_dataframe_blocks(chunks):
+    """Decode a dataframe from an iterable of chunks of the archive.
+
+    Note that columns are serialized one after another in the archive, hence
+    the rows are not complete until the last column arrives. This function
+    assembles the chunks in place as they arrive and yields the whole dataframe
+    as a single block, to keep the same interface with :meth:`decode_numpy_blocks`.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+    yield decode_dataframe(buffer)
+
+
 def _unify_str_type(t):
     t = t.lower()
     if t in ("b", "bool"):
@@ -581,11 +730,11 @@ def _from_numpy_dtype(dtype):
         np.dtype(np.uint32): types_pb2.UINT32,
         np.dtype(np.uint64): types_pb2.UINT64,
         np.dtype(np.intc): types_pb2.INT,
-        np.dtype(np.long): types_pb2.LONG,
+        np.dtype(int): types_pb2.LONG,
         np.dtype(bool): types_pb2.BOOLEAN,
         np.dtype(float): types_pb2.FLOAT,
         np.dtype(np.double): types_pb2.DOUBLE,
-        np.dtype(np.object): types_pb2.STRING,
+        np.dtype(object): types_pb2.STRING,
     }
     pbdtype = dtype_reverse_map.get(dtype)
     if pbdtype is None:
@@ -604,11 +753,11 @@ def _to_numpy_dtype(dtype):
         types_pb2.UINT32: np.uint32,
         types_pb2.UINT64: np.uint64,
         types_pb2.INT: np.intc,
-        types_pb2.LONG: np.long,
-        types_pb2.BOOLEAN: np.bool,
-        types_pb2.FLOAT: np.float,
+        types_pb2.LONG: int,
+        types_pb2.BOOLEAN: bool,
+        types_pb2.FLOAT: float,
         types_pb2.DOUBLE: np.double,
-        types_pb2.STRING: np.object,
+        types_pb2.STRING: object,
     }
     npdtype = dtype_map.get(dtype)
     if npdtype is None:
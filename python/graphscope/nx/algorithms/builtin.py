@@ -19,8 +19,11 @@
 import functools
 import inspect
 import json
+from collections.abc import MutableMapping
 
 import networkx.algorithms as nxa
+import numpy as np
+import pandas as pd
 from networkx.utils.decorators import not_implemented_for
 
 import graphscope
@@ -62,28 +65,127 @@ def project_to_simple(func):
     return wrapper
 
 
+class ResultDict(MutableMapping):
+    """A dict of the results of builtin algorithms, which wraps the arrays of
+    nodes and values returned by engine.
+
+    The hash index from nodes to values is built at the first lookup or
+    modification, while iterating over the nodes, :meth:`to_numpy` and
+    :meth:`to_pandas` don't need it. Once it's modified, the arrays are taken
+    from the index again. Use `dict(result)` where a `dict` is required, e.g.,
+    by `json.dumps`.
+    """
+
+    __slots__ = ("_nodes", "_values", "_dict")
+
+    def __init__(self, nodes, values):
+        self._nodes = nodes
+        self._values = values
+        self._dict = None
+
+    def __reduce__(self):
+        return ResultDict, (self.nodes, self.to_numpy())
+
+    def _get_dict(self):
+        if self._dict is None:
+            self._dict = dict(zip(self._nodes.tolist(), self._values.tolist()))
+        return self._dict
+
+    def _modify(self):
+        d = self._get_dict()
+        self._nodes = self._values = None
+        return d
+
+    def __getitem__(self, node):
+        return self._get_dict()[node]
+
+    def __contains__(self, node):
+        return node in self._get_dict()
+
+    def __setitem__(self, node, value):
+        self._modify()[node] = value
+
+    def __delitem__(self, node):
+        del self._modify()[node]
+
+    def __iter__(self):
+        if self._dict is None:
+            return iter(self._nodes.tolist())
+        return iter(self._dict)
+
+    def __len__(self):
+        if self._dict is None:
+            return len(self._nodes)
+        return len(self._dict)
+
+    def __repr__(self):
+        return repr(self._get_dict())
+
+    def clear(self):
+        self._modify().clear()
+
+    def keys(self):
+        return self._get_dict().keys()
+
+    def values(self):
+        return self._get_dict().values()
+
+    def items(self):
+        return self._get_dict().items()
+
+    def _arrays(self):
+        if self._nodes is None:
+            # via pandas, numpy would unpack the tuples of labeled nodes as rows
+            self._nodes = pd.Series(list(self._dict.keys())).to_numpy()
+            self._values = pd.Series(list(self._dict.values())).to_numpy()
+        return self._nodes, self._values
+
+    @property
+    def nodes(self):
+        """The numpy array of nodes."""
+        return self._arrays()[0]
+
+    def to_numpy(self):
+        """Returns the numpy array of values, in the same order of `nodes`."""
+        return self._arrays()[1]
+
+    def to_pandas(self):
+        """Returns a `pandas.Series` of values indexed by nodes."""
+        nodes, values = self._arrays()
+        index = pd.Index(nodes, tupleize_cols=False, copy=False)
+        return pd.Series(values, index=index, name="value", copy=False)
+
+
+def _label_nodes(ids, label_ids, vertex_labels, default_label_id):
+    """Turn the nodes not in the default label into (label, id) tuples."""
+    mask = label_ids != default_label_id
+    if not mask.any():
+        return ids
+    labels = np.array(vertex_labels, dtype=object)[label_ids[mask]]
+    nodes = ids.astype(object)
+    # build the array of tuples via pandas, numpy would unpack them as rows
+    nodes[mask] = pd.Series(list(zip(labels, ids[mask].tolist()))).to_numpy()
+    return nodes
+
+
 def context_to_dict(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         ctx = func(*args, **kwargs)
         graph = args[0]
         if graph.graph_type == graph_def_pb2.ARROW_FLATTENED:
-            d = dict()
             df = ctx.to_dataframe(
                 {"label_id": "v.label_id", "id": "v.id", "value": "r"}
             )
-            vertex_labels = graph.schema.vertex_labels
-            for row in df.itertuples():
-                if row.label_id != graph._default_label_id:
-                    d[(vertex_labels[row.label_id], row.id)] = row.value
-                else:
-                    d[row.id] = row.value
-            return d
-        return (
-            ctx.to_dataframe({"id": "v.id", "value": "r"})
-            .set_index("id")["value"]
-            .to_dict()
-        )
+            nodes = _label_nodes(
+                df["id"].to_numpy(),
+                df["label_id"].to_numpy(),
+                graph.schema.vertex_labels,
+                graph._default_label_id,
+            )
+            return ResultDict(nodes, df["value"].to_numpy())
+        df = ctx.to_dataframe({"id": "v.id", "value": "r"})
+        return ResultDict(df["id"].to_numpy(), df["value"].to_numpy())
 
     return wrapper
 
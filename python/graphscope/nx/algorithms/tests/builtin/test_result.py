@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from graphscope import nx
+from graphscope.nx.algorithms.builtin import ResultDict
+from graphscope.nx.algorithms.builtin import _label_nodes
+
+
+def test_result_dict():
+    values = np.array([0.1, 0.2, 0.3])
+    result = ResultDict(np.array([1, 2, 3]), values)
+    assert len(result) == 3
+    assert list(result) == [1, 2, 3]
+    assert result[2] == 0.2 and isinstance(result[2], float)
+    assert 4 not in result
+    with pytest.raises(KeyError):
+        result[4]
+    assert result == {1: 0.1, 2: 0.2, 3: 0.3}
+    assert dict(result) == {1: 0.1, 2: 0.2, 3: 0.3}
+    assert result.to_numpy() is values
+    series = result.to_pandas()
+    assert np.shares_memory(series.to_numpy(), values)
+    assert series.loc[3] == 0.3
+
+
+def test_result_dict_mutation():
+    result = ResultDict(np.array([1, 2, 3]), np.array([0.1, 0.2, 0.3]))
+    # the index is built by the first lookup only
+    assert list(result) == [1, 2, 3] and result._dict is None
+    assert json.loads(json.dumps(dict(result))) == {"1": 0.1, "2": 0.2, "3": 0.3}
+    result[4] = 0.4
+    result.update({1: 1.0})
+    del result[2]
+    assert result == {1: 1.0, 3: 0.3, 4: 0.4}
+    # the arrays are taken from the dict once modified
+    assert result.nodes.tolist() == [1, 3, 4]
+    assert result.to_numpy().tolist() == [1.0, 0.3, 0.4]
+    assert result.to_pandas().loc[4] == 0.4
+    copied = pickle.loads(pickle.dumps(result))
+    assert isinstance(copied, ResultDict) and copied == result
+
+
+def test_label_nodes():
+    ids = np.array([1, 2, 3])
+    assert _label_nodes(ids, np.array([0, 0, 0]), ["a", "b"], 0) is ids
+    nodes = _label_nodes(ids, np.array([0, 1, 1]), ["a", "b"], 0)
+    assert nodes.tolist() == [1, ("b", 2), ("b", 3)]
+    result = ResultDict(nodes, np.array([0.1, 0.2, 0.3]))
+    assert result[("b", 3)] == 0.3
+    assert result.to_pandas().loc[[("b", 2)]].tolist() == [0.2]
+
+
+@pytest.mark.usefixtures("graphscope_session")
+def test_builtin_result():
+    G = nx.path_graph(4)
+    result = nx.builtin.degree_centrality(G)
+    assert isinstance(result, ResultDict)
+    assert result == {0: 1 / 3, 1: 2 / 3, 2: 2 / 3, 3: 1 / 3}
+    series = result.to_pandas()
+    assert isinstance(series, pd.Series)
+    assert series.sort_index().tolist() == [1 / 3, 2 / 3, 2 / 3, 1 / 3]
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+from collections import OrderedDict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from graphscope.framework import dag_utils
+from graphscope.nx import NetworkXError
+from graphscope.proto import graph_def_pb2
+from graphscope.proto import types_pb2
+
+__all__ = ["AdjCache", "ModificationFlusher", "ProjectionCache", "estimate_size"]
+
+# report type to fetch a single node -> report type to fetch in batch
+_batch_report_types = {
+    types_pb2.SUCCS_BY_NODE: types_pb2.SUCCS_BY_LOC,
+    types_pb2.PREDS_BY_NODE: types_pb2.PREDS_BY_LOC,
+    types_pb2.NEIGHBORS_BY_NODE: types_pb2.NEIGHBORS_BY_LOC,
+}
+
+
+# a single thread shared by all graphs to apply the modifications in background,
+# which keeps the batches of a graph in order.
+_flush_executor = None
+_flush_executor_lock = threading.Lock()
+
+
+def _get_flush_executor():
+    global _flush_executor
+    with _flush_executor_lock:
+        if _flush_executor is None:
+            _flush_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="nx-flusher"
+            )
+        return _flush_executor
+
+
+def estimate_size(obj):
+    """Estimate the bytes of a pending node or edge once serialized."""
+    if isinstance(obj, str):
+        return len(obj) + 8
+    if isinstance(obj, (tuple, list)):
+        return sum(map(estimate_size, obj))
+    if isinstance(obj, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in obj.items())
+    return 8
+
+
+def _as_node(n):
+    return tuple(n) if isinstance(n, list) else n
+
+
+def _graph_version(graph):
+    version = graph._version
+    # a view in engine follows the modifications of the graph it hosts on
+    while hasattr(graph, "_graph"):
+        graph = graph._graph
+        version += graph._version
+    return version
+
+
+class AdjCache(object):
+    """A client-side cache of the adjacency of nx graph.
+
+    The neighbors of a node is fetched from the engine at the first access and
+    kept in the cache, which is bounded by the total number of neighbors of
+    cached nodes and evicted in LRU order. If the whole adjacency fits into
+    the cache, it is prefetched in batch at the first miss, and the later
+    lookups (including the missing nodes) are served without any rpc.
+
+    The cache is tagged with the version of graph, which is increased every
+    time a modification is applied to the graph in engine, and the cache is
+    dropped once the version changed.
+    """
+
+    __slots__ = ("_graph", "_maxsize", "_size", "_version", "_entries", "_complete")
+
+    def __init__(self, graph, maxsize):
+        self._graph = graph
+        self._maxsize = maxsize
+        self._size = 0
+        self._version = None
+        self._entries = OrderedDict()
+        # report type -> whether the neighbors of all nodes are cached
+        self._complete = {}
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._maxsize = value
+        self._evict()
+
+    def clear(self):
+        self._size = 0
+        self._entries.clear()
+        self._complete.clear()
+
+    def get(self, node, rtype):
+        """Get the neighbors of node, fetch from engine if not cached.
+
+        Raises:
+            KeyError: If the node is not in the graph.
+        """
+        graph = self._graph
+        # apply the pending modifications first, which may change the version.
+        graph._clear_removing_cache()
+        graph._clear_adding_cache()
+        version = _graph_version(graph)
+        if self._version != version:
+            self.clear()
+            self._version = version
+        if self._maxsize <= 0:
+            return self._fetch(node, rtype)
+
+        key = (rtype, node)
+        nbrs = self._entries.get(key)
+        if nbrs is not None:
+            self._entries.move_to_end(key)
+            return nbrs
+        if rtype not in self._complete:
+            self._complete[rtype] = self._prefetch(rtype)
+            nbrs = self._entries.get(key)
+            if nbrs is not None:
+                return nbrs
+        if self._complete[rtype]:
+            raise KeyError(node)
+        nbrs = self._fetch(node, rtype)
+        self._put(key, nbrs)
+        return nbrs
+
+    def _fetch(self, node, rtype):
+        try:
+            return self._graph._get_nbrs(node, rtype)
+        except NetworkXError:
+            raise KeyError(node)
+
+    def _put(self, key, nbrs):
+        self._entries[key] = nbrs
+        self._size += len(nbrs) + 1
+        self._evict()
+
+    def _evict(self):
+        while self._size > self._maxsize and self._entries:
+            (rtype, _), nbrs = self._entries.popitem(last=False)
+            self._size -= len(nbrs) + 1
+            if self._complete.get(rtype):
+                self._complete[rtype] = False
+
+    def _prefetch(self, rtype):
+        """Fetch the neighbors of all nodes in batch if they fit into the cache.
+
+        Returns:
+            bool: True if all nodes are cached.
+        """
+        graph = self._graph
+        if (
+            graph.graph_type != graph_def_pb2.DYNAMIC_PROPERTY
+            or rtype not in _batch_report_types
+        ):
+            return False
+        node_num = graph.number_of_nodes()
+        nbr_num = graph.number_of_edges()
+        if not graph.is_directed():
+            nbr_num *= 2
+        if node_num + nbr_num > self._maxsize:
+            return False
+
+        self._complete[rtype] = True
+        count = 0
+        pos = (0, 0)  # start iterate from the (worker:0, lid:0) node.
+        while count < node_num:
+            ret = graph._batch_get_nbrs(pos, _batch_report_types[rtype])
+            pos = ret["next"]
+            if ret["status"] is not True:
+                continue
+            batch = ret["batch"]
+            count += len(batch)
+            for item in batch:
+                ids, data = item["nbrs"]
+                nbrs = {_as_node(n): d for n, d in zip(ids, data)}
+                self._entries[(rtype, _as_node(item["node"]))] = nbrs
+                self._size += len(nbrs) + 1
+        self._evict()
+        return self._complete[rtype]
+
+
+class ModificationFlusher(object):
+    """Apply the batches of pending modifications to the graph in engine in a
+    background thread, pipelined with the following modifications on client.
+
+    At most `depth` batches are in flight, :meth:`submit` blocks until the
+    oldest one is applied when the bound is reached, which keeps the memory
+    of pending modifications flat. The error raised when applying a batch is
+    re-raised by the following :meth:`submit` or :meth:`wait`.
+
+    The op that applies a batch is handed back to the graph in the thread that
+    owns the graph, once the batch is waited.
+    """
+
+    __slots__ = ("_graph", "_depth", "_futures")
+
+    def __init__(self, graph, depth=2):
+        self._graph = graph
+        self._depth = depth
+        # (modify_type, future of the op)
+        self._futures = deque()
+
+    def __len__(self):
+        return len(self._futures)
+
+    def submit(self, modify_type, items):
+        while len(self._futures) >= self._depth:
+            self._wait_oldest()
+        self._futures.append(
+            (
+                modify_type,
+                _get_flush_executor().submit(
+                    self._graph._modify_in_engine, modify_type, items
+                ),
+            )
+        )
+
+    def in_flight(self, *modify_types):
+        """Whether any batch of `modify_types` is not waited yet."""
+        return any(modify_type in modify_types for modify_type, _ in self._futures)
+
+    def wait(self):
+        """Block until all submitted batches are applied."""
+        while self._futures:
+            self._wait_oldest()
+
+    def _wait_oldest(self):
+        _, future = self._futures.popleft()
+        op = future.result()
+        if op is not None:
+            self._graph._op = op
+
+
+class ProjectionCache(object):
+    """A cache of the simple graphs projected from the nx graph to run builtin
+    algorithms, keyed by the projected node and edge attribute.
+
+    The projections are tagged with the version of graph and are dropped once
+    the graph is modified, at most `maxsize` of them are kept in LRU order. The
+    evicted or dropped projections are unloaded from engine.
+    """
+
+    __slots__ = ("_graph", "_maxsize", "_version", "_entries")
+
+    def __init__(self, graph, maxsize):
+        self._graph = graph
+        self._maxsize = maxsize
+        self._version = None
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._maxsize = value
+        self._evict()
+
+    def get(self, v_prop, e_prop):
+        version = _graph_version(self._graph)
+        if self._version != version:
+            self.clear()
+            self._version = version
+        key = (v_prop, e_prop)
+        projected = self._entries.get(key)
+        if projected is not None:
+            self._entries.move_to_end(key)
+        return projected
+
+    def put(self, v_prop, e_prop, projected):
+        if self._maxsize <= 0:
+            return
+        self._entries[(v_prop, e_prop)] = projected
+        self._evict()
+
+    def clear(self):
+        while self._entries:
+            self._unload(self._entries.popitem(last=False)[1])
+
+    def _evict(self):
+        while len(self._entries) > max(self._maxsize, 0):
+            self._unload(self._entries.popitem(last=False)[1])
+
+    def _unload(self, projected):
+        dag_utils.unload_graph(projected).eval()
@@ -98,9 +98,9 @@ class NodeAttrDict(MutableMapping):
         return str(self.mapping)
 
 
-# NB: implement the dict structure to reuse the views of networkx. since we
-# fetch the neighbor messages of node one by one, it's slower than reimplemented
-# views.
+# NB: implement the dict structure to reuse the views of networkx. the neighbor
+# messages of node are served by the adjacency cache of graph (see `AdjCache`),
+# and only fetched from engine when missed.
 # NB: maybe we can reimpl keysview, valuesview and itemsview for the AdjDict.
 class AdjDict(MutableMapping):
     __slots__ = ("_graph", "_rtype")
@@ -114,8 +114,6 @@ class AdjDict(MutableMapping):
 
     def __getitem__(self, key):
         hash(key)  # check the key is hashable.
-        if key not in self._graph:
-            raise KeyError(key)
         return AdjInnerDict(self._graph, key, self._rtype)
 
     def __setitem__(self, key, value):
@@ -152,7 +150,7 @@ class AdjInnerDict(MutableMapping):
         self._graph = graph
         self._node = node
         self._type = rtype
-        self.mapping = graph._get_nbrs(node, rtype)
+        self.mapping = graph._adj_cache.get(node, rtype)
 
     def __len__(self):
         return len(self.mapping)
@@ -184,7 +182,8 @@ class AdjInnerDict(MutableMapping):
         return f"{type(self).__name__}({self.mapping})"
 
     def copy(self):
-        return self.mapping
+        # the mapping is shared by the adjacency cache
+        return {nbr: dict(data) for nbr, data in self.mapping.items()}
 
 
 class AdjEdgeAttrDict(MutableMapping):
@@ -215,7 +214,7 @@ class AdjEdgeAttrDict(MutableMapping):
         return iter(self.mapping)
 
     def copy(self):
-        return self.mapping
+        return dict(self.mapping)
 
     def __str__(self):
         return str(self.mapping)
@@ -34,6 +34,9 @@ from graphscope.framework.dag_utils import copy_graph
 from graphscope.framework.errors import check_argument
 from graphscope.framework.graph_schema import GraphSchema
 from graphscope.nx import NetworkXError
+from graphscope.nx.classes.cache import AdjCache
+from graphscope.nx.classes.cache import ModificationFlusher
+from graphscope.nx.classes.cache import ProjectionCache
 from graphscope.nx.classes.graph import Graph
 from graphscope.nx.classes.reportviews import InEdgeView
 from graphscope.nx.classes.reportviews import OutEdgeView
@@ -266,6 +269,16 @@ class DiGraph(Graph):
         self._remove_node_cache = []
         self._remove_edge_cache = []
 
+        # the number and estimated bytes of the pending modifications
+        self._pending_items = 0
+        self._pending_bytes = 0
+        self._flusher = ModificationFlusher(self)
+
+        # increased once the graph in engine is modified
+        self._version = 0
+        self._adj_cache = AdjCache(self, self.adj_cache_size)
+        self._projection_cache = ProjectionCache(self, self.projection_cache_size)
+
         create_empty_in_engine = attr.pop(
             "create_empty_in_engine", True
         )  # a hidden parameter
@@ -474,6 +487,26 @@ class DiGraph(Graph):
     def out_degree(self):
         return OutDegreeView(self)
 
+    @clear_cache
+    def in_degree_array(self, weight=None):
+        """Returns the in-degrees of all nodes as an array.
+
+        See Also
+        --------
+        degree_array
+        """
+        return self._degree_array(weight, types_pb2.IN_DEG_TO_DATAFRAME)
+
+    @clear_cache
+    def out_degree_array(self, weight=None):
+        """Returns the out-degrees of all nodes as an array.
+
+        See Also
+        --------
+        degree_array
+        """
+        return self._degree_array(weight, types_pb2.OUT_DEG_TO_DATAFRAME)
+
     @patch_docstring(RefDiGraph.is_directed)
     def is_directed(self):
         return True
@@ -22,6 +22,8 @@
 import copy
 
 import orjson as json
+import pandas as pd
+import pyarrow as pa
 from networkx import freeze
 from networkx.classes.coreviews import AdjacencyView
 from networkx.classes.graph import Graph as RefGraph
@@ -37,6 +39,10 @@ from graphscope.framework.errors import InvalidArgumentError
 from graphscope.framework.errors import check_argument
 from graphscope.framework.graph_schema import GraphSchema
 from graphscope.nx import NetworkXError
+from graphscope.nx.classes.cache import AdjCache
+from graphscope.nx.classes.cache import ModificationFlusher
+from graphscope.nx.classes.cache import ProjectionCache
+from graphscope.nx.classes.cache import estimate_size
 from graphscope.nx.classes.dicts import AdjDict
 from graphscope.nx.classes.dicts import NodeDict
 from graphscope.nx.classes.reportviews import EdgeView
@@ -44,8 +50,13 @@ from graphscope.nx.classes.reportviews import NodeView
 from graphscope.nx.convert import to_networkx_graph
 from graphscope.nx.utils.compat import patch_docstring
 from graphscope.nx.utils.misc import clear_cache
+from graphscope.nx.utils.misc import columns_of
 from graphscope.nx.utils.misc import empty_graph_in_engine
+from graphscope.nx.utils.misc import encode_columns
+from graphscope.nx.utils.misc import encode_edges
+from graphscope.nx.utils.misc import encode_nodes
 from graphscope.nx.utils.misc import parse_ret_as_dict
+from graphscope.nx.utils.misc import rows_of
 from graphscope.proto import graph_def_pb2
 from graphscope.proto import types_pb2
 
@@ -263,6 +274,28 @@ class Graph(_GraphBase):
     graph_attr_dict_factory = dict
     _graph_type = graph_def_pb2.DYNAMIC_PROPERTY
 
+    # the max number of nodes and neighbors kept in the client-side adjacency
+    # cache, set to 0 to disable the cache.
+    adj_cache_size = 1000000
+
+    # the max number of simple graphs projected for builtin algorithms that
+    # are kept in engine for reuse, set to 0 to disable the cache.
+    projection_cache_size = 4
+
+    # whether to ship the homogeneous batch of modifications in typed columnar
+    # layout rather than json.
+    columnar_modification = True
+
+    # flush the pending modifications to engine once the number or the estimated
+    # bytes of them reaches the bound, rather than waiting for the next read,
+    # set to 0 to disable the bound.
+    max_pending_items = 1000000
+    max_pending_bytes = 64 * 1024 * 1024
+
+    # whether to apply the bounded flushes in a background thread, pipelined
+    # with the following modifications. Reads of the graph wait for them.
+    background_flush = False
+
     @patch_docstring(RefGraph.to_directed_class)
     def to_directed_class(self):
         return nx.DiGraph
@@ -332,6 +365,16 @@ class Graph(_GraphBase):
         self._remove_node_cache = []
         self._remove_edge_cache = []
 
+        # the number and estimated bytes of the pending modifications
+        self._pending_items = 0
+        self._pending_bytes = 0
+        self._flusher = ModificationFlusher(self)
+
+        # increased once the graph in engine is modified
+        self._version = 0
+        self._adj_cache = AdjCache(self, self.adj_cache_size)
+        self._projection_cache = ProjectionCache(self, self.projection_cache_size)
+
         create_empty_in_engine = attr.pop(
             "create_empty_in_engine", True
         )  # a hidden parameter
@@ -388,6 +431,8 @@ class Graph(_GraphBase):
     @property
     def op(self):
         """The DAG op of this graph."""
+        # the ops of in-flight batches are handed back once they are applied
+        self._flusher.wait()
         return self._op
 
     @property
@@ -626,9 +671,9 @@ class Graph(_GraphBase):
         """
         self._convert_arrow_to_dynamic()
         self._schema.add_nx_vertex_properties(attr)
-        self._add_node_cache.append(
-            (node_for_adding, attr) if attr else node_for_adding
-        )
+        item = (node_for_adding, attr) if attr else node_for_adding
+        self._add_node_cache.append(item)
+        self._add_pending(item)
 
     @clear_cache
     def add_nodes_from(self, nodes_for_adding, **attr):
@@ -641,6 +686,14 @@ class Graph(_GraphBase):
             OR
             A container of (node, attribute dict) tuples.
             Node attributes are updated using the attribute dict.
+            OR
+            A 1-d numpy array of nodes, or a pandas dataframe or pyarrow
+            table, which is shipped to engine in batch.
+        node : str, optional (default="id")
+            The column of nodes in the dataframe or table.
+        node_attr : str, list of str or True, optional (default=None)
+            The columns of node attributes in the dataframe or table,
+            True for all the other columns.
         attr : keyword arguments, optional (default= no attributes)
             Update attributes for all nodes in nodes.
             Node attributes specified in nodes as a tuple take
@@ -674,7 +727,21 @@ class Graph(_GraphBase):
         >>> H.nodes[1]["size"]
         11
 
+        Add nodes and their attributes from the columns of a dataframe.
+
+        >>> df = pd.DataFrame({"id": [5, 6], "size": [1, 2]})
+        >>> G.add_nodes_from(df, node="id", node_attr=["size"])
+
         """
+        if isinstance(nodes_for_adding, (pd.DataFrame, pa.Table)):
+            keys = [attr.pop("node", "id")]
+            columns = columns_of(nodes_for_adding, keys, attr.pop("node_attr", None))
+        else:
+            columns = columns_of(nodes_for_adding, ["id"])
+        if columns is not None:
+            if self._add_columns(types_pb2.NX_ADD_NODES, *columns, attr):
+                return
+            nodes_for_adding = rows_of(*columns)
         for n in nodes_for_adding:
             data = dict(attr)
             try:
@@ -717,6 +784,7 @@ class Graph(_GraphBase):
         """
         self._convert_arrow_to_dynamic()
         self._remove_node_cache.append(n)
+        self._add_pending(n)
 
     @clear_cache
     def remove_nodes_from(self, nodes_for_removing):
@@ -921,9 +989,9 @@ class Graph(_GraphBase):
         """
         self._convert_arrow_to_dynamic()
         self._schema.add_nx_edge_properties(attr)
-        self._add_edge_cache.append(
-            (u_of_edge, v_of_edge, attr) if attr else (u_of_edge, v_of_edge)
-        )
+        item = (u_of_edge, v_of_edge, attr) if attr else (u_of_edge, v_of_edge)
+        self._add_edge_cache.append(item)
+        self._add_pending(item)
 
     @clear_cache
     def add_edges_from(self, ebunch_to_add, **attr):
@@ -935,6 +1003,16 @@ class Graph(_GraphBase):
             Each edge given in the container will be added to the
             graph. The edges must be given as as 2-tuples (u, v) or
             3-tuples (u, v, d) where d is a dictionary containing edge data.
+            OR
+            A numpy array of shape (n, 2), or a pandas dataframe or pyarrow
+            table, which is shipped to engine in batch.
+        source : str, optional (default="source")
+            The column of source nodes in the dataframe or table.
+        target : str, optional (default="target")
+            The column of target nodes in the dataframe or table.
+        edge_attr : str, list of str or True, optional (default=None)
+            The columns of edge attributes in the dataframe or table,
+            True for all the other columns.
         attr : keyword arguments, optional
             Edge data can be assigned using
             keyword arguments.
@@ -963,7 +1041,21 @@ class Graph(_GraphBase):
 
         >>> G.add_edges_from([(1, 2), (2, 3)], weight=3)
         >>> G.add_edges_from([(3, 4), (1, 4)], label="WN2898")
+
+        Add edges and their data from the columns of a dataframe.
+
+        >>> df = pd.DataFrame({"src": [0, 1], "dst": [1, 2], "w": [0.5, 1.5]})
+        >>> G.add_edges_from(df, source="src", target="dst", edge_attr=["w"])
         """
+        if isinstance(ebunch_to_add, (pd.DataFrame, pa.Table)):
+            keys = [attr.pop("source", "source"), attr.pop("target", "target")]
+            columns = columns_of(ebunch_to_add, keys, attr.pop("edge_attr", None))
+        else:
+            columns = columns_of(ebunch_to_add, ["source", "target"])
+        if columns is not None:
+            if self._add_columns(types_pb2.NX_ADD_EDGES, *columns, attr):
+                return
+            ebunch_to_add = rows_of(*columns)
         for e in ebunch_to_add:
             ne = len(e)
             data = dict(attr)
@@ -1019,6 +1111,7 @@ class Graph(_GraphBase):
     def remove_edge(self, u, v):
         self._convert_arrow_to_dynamic()
         self._remove_edge_cache.append((u, v))
+        self._add_pending((u, v))
 
     @clear_cache
     def remove_edges_from(self, ebunch):
@@ -1088,6 +1181,7 @@ class Graph(_GraphBase):
         self._schema.add_nx_edge_properties(data)
         self._op = dag_utils.modify_edges(self, types_pb2.NX_UPDATE_EDGES, edge)
         self._op.eval()
+        self._version += 1
 
     @clear_cache
     def set_node_data(self, n, data):
@@ -1123,6 +1217,7 @@ class Graph(_GraphBase):
         node = json.dumps(((n, data),))
         self._op = dag_utils.modify_vertices(self, types_pb2.NX_UPDATE_NODES, node)
         self._op.eval()
+        self._version += 1
 
     @clear_cache
     def update(self, edges=None, nodes=None):
@@ -1516,6 +1611,108 @@ class Graph(_GraphBase):
         """
         return DegreeView(self)
 
+    @clear_cache
+    def to_arrow_nodes(self, attrs=None):
+        """Export the nodes and node attributes of the graph as a columnar table.
+
+        The whole table is transferred in binary, which is much faster than
+        iterating `G.nodes(data=True)` for large graphs.
+
+        Parameters
+        ----------
+        attrs : list of str, optional (default= all node attributes)
+            The node attributes to export.
+
+        Returns
+        -------
+        table : pyarrow.Table
+            A table with an `id` column of nodes, followed by a column for each
+            attribute. The column of an attribute holds `None` for nodes without
+            the attribute.
+
+        Examples
+        --------
+        >>> G = nx.path_graph(3)
+        >>> G.add_node(0, weight=1.0)
+        >>> G.to_arrow_nodes().to_pandas()
+           id  weight
+        0   0     1.0
+        1   1     NaN
+        2   2     NaN
+        """
+        if attrs is None:
+            attrs = [
+                p.name
+                for p in self._schema.get_vertex_properties(
+                    self._schema.vertex_labels[0]
+                )
+            ]
+        return self._report_table(types_pb2.NODES_TO_DATAFRAME, attrs=attrs)
+
+    @clear_cache
+    def to_arrow_edges(self, attrs=None):
+        """Export the edges and edge attributes of the graph as a columnar table.
+
+        Parameters
+        ----------
+        attrs : list of str, optional (default= all edge attributes)
+            The edge attributes to export.
+
+        Returns
+        -------
+        table : pyarrow.Table
+            A table with `source` and `target` columns of edges, followed by a
+            column for each attribute. Each edge of undirected graph appears once.
+
+        Examples
+        --------
+        >>> G = nx.Graph()
+        >>> G.add_edge(0, 1, weight=3)
+        >>> G.to_arrow_edges(attrs=["weight"]).to_pydict()
+        {'source': [0], 'target': [1], 'weight': [3]}
+        """
+        if attrs is None:
+            attrs = [
+                p.name
+                for p in self._schema.get_edge_properties(self._schema.edge_labels[0])
+            ]
+        return self._report_table(types_pb2.EDGES_TO_DATAFRAME, attrs=attrs)
+
+    @clear_cache
+    def degree_array(self, weight=None):
+        """Returns the degrees of all nodes as an array.
+
+        Parameters
+        ----------
+        weight : string or None, optional (default=None)
+           The edge attribute that holds the numerical value used as a weight.
+           If None, then each edge has weight 1.
+
+        Returns
+        -------
+        degrees : numpy.ndarray
+            The degrees of nodes, in the same order as the nodes in
+            :meth:`to_arrow_nodes`.
+
+        Examples
+        --------
+        >>> G = nx.path_graph(4)
+        >>> G.degree_array()
+        array([1, 2, 2, 1])
+        """
+        return self._degree_array(weight, types_pb2.DEG_TO_DATAFRAME)
+
+    def _degree_array(self, weight, report_type):
+        table = self._report_table(report_type, key=weight)
+        return table.column("degree").to_numpy()
+
+    def _report_table(self, report_type, **kwargs):
+        if self._is_view() and self._is_client_view:
+            raise NetworkXError("Columnar export is not supported on graph views.")
+        self._convert_arrow_to_dynamic()
+        op = dag_utils.report_graph(self, report_type, **kwargs)
+        return op.eval()
+
     def clear(self):
         """Remove all nodes and edges from the graph.
 
@@ -1531,6 +1728,7 @@ class Graph(_GraphBase):
         []
 
         """
+        self._flusher.wait()
         if self._graph_type == graph_def_pb2.ARROW_PROPERTY:
             # create an empty graph, no need to convert arrow to dynamic
             self._graph_type = graph_def_pb2.DYNAMIC_PROPERTY
@@ -1548,6 +1746,8 @@ class Graph(_GraphBase):
         self._add_edge_cache.clear()
         self._remove_node_cache.clear()
         self._remove_edge_cache.clear()
+        self._pending_items = self._pending_bytes = 0
+        self._version += 1
         self.schema.init_nx_schema()
 
     @clear_cache
@@ -1566,6 +1766,7 @@ class Graph(_GraphBase):
         self._convert_arrow_to_dynamic()
         self._op = dag_utils.clear_edges(self)
         self._op.eval()
+        self._version += 1
 
     @patch_docstring(RefGraph.is_directed)
     def is_directed(self):
@@ -1662,7 +1863,7 @@ class Graph(_GraphBase):
         if as_view:
             g = generic_graph_view(self)
             g._is_client_view = True
-            g._op = self._op
+            g._op = self.op
         else:
             self._convert_arrow_to_dynamic()
             g = self.__class__(create_empty_in_engine=False)
@@ -1967,6 +2168,7 @@ class Graph(_GraphBase):
         op = dag_utils.report_graph(self, report_type, node=json.dumps(n))
         return op.eval()
 
+    @parse_ret_as_dict
     def _batch_get_nbrs(self, location, report_type=types_pb2.SUCCS_BY_LOC):
         """Get neighbors of nodes by location in batch.
 
@@ -1996,7 +2198,7 @@ class Graph(_GraphBase):
         >>> g.add_edges_from([(0, 1), (0, 2)])
         >>> g._batch_get_nbrs((0, 0))  # start from frag-0, lid-0
         {'status': True, 'next': [1, 0],
-        'batch': [{'node': 0, 'nbrs': {'1': {}, '2': {}}}], [{'node': 1 .....}]}
+        'batch': [{'node': 0, 'nbrs': [[1, 2], [{}, {}]]}, {'node': 1 .....}]}
         """
         op = dag_utils.report_graph(self, report_type, fid=location[0], lid=location[1])
         return op.eval()
@@ -2087,7 +2289,8 @@ class Graph(_GraphBase):
 
         Notes
         -------
-            the method is implicit called in builtin apps.
+            the method is implicit called in builtin apps, the projection is
+            cached and reused until the graph is modified.
         """
         if hasattr(self, "_graph") and self._is_client_view:
             # is a graph view, project the original graph(just for copy)
@@ -2096,6 +2299,14 @@ class Graph(_GraphBase):
                 graph = graph._graph
             return graph._project_to_simple(v_prop=v_prop, e_prop=e_prop)
 
+        graph = self._projection_cache.get(v_prop, e_prop)
+        if graph is None:
+            graph = self._do_project_to_simple(v_prop, e_prop)
+            self._projection_cache.put(v_prop, e_prop, graph)
+        return graph
+
+    def _do_project_to_simple(self, v_prop, e_prop):
+        """Create a projected simple graph in engine, see `_project_to_simple`."""
         if v_prop is None:
             v_prop = str(v_prop)
             v_prop_id = -1
@@ -2191,46 +2402,136 @@ class Graph(_GraphBase):
         self._graph_type = graph_def_pb2.ARROW_PROPERTY
 
     def _clear_adding_cache(self):
+        self._flusher.wait()
         if self._add_node_cache:
-            nodes_to_modify = json.dumps(
-                self._add_node_cache, option=json.OPT_SERIALIZE_NUMPY
+            self._op = self._modify_in_engine(
+                types_pb2.NX_ADD_NODES, self._add_node_cache
             )
-            self._op = dag_utils.modify_vertices(
-                self, types_pb2.NX_ADD_NODES, nodes_to_modify
-            )
-            self._op.eval()
             self._add_node_cache.clear()
+            self._version += 1
 
         if self._add_edge_cache:
-            edges_to_modify = json.dumps(
-                self._add_edge_cache, option=json.OPT_SERIALIZE_NUMPY
-            )
-            self._op = dag_utils.modify_edges(
-                self, types_pb2.NX_ADD_EDGES, edges_to_modify
+            self._op = self._modify_in_engine(
+                types_pb2.NX_ADD_EDGES, self._add_edge_cache
             )
-            self._op.eval()
             self._add_edge_cache.clear()
+            self._version += 1
+        self._pending_items = self._pending_bytes = 0
 
     def _clear_removing_cache(self):
-        if self._remove_node_cache:
-            nodes_to_modify = json.dumps(
-                self._remove_node_cache, option=json.OPT_SERIALIZE_NUMPY
+        if (
+            not self._remove_node_cache
+            and not self._remove_edge_cache
+            and not self._flusher.in_flight(
+                types_pb2.NX_DEL_NODES, types_pb2.NX_DEL_EDGES
             )
-            self._op = dag_utils.modify_vertices(
-                self, types_pb2.NX_DEL_NODES, nodes_to_modify
+        ):
+            # no need to wait for the in-flight batches of additions
+            return
+        self._flusher.wait()
+        if self._remove_node_cache:
+            self._op = self._modify_in_engine(
+                types_pb2.NX_DEL_NODES, self._remove_node_cache
             )
-            self._op.eval()
             self._remove_node_cache.clear()
+            self._version += 1
 
         if self._remove_edge_cache:
-            edges_to_modify = json.dumps(
-                self._remove_edge_cache, option=json.OPT_SERIALIZE_NUMPY
+            self._op = self._modify_in_engine(
+                types_pb2.NX_DEL_EDGES, self._remove_edge_cache
             )
-            self._op = dag_utils.modify_edges(
-                self, types_pb2.NX_DEL_EDGES, edges_to_modify
-            )
-            self._op.eval()
             self._remove_edge_cache.clear()
+            self._version += 1
+        self._pending_items = self._pending_bytes = 0
+
+    def _add_columns(self, modify_type, ids, attrs, common_attr):
+        """Add the nodes or edges in columns to the graph in engine in one op.
+
+        Returns:
+            bool: False if any of the columns is heterogeneous, and the nodes or
+            edges have to be added one by one.
+        """
+        if not self.columnar_modification:
+            return False
+        buffer = encode_columns(ids, attrs)
+        if buffer is None:
+            return False
+        if len(ids[0]) == 0:
+            return True
+        self._convert_arrow_to_dynamic()
+        # infer the schema once per column
+        properties = dict(common_attr)
+        properties.update((k, v[:1].tolist()[0]) for k, v in attrs.items())
+        if modify_type == types_pb2.NX_ADD_EDGES:
+            self._schema.add_nx_edge_properties(properties)
+            modify = dag_utils.modify_edges
+        else:
+            self._schema.add_nx_vertex_properties(properties)
+            modify = dag_utils.modify_vertices
+        # keep the order with the pending ones
+        self._clear_adding_cache()
+        self._op = modify(self, modify_type, buffer, attr=common_attr, columnar=True)
+        self._op.eval()
+        self._version += 1
+        return True
+
+    def _add_pending(self, item):
+        """Account the newly cached modification, and flush the pending ones
+        once they reach `max_pending_items` or `max_pending_bytes`.
+
+        Notes
+        -------
+            The pending additions and removals never coexist, as the
+            modification methods flush the opposite ones first.
+        """
+        self._pending_items += 1
+        if self.max_pending_bytes > 0:
+            self._pending_bytes += estimate_size(item)
+        if (0 < self.max_pending_items <= self._pending_items) or (
+            0 < self.max_pending_bytes <= self._pending_bytes
+        ):
+            self._flush_pending()
+
+    def _flush_pending(self):
+        if not self.background_flush:
+            self._clear_removing_cache()
+            self._clear_adding_cache()
+            return
+        for modify_type, name in (
+            (types_pb2.NX_DEL_NODES, "_remove_node_cache"),
+            (types_pb2.NX_DEL_EDGES, "_remove_edge_cache"),
+            (types_pb2.NX_ADD_NODES, "_add_node_cache"),
+            (types_pb2.NX_ADD_EDGES, "_add_edge_cache"),
+        ):
+            items = getattr(self, name)
+            if items:
+                # hand over the batch and start a new one
+                setattr(self, name, [])
+                self._flusher.submit(modify_type, items)
+                self._version += 1
+        self._pending_items = self._pending_bytes = 0
+
+    def _modify_in_engine(self, modify_type, items):
+        """Apply the cached nodes or edges modification to the graph in engine.
+
+        The batch is shipped in typed columnar layout if the ids and attributes
+        are homogeneous, otherwise in json.
+
+        Returns:
+            The op that applies the batch, which is assigned to the graph by the
+            caller, as it may run in the thread of :class:`ModificationFlusher`.
+        """
+        if modify_type in (types_pb2.NX_ADD_EDGES, types_pb2.NX_DEL_EDGES):
+            modify, encode = dag_utils.modify_edges, encode_edges
+        else:
+            modify, encode = dag_utils.modify_vertices, encode_nodes
+        buffer = encode(items) if self.columnar_modification else None
+        columnar = buffer is not None
+        if not columnar:
+            buffer = json.dumps(items, option=json.OPT_SERIALIZE_NUMPY)
+        op = modify(self, modify_type, buffer, columnar=columnar)
+        op.eval()
+        return op
 
     def _convert_arrow_to_dynamic(self):
         """Try to convert the hosted graph from arrow_property to dynamic_property.
@@ -2247,6 +2548,7 @@ class Graph(_GraphBase):
             schema.init_nx_schema(self._schema)
             self._schema = schema
             self._graph_type = graph_def_pb2.DYNAMIC_PROPERTY
+            self._version += 1
 
     def _convert_to_label_id_tuple(self, n):
         """Convert the node to (label_id, id) format.
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+
+import networkx as nxa
+import pytest
+
+from graphscope import nx
+from graphscope.nx.classes import cache
+from graphscope.nx.classes.cache import AdjCache
+from graphscope.nx.classes.cache import ModificationFlusher
+from graphscope.nx.classes.cache import ProjectionCache
+from graphscope.nx.classes.dicts import AdjInnerDict
+from graphscope.proto import graph_def_pb2
+from graphscope.proto import types_pb2
+
+
+class _FakeGraph(object):
+    """Serve the adjacency of a networkx graph in the way of nx.Graph."""
+
+    graph_type = graph_def_pb2.DYNAMIC_PROPERTY
+
+    def __init__(self, g, batch_size=3):
+        self._g = g
+        self._version = 0
+        self._batch_size = batch_size
+        self.nbrs_calls = 0
+        self.batch_calls = 0
+
+    def _clear_removing_cache(self):
+        pass
+
+    def _clear_adding_cache(self):
+        pass
+
+    def is_directed(self):
+        return False
+
+    def number_of_nodes(self):
+        return self._g.number_of_nodes()
+
+    def number_of_edges(self):
+        return self._g.number_of_edges()
+
+    def _get_nbrs(self, n, report_type=types_pb2.SUCCS_BY_NODE):
+        self.nbrs_calls += 1
+        if n not in self._g:
+            raise nx.NetworkXError("The node %s is not in the graph." % (n,))
+        return dict(self._g[n])
+
+    def _batch_get_nbrs(self, location, report_type=types_pb2.SUCCS_BY_LOC):
+        self.batch_calls += 1
+        nodes = list(self._g)[location[1] : location[1] + self._batch_size]
+        batch = []
+        for n in nodes:
+            nbrs = self._g[n]
+            batch.append({"node": n, "nbrs": [list(nbrs), list(nbrs.values())]})
+        return {"status": True, "next": [0, location[1] + len(nodes)], "batch": batch}
+
+
+def test_adj_cache_prefetch():
+    g = _FakeGraph(nxa.path_graph(10))
+    cache = AdjCache(g, 1000)
+    assert cache.get(0, types_pb2.SUCCS_BY_NODE) == {1: {}}
+    assert g.batch_calls == 4
+    for n in range(10):
+        assert cache.get(n, types_pb2.SUCCS_BY_NODE) == g._g[n]
+    with pytest.raises(KeyError):
+        cache.get(10, types_pb2.SUCCS_BY_NODE)
+    assert g.batch_calls == 4
+    assert g.nbrs_calls == 0
+
+    # modifications drop the whole cache
+    g._g.add_edge(0, 10)
+    g._version += 1
+    assert cache.get(10, types_pb2.SUCCS_BY_NODE) == {0: {}}
+    assert g.batch_calls == 8
+
+
+def test_adj_cache_lru():
+    g = _FakeGraph(nxa.path_graph(10))
+    # too small to prefetch, each node takes 1 + the number of neighbors
+    cache = AdjCache(g, 6)
+    for n in (1, 2, 1):
+        assert cache.get(n, types_pb2.SUCCS_BY_NODE) == g._g[n]
+    assert g.batch_calls == 0
+    assert g.nbrs_calls == 2
+    # evict node 2, the least recently used one
+    cache.get(3, types_pb2.SUCCS_BY_NODE)
+    cache.get(1, types_pb2.SUCCS_BY_NODE)
+    assert g.nbrs_calls == 3
+    cache.get(2, types_pb2.SUCCS_BY_NODE)
+    assert g.nbrs_calls == 4
+    with pytest.raises(KeyError):
+        cache.get(10, types_pb2.SUCCS_BY_NODE)
+
+    # disable the cache
+    cache.maxsize = 0
+    cache.get(1, types_pb2.SUCCS_BY_NODE)
+    cache.get(1, types_pb2.SUCCS_BY_NODE)
+    assert g.nbrs_calls == 7
+
+
+def test_copy_of_cached_adjacency():
+    g = _FakeGraph(nxa.path_graph(3))
+    g._g.add_edge(0, 1, w=1)
+    g._adj_cache = AdjCache(g, 1000)
+    nbrs = AdjInnerDict(g, 0, types_pb2.SUCCS_BY_NODE)
+    # the copies don't share the dicts of the cache
+    d = nbrs.copy()
+    del d[1]
+    nbrs[1].copy()["w"] = 2
+    nbrs.copy()[1]["w"] = 3
+    assert g._adj_cache.get(0, types_pb2.SUCCS_BY_NODE) == {1: {"w": 1}}
+
+
+class _FakeModifiedGraph(object):
+    def __init__(self, fail_on=None):
+        self.applied = []
+        self.threads = set()
+        self._fail_on = fail_on
+        self._op = None
+
+    def _modify_in_engine(self, modify_type, items):
+        time.sleep(0.01)
+        self.threads.add(threading.current_thread().name)
+        if items == self._fail_on:
+            raise RuntimeError("failed to apply %s" % items)
+        self.applied.append((modify_type, items))
+        return "op%d" % len(self.applied)
+
+
+def test_modification_flusher():
+    g = _FakeModifiedGraph()
+    flusher = ModificationFlusher(g, depth=2)
+    batches = [[i, i + 1] for i in range(5)]
+    for batch in batches:
+        flusher.submit(types_pb2.NX_ADD_NODES, batch)
+        assert len(flusher) <= 2
+    assert flusher.in_flight(types_pb2.NX_ADD_NODES)
+    assert not flusher.in_flight(types_pb2.NX_DEL_NODES, types_pb2.NX_DEL_EDGES)
+    flusher.wait()
+    assert len(flusher) == 0
+    # the op of the last batch is handed back
+    assert g._op == "op5"
+    assert g.applied == [(types_pb2.NX_ADD_NODES, batch) for batch in batches]
+    assert threading.current_thread().name not in g.threads
+
+    g = _FakeModifiedGraph(fail_on=[1])
+    flusher = ModificationFlusher(g)
+    flusher.submit(types_pb2.NX_ADD_NODES, [0])
+    flusher.submit(types_pb2.NX_ADD_NODES, [1])
+    with pytest.raises(RuntimeError, match="failed to apply"):
+        flusher.wait()
+    assert g.applied == [(types_pb2.NX_ADD_NODES, [0])]
+
+
+def test_projection_cache(monkeypatch):
+    unloaded = []
+
+    class _UnloadOp(object):
+        def __init__(self, graph):
+            self._graph = graph
+
+        def eval(self):
+            unloaded.append(self._graph)
+
+    monkeypatch.setattr(cache.dag_utils, "unload_graph", _UnloadOp)
+    g = _FakeGraph(nxa.path_graph(3))
+    projections = ProjectionCache(g, 2)
+    assert projections.get(None, "weight") is None
+    projections.put(None, "weight", "p0")
+    projections.put("attr", None, "p1")
+    assert projections.get(None, "weight") == "p0"
+    # evict the least recently used one
+    projections.put(None, None, "p2")
+    assert unloaded == ["p1"]
+    assert projections.get("attr", None) is None
+    assert projections.get(None, "weight") == "p0"
+
+    # modifications drop all projections
+    g._version += 1
+    assert projections.get(None, "weight") is None
+    assert sorted(unloaded) == ["p0", "p1", "p2"]
+    assert len(projections) == 0
+
+    projections.maxsize = 0
+    projections.put(None, None, "p3")
+    assert projections.get(None, None) is None
+
+
+@pytest.mark.usefixtures("graphscope_session")
+class TestAdjCache:
+    def test_cached_adjacency(self):
+        G = nx.Graph(nxa.path_graph(10))
+        H = nxa.path_graph(10)
+        assert dict(G.adj) == dict(H.adj)
+        assert nx.shortest_path(G, 0, 9) == list(range(10))
+
+        G.add_edge(0, 9, weight=1)
+        assert G[0] == {1: {}, 9: {"weight": 1}}
+        G[0][9]["weight"] = 2
+        assert G[9][0] == {"weight": 2}
+        G.remove_node(5)
+        assert 5 not in G[4]
+        with pytest.raises(KeyError):
+            G.adj[5]
+
+    def test_cached_pred(self):
+        G = nx.DiGraph([(0, 1), (1, 2), (0, 2)])
+        assert dict(G.pred[2]) == {0: {}, 1: {}}
+        assert dict(G.succ[0]) == {1: {}, 2: {}}
+        G.add_edge(3, 2)
+        assert dict(G.pred[2]) == {0: {}, 1: {}, 3: {}}
+
+    def test_cache_disabled(self):
+        G = nx.Graph(nxa.path_graph(5))
+        G._adj_cache.maxsize = 0
+        assert dict(G.adj) == dict(nxa.path_graph(5).adj)
+
+
+@pytest.mark.usefixtures("graphscope_session")
+class TestBoundedFlush:
+    @pytest.mark.parametrize("background", [False, True])
+    def test_bounded_flush(self, background):
+        G = nx.Graph()
+        G.max_pending_items = 100
+        G.background_flush = background
+        G.add_edges_from((i, i + 1, {"weight": i}) for i in range(1000))
+        assert len(G._add_edge_cache) < 100
+        G.remove_edges_from((i, i + 1) for i in range(0, 1000, 2))
+        assert len(G._remove_edge_cache) < 100
+        assert G.number_of_nodes() == 1001
+        assert G.number_of_edges() == 500
+        assert G[1][2] == {"weight": 1}
+
+    def test_flush_by_bytes(self):
+        G = nx.Graph()
+        G.max_pending_bytes = 1024
+        G.add_nodes_from(str(i) * 100 for i in range(100))
+        assert len(G._add_node_cache) < 10
+        assert G.number_of_nodes() == 100
+
+
+@pytest.mark.usefixtures("graphscope_session")
+class TestProjectionCache:
+    def test_reuse_projection(self):
+        G = nx.Graph(nxa.path_graph(10))
+        G.add_edge(0, 1, weight=1.0)
+        nx.builtin.pagerank(G)
+        projected = G._project_to_simple()
+        nx.builtin.degree_centrality(G)
+        assert G._project_to_simple() is projected
+        assert len(G._projection_cache) == 1
+        weighted = G._project_to_simple(e_prop="weight")
+        assert G._project_to_simple(e_prop="weight") is weighted
+        assert len(G._projection_cache) == 2
+
+        G.add_edge(0, 9)
+        assert G._project_to_simple() is not projected
+        assert len(G._projection_cache) == 1
+        assert nx.builtin.degree_centrality(G)[0] == 2 / 9
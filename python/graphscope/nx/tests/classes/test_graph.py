@@ -17,6 +17,9 @@
 import os
 
 import networkx as nxa
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pytest
 from networkx.classes.tests.test_graph import TestEdgeSubgraph as _TestEdgeSubgraph
 from networkx.classes.tests.test_graph import TestGraph as _TestGraph
@@ -375,6 +378,84 @@ class TestGraph(_TestGraph):
         pytest.raises(nx.NetworkXError, H2.add_edge, 1, 2)
         H.add_edge(1, 2)
 
+    def test_to_arrow(self):
+        G = self.Graph()
+        G.add_edge(0, 1, weight=2.0)
+        G.add_edge(1, 2)
+        G.add_node(3, color="red")
+        nodes = G.to_arrow_nodes().to_pydict()
+        assert sorted(nodes["id"]) == [0, 1, 2, 3]
+        assert dict(zip(nodes["id"], nodes["color"]))[3] == "red"
+        assert G.to_arrow_nodes(attrs=[]).column_names == ["id"]
+
+        edges = G.to_arrow_edges(attrs=["weight"]).to_pydict()
+        assert len(edges["source"]) == G.number_of_edges()
+        weights = {}
+        for u, v, w in zip(edges["source"], edges["target"], edges["weight"]):
+            weights[(u, v) if G.is_directed() else frozenset((u, v))] = w
+        if G.is_directed():
+            assert weights == {(0, 1): 2.0, (1, 2): None}
+        else:
+            assert weights == {frozenset((0, 1)): 2.0, frozenset((1, 2)): None}
+
+        degrees = dict(zip(nodes["id"], G.degree_array()))
+        assert degrees == dict(G.degree)
+        degrees = dict(zip(nodes["id"], G.degree_array(weight="weight")))
+        assert degrees == dict(G.degree(weight="weight"))
+        if G.is_directed():
+            assert dict(zip(nodes["id"], G.in_degree_array())) == dict(G.in_degree)
+            assert dict(zip(nodes["id"], G.out_degree_array())) == dict(G.out_degree)
+
+    def test_add_from_dataframe(self):
+        df = pd.DataFrame(
+            {"src": [0, 1, 2], "dst": [1, 2, 0], "w": [0.5, 1.5, 2.5], "l": list("abc")}
+        )
+        for data in (df, pa.Table.from_pandas(df)):
+            G = self.Graph()
+            G.add_edge(0, 1, w=0.0, c=1)
+            G.add_edges_from(data, source="src", target="dst", edge_attr=["w"], c=2)
+            assert G.number_of_edges() == 3
+            assert G[0][1] == {"w": 0.5, "c": 2}
+            assert G[1][2] == {"w": 1.5, "c": 2}
+            G.add_edges_from(data, source="src", target="dst", edge_attr=True)
+            assert G[2][0] == {"w": 2.5, "l": "c", "c": 2}
+
+            G.add_nodes_from(data, node="src", node_attr="l")
+            assert G.nodes[1] == {"l": "b"}
+            G.add_nodes_from(np.array([3, 4]), color="red")
+            assert G.nodes[4] == {"color": "red"}
+        G = self.Graph()
+        G.add_edges_from(np.array([[0, 1], [1, 2]]))
+        assert sorted(G.edges) == [(0, 1), (1, 2)]
+        # heterogeneous columns are added one by one
+        G.add_edges_from(pd.DataFrame({"source": [2, "a"], "target": [3, 4]}))
+        assert G.has_edge(2, 3) and G.has_edge("a", 4)
+
+    def test_columnar_modification(self):
+        def modify(G):
+            G.add_edges_from([(i, i + 1, {"weight": i * 0.5}) for i in range(10)])
+            G.add_nodes_from(["a", "b"], color="red")
+            assert G.number_of_nodes() == 13
+            # heterogeneous attributes fall back to json
+            G.add_edges_from([("a", "b", {"weight": "x"}), ("b", 0, {"weight": 1})])
+            assert G.number_of_edges() == 12
+            G.remove_edges_from([(0, 1), (1, 2)])
+            G.remove_nodes_from([9, 10])
+
+        G = self.Graph()
+        modify(G)
+        H = self.Graph()
+        H.columnar_modification = False
+        modify(H)
+        assert sorted(G.nodes(data=True), key=str) == sorted(
+            H.nodes(data=True), key=str
+        )
+        assert sorted(G.edges(data=True), key=str) == sorted(
+            H.edges(data=True), key=str
+        )
+        assert G[2][3] == {"weight": 1.0}
+        assert G["a"]["b"] == {"weight": "x"}
+
 
 @pytest.mark.usefixtures("graphscope_session")
 class TestEdgeSubgraph(_TestEdgeSubgraph):
@@ -19,13 +19,22 @@
 
 import os
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pytest
 
 import graphscope
 from graphscope import nx
+from graphscope.framework.utils import decode_dataframe
 from graphscope.nx.tests.utils import assert_edges_equal
 from graphscope.nx.tests.utils import assert_graphs_equal
 from graphscope.nx.tests.utils import assert_nodes_equal
+from graphscope.nx.utils.misc import columns_of
+from graphscope.nx.utils.misc import encode_columns
+from graphscope.nx.utils.misc import encode_edges
+from graphscope.nx.utils.misc import encode_nodes
+from graphscope.nx.utils.misc import rows_of
 
 # thanks to numpy for this GenericTest class (numpy/testing/test_utils.py)
 
@@ -190,3 +199,72 @@ class TestGraphsEqual(_GenericTest):
         nx.add_path(H, range(4))
         H.name = "path_graph(4)"
         self._test_not_equal(G, H)
+
+
+def test_encode_modifications():
+    df = decode_dataframe(encode_nodes([1, np.int64(2), 3]))
+    assert list(df.columns) == ["id0"]
+    assert df["id0"].tolist() == [1, 2, 3]
+    df = decode_dataframe(encode_nodes([("a", {"w": 1.0}), ("中", {"w": 2.0})]))
+    assert df["id0"].tolist() == ["a", "中"]
+    assert df["w"].tolist() == [1.0, 2.0]
+    assert df["w"].dtype == np.float64
+
+    df = decode_dataframe(encode_edges([(0, 1), (1, 2)]))
+    assert df.values.tolist() == [[0, 1], [1, 2]]
+    edges = [
+        (0, 1, {"weight": 0.5, "label": "x"}),
+        (1, 2, {"label": "", "weight": 1.5}),
+    ]
+    df = decode_dataframe(encode_edges(edges))
+    assert list(df.columns) == ["id0", "id1", "weight", "label"]
+    assert df["label"].tolist() == ["x", ""]
+    assert df["weight"].tolist() == [0.5, 1.5]
+
+    # heterogeneous batches fall back to json
+    assert encode_nodes([1, "a"]) is None
+    assert encode_nodes([(1, 2), (3, 4)]) is None
+    assert encode_nodes([True, False]) is None
+    assert encode_nodes([1 << 64]) is None
+    assert encode_nodes([(1, {"w": 1}), (2, {"c": 1})]) is None
+    assert encode_nodes([(1, {"w": 1}), (2, {"w": 1.0})]) is None
+    assert encode_edges([(0, 1), (1, 2, {"w": 1})]) is None
+    assert encode_edges([(0, 1, {"w": 1}), (1, 2, {"w": "x"})]) is None
+    assert encode_edges([(0, 1, {"w": [1]})]) is None
+    assert encode_edges([(0, 1, {1: 1})]) is None
+
+
+def test_encode_columns():
+    df = pd.DataFrame({"src": [0, 1], "dst": [1, 2], "w": [0.5, 1.5], "l": ["a", "b"]})
+    for data in (df, pa.Table.from_pandas(df)):
+        ids, attrs = columns_of(data, ["src", "dst"], True)
+        assert list(attrs) == ["w", "l"]
+        result = decode_dataframe(encode_columns(ids, attrs))
+        assert result.values.tolist() == df.values.tolist()
+        assert list(rows_of(ids, attrs)) == [
+            (0, 1, {"w": 0.5, "l": "a"}),
+            (1, 2, {"w": 1.5, "l": "b"}),
+        ]
+        ids, attrs = columns_of(data, ["src", "dst"], "w")
+        assert list(attrs) == ["w"]
+        assert columns_of(data, ["src", "dst"])[1] == {}
+        with pytest.raises(KeyError):
+            columns_of(data, ["source", "target"])
+
+    ids, attrs = columns_of(np.array([[0, 1], [1, 2]], dtype=np.uint32), ["u", "v"])
+    assert decode_dataframe(encode_columns(ids, attrs)).values.tolist() == [
+        [0, 1],
+        [1, 2],
+    ]
+    ids, attrs = columns_of(np.array(["a", "b"]), ["id"])
+    assert list(rows_of(ids, attrs)) == ["a", "b"]
+    assert columns_of([(0, 1)], ["u", "v"]) is None
+    assert columns_of(np.zeros((2, 3)), ["u", "v"]) is None
+
+    # heterogeneous columns, or nulls in arrow tables
+    ids, attrs = columns_of(pa.table({"id": [1, None, 3]}), ["id"])
+    assert encode_columns(ids, attrs) is None
+    assert list(rows_of(ids, attrs)) == [1, None, 3]
+    ids, attrs = columns_of(pd.DataFrame({"id": [1, "a"]}), ["id"])
+    assert encode_columns(ids, attrs) is None
+    assert encode_columns([np.array([True])], {}) is None
@@ -18,10 +18,15 @@
 
 
 import functools
+import itertools
 import json
+import operator
+import struct
 
 import networkx.utils.misc
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 
 from graphscope.client.session import get_session_by_id
 from graphscope.framework import dag_utils
@@ -29,6 +34,13 @@ from graphscope.nx.utils.compat import import_as_graphscope_nx
 
 import_as_graphscope_nx(networkx.utils.misc)
 
+# type ids of the columns in the dataframe layout of archive
+_int64_type_id = 4
+_double_type_id = 7
+_string_type_id = 8
+
+_pack_int64 = struct.Struct("q").pack
+
 
 def empty_graph_in_engine(graph, directed, distributed):
     """create empty graph in grape_engine with the graph metadata.
@@ -93,3 +105,182 @@ def clear_cache(func):
         return func(*args, **kwargs)
 
     return wrapper
+
+
+def _encode_column(name, values):
+    """Encode the column of a list or numpy array in the dataframe layout of
+    archive.
+
+    Returns:
+        bytes, or None if the values are not all int64, all float or all str.
+    """
+    if isinstance(values, np.ndarray):
+        kind = values.dtype.kind
+        if kind in "iu":
+            if kind == "u" and values.size and values.max() > np.iinfo(np.int64).max:
+                return None
+            type_id, data = _int64_type_id, values.astype(np.int64, copy=False)
+        elif kind == "f":
+            type_id, data = _double_type_id, values.astype(np.float64, copy=False)
+        elif kind in "UO":
+            return _encode_column(name, values.tolist())
+        else:
+            return None
+        data = data.tobytes()
+    else:
+        types = set(map(type, values))
+        if all(t is int or issubclass(t, np.integer) for t in types):
+            try:
+                type_id, data = _int64_type_id, np.array(values, dtype=np.int64)
+            except OverflowError:
+                return None
+            data = data.tobytes()
+        elif all(issubclass(t, (float, np.floating)) for t in types):
+            type_id = _double_type_id
+            data = np.array(values, dtype=np.float64).tobytes()
+        elif types == {str}:
+            type_id = _string_type_id
+            encoded = [v.encode("utf-8") for v in values]
+            lengths = map(_pack_int64, map(len, encoded))
+            data = b"".join(itertools.chain.from_iterable(zip(lengths, encoded)))
+        else:
+            return None
+    name = name.encode("utf-8")
+    return b"".join([_pack_int64(len(name)), name, struct.pack("i", type_id), data])
+
+
+def encode_columns(ids, attrs):
+    """Encode the columns of nodes or edges to modify in engine in columnar
+    layout.
+
+    Args:
+        ids (list): The id columns, i.e., [nodes] or [sources, targets].
+        attrs (dict): The attribute columns, keyed by attribute name.
+
+    Returns:
+        bytes, or None if any of the columns is heterogeneous.
+    """
+    if not all(isinstance(k, str) for k in attrs):
+        return None
+    columns = [("id%d" % i, c) for i, c in enumerate(ids)]
+    columns.extend(attrs.items())
+    buffers = [_pack_int64(len(columns)), _pack_int64(len(ids[0]))]
+    for name, values in columns:
+        buffer = _encode_column(name, values)
+        if buffer is None:
+            return None
+        buffers.append(buffer)
+    return b"".join(buffers)
+
+
+def _encode_rows(ids, attrs):
+    """Encode the id columns and attribute dicts of a batch in columnar layout.
+
+    Returns:
+        bytes, or None if the attribute dicts don't share the same keys or any
+        of the columns is heterogeneous.
+    """
+    if attrs and set(map(type, attrs)) != {dict}:
+        return None
+    keys = list(attrs[0]) if attrs else []
+    try:
+        columns = {k: [d[k] for d in attrs] for k in keys}
+    except (KeyError, TypeError):
+        return None
+    if keys and set(map(len, attrs)) != {len(keys)}:
+        return None
+    return encode_columns(ids, columns)
+
+
+def encode_nodes(nodes):
+    """Encode the nodes to modify in engine in columnar layout, each node
+    is either a node id or a tuple of (node id, attribute dict).
+
+    Returns:
+        bytes, or None if the nodes are heterogeneous and should fall back
+        to json.
+    """
+    if not nodes:
+        return None
+    with_attr = isinstance(nodes[0], tuple) and len(nodes[0]) == 2
+    if with_attr:
+        if set(map(type, nodes)) != {tuple} or set(map(len, nodes)) != {2}:
+            return None
+        ids = list(map(operator.itemgetter(0), nodes))
+        return _encode_rows([ids], list(map(operator.itemgetter(1), nodes)))
+    return _encode_rows([nodes], None)
+
+
+def encode_edges(edges):
+    """Encode the edges to modify in engine in columnar layout, each edge
+    is a tuple of (u, v) or (u, v, attribute dict).
+
+    Returns:
+        bytes, or None if the edges are heterogeneous and should fall back
+        to json.
+    """
+    if not edges:
+        return None
+    lengths = set(map(len, edges))
+    if lengths not in ({2}, {3}):
+        return None
+    columns = [list(map(operator.itemgetter(i), edges)) for i in range(len(edges[0]))]
+    return _encode_rows(columns[:2], columns[2] if len(columns) == 3 else None)
+
+
+def _column_to_numpy(column):
+    if isinstance(column, pa.ChunkedArray) and column.null_count:
+        # keep the nulls as None rather than NaN
+        return np.array(column.to_pylist(), dtype=object)
+    return column.to_numpy()
+
+
+def columns_of(data, keys, attr_keys=None):
+    """Extract the id columns and attribute columns from a numpy array, a
+    pandas dataframe or a pyarrow table.
+
+    Args:
+        data: A 1-d numpy array of nodes, a 2-d numpy array of edges, or
+            a dataframe / table.
+        keys (list): Names of the id columns in the dataframe / table.
+        attr_keys: Names of the attribute columns in the dataframe / table,
+            None for no attribute, or True for all the other columns.
+
+    Returns:
+        tuple: The list of id columns and the dict of attribute columns as numpy
+        arrays, or None if the data is not one of the above.
+    """
+    if isinstance(data, np.ndarray):
+        if len(keys) == 1 and data.ndim == 1:
+            return [data], {}
+        if data.ndim == 2 and data.shape[1] == len(keys):
+            return [data[:, i] for i in range(len(keys))], {}
+        return None
+    if isinstance(data, pd.DataFrame):
+        names = list(data.columns)
+    elif isinstance(data, pa.Table):
+        names = data.column_names
+    else:
+        return None
+    if attr_keys is True:
+        attr_keys = [n for n in names if n not in keys]
+    elif attr_keys is None:
+        attr_keys = []
+    elif isinstance(attr_keys, (str, int)):
+        attr_keys = [attr_keys]
+    for key in itertools.chain(keys, attr_keys):
+        if key not in names:
+            raise KeyError("Column %s is not in the data." % (key,))
+    ids = [_column_to_numpy(data[k]) for k in keys]
+    return ids, {k: _column_to_numpy(data[k]) for k in attr_keys}
+
+
+def rows_of(ids, attrs):
+    """Turn the columns returned by :func:`columns_of` back into nodes or
+    (node, attribute dict), or edges as (u, v) or (u, v, attribute dict).
+    """
+    ids = [c.tolist() for c in ids]
+    if attrs:
+        values = zip(*(c.tolist() for c in attrs.values()))
+        return zip(*ids, (dict(zip(attrs, v)) for v in values))
+    return ids[0] if len(ids) == 1 else zip(*ids)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from graphscope.framework import utils
+from graphscope.framework.dag import Dag
+from graphscope.framework.dag import optimize
+from graphscope.framework.operation import Operation
+from graphscope.proto import attr_value_pb2
+from graphscope.proto import types_pb2
+
+
+def _op(dag, op_type, inputs=None, output_types=types_pb2.GRAPH, **kwargs):
+    op = Operation("session", op_type, inputs, output_types, **kwargs)
+    dag.add_op(op)
+    return op
+
+
+def _loader(dag, *chunk_names, protocol="file"):
+    large_attr = attr_value_pb2.LargeAttrValue()
+    for name in chunk_names:
+        chunk = large_attr.chunk_list.items.add()
+        chunk.attr[types_pb2.CHUNK_NAME].CopyFrom(utils.s_to_attr(name))
+        chunk.attr[types_pb2.PROTOCOL].CopyFrom(utils.s_to_attr(protocol))
+        chunk.buffer = name.encode("utf-8")
+    return _op(
+        dag,
+        types_pb2.DATA_SOURCE,
+        output_types=types_pb2.NULL_OUTPUT,
+        large_attr=large_attr,
+    )
+
+
+def _to_numpy(dag, graph, selector):
+    return _op(
+        dag,
+        types_pb2.GRAPH_TO_NUMPY,
+        [graph],
+        types_pb2.TENSOR,
+        config={types_pb2.SELECTOR: utils.s_to_attr(selector)},
+    )
+
+
+def _optimize(dag, fetches):
+    return optimize(dag.extract_subdag_for(fetches))
+
+
+def test_eliminate_common_subexpressions():
+    dag = Dag()
+    g1 = _op(dag, types_pb2.CREATE_GRAPH, [_loader(dag, "vertex", "edge")])
+    g2 = _op(dag, types_pb2.CREATE_GRAPH, [_loader(dag, "vertex", "edge")])
+    a1, a2 = _to_numpy(dag, g1, "v.id"), _to_numpy(dag, g2, "v.id")
+    b = _to_numpy(dag, g2, "v.data")
+    dag_def, aliases = _optimize(dag, [a1, a2, b])
+    assert [op_def.op for op_def in dag_def.op] == [
+        types_pb2.DATA_SOURCE,
+        types_pb2.CREATE_GRAPH,
+        types_pb2.GRAPH_TO_NUMPY,
+        types_pb2.GRAPH_TO_NUMPY,
+    ]
+    # consumers are rewired to the remaining one
+    assert list(dag_def.op[3].parents) == [g1.key]
+    assert all(op_def.fetch for op_def in dag_def.op[2:])
+    assert aliases[a2.key] == a1.key
+    assert aliases[g2.key] == g1.key
+
+    # graphs that are fetched are different objects
+    dag_def, aliases = _optimize(dag, [g1, g2, b])
+    assert [op_def.key for op_def in dag_def.op if op_def.fetch] == [
+        g1.key,
+        g2.key,
+        b.key,
+    ]
+    assert list(dag_def.op[-1].parents) == [g2.key]
+    assert g2.key not in aliases
+
+
+def test_fuse_add_labels():
+    dag = Dag()
+    g = _op(dag, types_pb2.CREATE_GRAPH)
+    g1 = _op(dag, types_pb2.ADD_LABELS, [g, _loader(dag, "vertex")])
+    loader = _loader(dag, "edge")
+    g2 = _op(dag, types_pb2.ADD_LABELS, [g1, loader])
+    g3 = _op(dag, types_pb2.ADD_LABELS, [g2, _loader(dag, "vertex", "edge")])
+    dag_def, _ = _optimize(dag, [g3])
+    assert [op_def.op for op_def in dag_def.op] == [
+        types_pb2.CREATE_GRAPH,
+        types_pb2.DATA_SOURCE,
+        types_pb2.ADD_LABELS,
+    ]
+    assert dag_def.op[2].key == g3.key
+    assert list(dag_def.op[2].parents) == [g.key, dag_def.op[1].key]
+    chunks = dag_def.op[1].large_attr.chunk_list.items
+    assert [chunk.buffer for chunk in chunks] == [b"vertex"] * 2 + [b"edge"] * 2
+    # the ops in the dag are untouched
+    assert list(g2.parents) == [g1, loader]
+    assert len(loader.as_op_def().large_attr.chunk_list.items) == 1
+
+    # the intermediate graph is fetched as well
+    dag_def, _ = _optimize(dag, [g1, g3])
+    assert [
+        op_def.key for op_def in dag_def.op if op_def.op == types_pb2.ADD_LABELS
+    ] == [
+        g1.key,
+        g3.key,
+    ]
+    assert list(dag_def.op[-1].parents)[0] == g1.key
+
+    # the loaders that carry the data are not merged, to avoid copying it
+    g4 = _op(dag, types_pb2.ADD_LABELS, [g, _loader(dag, "vertex", protocol="pandas")])
+    g5 = _op(dag, types_pb2.ADD_LABELS, [g4, _loader(dag, "edge", protocol="pandas")])
+    dag_def, _ = _optimize(dag, [g5])
+    assert [
+        op_def.key for op_def in dag_def.op if op_def.op == types_pb2.ADD_LABELS
+    ] == [
+        g4.key,
+        g5.key,
+    ]
@@ -21,6 +21,9 @@ import os
 import pytest
 
 from graphscope.dataset import *
+from graphscope.dataset.snapshot import _engines_local
+from graphscope.dataset.snapshot import snapshot_key
+from graphscope.framework.loader import Loader
 
 
 @pytest.mark.skipif("FULL_TEST_SUITE" not in os.environ, reason="Run in nightly CI")
@@ -48,3 +51,56 @@ def test_download_dataset(graphscope_session):
     g10.unload()
     g11 = load_u2i(graphscope_session)
     g11.unload()
+
+
+def _specs_of(prefix, label, delimiter=","):
+    edges = [
+        {
+            "edges": Loader(os.path.join(prefix, "edge.csv"), delimiter=delimiter),
+            "label": label,
+            "src_label": "person",
+            "dst_label": "person",
+        }
+    ]
+    return ([], edges)
+
+
+def test_dataset_snapshot_key(tmp_path):
+    prefix = tmp_path / "dataset"
+    prefix.mkdir()
+    (prefix / "edge.csv").write_text("src,dst\n1,2\n")
+    snapshot_dir = str(tmp_path)
+    specs = _specs_of(str(prefix), "knows")
+
+    key = snapshot_key(str(prefix), specs, snapshot_dir)
+    assert key == snapshot_key(
+        str(prefix), _specs_of(str(prefix), "knows"), snapshot_dir
+    )
+    assert key != snapshot_key(str(prefix), specs, snapshot_dir, directed=False)
+    assert key != snapshot_key(str(prefix), specs, snapshot_dir, num_workers=2)
+    assert key != snapshot_key(
+        str(prefix), _specs_of(str(prefix), "likes"), snapshot_dir
+    )
+    # the options of loaders are a part of the key
+    assert key != snapshot_key(
+        str(prefix), _specs_of(str(prefix), "knows", "|"), snapshot_dir
+    )
+    (prefix / "edge.csv").write_text("src,dst\n1,3\n")
+    assert key != snapshot_key(str(prefix), specs, snapshot_dir)
+    # the hashes are written aside and moved into place
+    assert sorted(os.listdir(snapshot_dir)) == [
+        "dataset",
+        "hashes.json",
+        "hashes.json.lock",
+    ]
+
+
+class _Session(object):
+    def __init__(self, cluster_type, engine_hosts):
+        self.info = {"type": cluster_type, "engine_hosts": engine_hosts}
+
+
+def test_dataset_snapshot_engines_local():
+    assert _engines_local(_Session("hosts", "localhost"))
+    assert not _engines_local(_Session("hosts", "localhost,192.0.2.1"))
+    assert not _engines_local(_Session("k8s", "gs-engine-0"))
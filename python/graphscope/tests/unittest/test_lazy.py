@@ -16,6 +16,7 @@
 # limitations under the License.
 #
 
+import asyncio
 import importlib
 import logging
 import os
@@ -280,3 +281,54 @@ def test_simulate_eager(sess):
         c, {"id_col": "v.id", "data_col": "v.data", "result_col": "r"}
     )
     g2 = sess.run(g2_node)
+
+
+def test_run_async(sess):
+    g = load_p2p_network(sess)
+    pg = g.project(vertices={"host": ["id"]}, edges={"connect": ["dist"]})
+    c = graphscope.sssp(pg, 20)
+    r1 = sess.run_async(c.to_numpy("r"))
+    # the untouchable graphs and contexts are unloaded along with the next run
+    r2 = sess.run_async(c.to_dataframe({"result": "r"}))
+    assert np.all(r1.result() == r2.result()["result"].to_numpy())
+    assert len(sess._pending_unload.op) > 0
+
+    r3 = asyncio.run(sess.arun(c.to_numpy("r")))
+    assert np.all(r1.result() == r3)
+
+
+def test_run_async_chained(sess):
+    g_node = load_p2p_network(sess)
+    r1 = sess.run_async(g_node)
+    pg = g_node.project(vertices={"host": ["id"]}, edges={"connect": ["dist"]})
+    r2 = sess.run_async(graphscope.sssp(pg, 20).to_numpy("r"))
+    g = r1.result()
+    r2.result()
+    # the graph is loaded by the first run only, and shared by the second one
+    assert g_node.evaluated
+    assert g.loaded()
+
+
+def test_run_while_async_queued(sess):
+    g_node = load_p2p_network(sess)
+    r1 = sess.run_async(g_node)
+    pg = g_node.project(vertices={"host": ["id"]}, edges={"connect": ["dist"]})
+    # the dag of the run is extracted after the async run evaluates the graph
+    sess.run(graphscope.sssp(pg, 20).to_numpy("r"))
+    assert g_node.evaluated
+    assert r1.result().loaded()
+
+
+def test_pending_unload_kept_on_failure(sess, student_v):
+    g = load_p2p_network(sess)
+    pg = g.project(vertices={"host": ["id"]}, edges={"connect": ["dist"]})
+    sess.run(graphscope.sssp(pg, 20).to_numpy("r"))
+    unloads = [op.key for op in sess._pending_unload.op]
+    assert unloads
+    with pytest.raises(AnalyticalEngineInternalError):
+        g = sess.g()
+        ug = g.unload()
+        g1 = g.add_vertices(student_v, "student")
+        sess.run([ug, g1])
+    # the unloads are sent again along with the next run
+    assert [op.key for op in sess._pending_unload.op][: len(unloads)] == unloads
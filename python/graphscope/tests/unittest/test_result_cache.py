@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from graphscope.client.cache import ResultCache
+from graphscope.framework import utils
+from graphscope.framework.operation import Operation
+from graphscope.proto import attr_value_pb2
+from graphscope.proto import op_def_pb2
+from graphscope.proto import query_args_pb2
+from graphscope.proto import types_pb2
+
+
+class _Node(object):
+    def __init__(self, op):
+        self.op = op
+
+
+def _load_graph(source, protocol="pandas"):
+    chunk = attr_value_pb2.Chunk()
+    chunk.attr[types_pb2.PROTOCOL].CopyFrom(utils.s_to_attr(protocol))
+    if protocol == "pandas":
+        chunk.attr[types_pb2.VALUES].CopyFrom(utils.s_to_attr(source))
+    else:
+        chunk.attr[types_pb2.SOURCE].CopyFrom(utils.s_to_attr(source))
+    large_attr = attr_value_pb2.LargeAttrValue()
+    large_attr.chunk_list.items.extend([chunk])
+    loader = Operation(
+        "session",
+        types_pb2.DATA_SOURCE,
+        large_attr=large_attr,
+        output_types=types_pb2.NULL_OUTPUT,
+    )
+    return Operation(
+        "session", types_pb2.CREATE_GRAPH, inputs=[loader], output_types=types_pb2.GRAPH
+    )
+
+
+def _run_app(graph, src):
+    app = Operation("session", types_pb2.CREATE_APP, output_types=types_pb2.APP)
+    bound = Operation(
+        "session",
+        types_pb2.BIND_APP,
+        inputs=[graph, app],
+        output_types=types_pb2.BOUND_APP,
+    )
+    return Operation(
+        "session",
+        types_pb2.RUN_APP,
+        inputs=[bound],
+        output_types=types_pb2.RESULTS,
+        query_args=query_args_pb2.QueryArgs(args=utils.pack_query_params(src)),
+    )
+
+
+def test_operation_signature():
+    g1, g2 = _load_graph("p2p"), _load_graph("p2p")
+    assert g1.key != g2.key
+    assert g1.signature == g2.signature
+    assert _load_graph("p2p2").signature != g1.signature
+    assert _run_app(g1, 6).signature == _run_app(g2, 6).signature
+    assert _run_app(g1, 6).signature != _run_app(g1, 4).signature
+
+    # the memoized signature follows the modifications of the op and its parents
+    ctx = _run_app(g1, 6)
+    signature = ctx.signature
+    ctx.as_op_def().fetch = True
+    assert ctx.signature == signature
+    g1.parents[0].set_attr(types_pb2.DIRECTED, utils.b_to_attr(True))
+    assert g1.signature != g2.signature
+    assert ctx.signature != signature
+
+
+def test_result_cache():
+    cache = ResultCache(maxsize=2)
+    g = _load_graph("p2p")
+    ctx6, ctx4 = _Node(_run_app(g, 6)), _Node(_run_app(g, 4))
+    assert cache.get([ctx6]) is None
+    cache.put([ctx6, ctx4], ["r6", "r4"])
+    assert cache.get([_Node(_run_app(_load_graph("p2p"), 6))]) == ["r6"]
+    assert cache.get([ctx4, ctx6]) == ["r4", "r6"]
+    assert cache.get([ctx4, _Node(_run_app(g, 5))]) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    # evict the least recently used one
+    cache.put([_Node(g)], ["g"])
+    assert cache.get([ctx4]) is None
+    assert cache.get([ctx6]) == ["r6"]
+
+    # drop the results depend on the unloaded graph
+    unload = op_def_pb2.DagDef()
+    unload.op.extend([op_def_pb2.OpDef(op=types_pb2.UNLOAD_GRAPH, parents=[g.key])])
+    cache.discard(unload)
+    assert len(cache) == 0
+
+    # results of raw operations and the ones refer to an existing graph
+    # are not cached
+    cache.put([ctx6.op], ["r6"])
+    projected = Operation(
+        "session",
+        types_pb2.PROJECT_TO_SIMPLE,
+        config={types_pb2.GRAPH_NAME: utils.s_to_attr("graph")},
+        output_types=types_pb2.GRAPH,
+    )
+    cache.put([_Node(_run_app(projected, 6))], ["r6"])
+    assert len(cache) == 0
+
+    # nor the graphs loaded from files, which may change between loads
+    cache.put([_Node(_load_graph("p2p.e", protocol="file"))], ["g"])
+    cache.put([_Node(_load_graph("o0000", protocol="vineyard"))], ["g"])
+    assert len(cache) == 1
+
+    cache.maxsize = 0
+    cache.put([ctx6], ["r6"])
+    assert cache.get([ctx6]) is None
@@ -161,3 +161,21 @@ def test_with():
     with sess:
         pass
     assert sess.info["status"] == "closed"
+
+
+def test_result_cache():
+    with graphscope.session(cluster_type="hosts", result_cache_size=2) as sess:
+        g = load_p2p_network(sess)
+        pg = g.project(vertices={"host": ["id"]}, edges={"connect": ["dist"]})
+        ctx = graphscope.sssp(pg, src=6)
+        assert graphscope.sssp(pg, src=6) is ctx
+        assert graphscope.sssp(pg, src=4) is not ctx
+        r = ctx.to_numpy("r")
+        assert ctx.to_numpy("r") is r
+        # evicted, then evaluated again
+        assert graphscope.sssp(pg, src=6) is not ctx
+
+        # results of an unloaded graph are dropped
+        ctx = graphscope.sssp(pg, src=6)
+        pg.unload()
+        assert len(sess._result_cache) == 0
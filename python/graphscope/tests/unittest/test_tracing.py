@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from graphscope.client.utils import GRPCUtils
+from graphscope.framework import tracing
+from graphscope.framework.utils import decode_numpy
+from graphscope.proto import op_def_pb2
+from graphscope.tests.unittest.test_utils import _archive_numpy
+
+
+@tracing.traced
+def _work():
+    with tracing.span("inner", n=1) as span:
+        span.set(m=2)
+    return 42
+
+
+def _spans(trace):
+    return [event for event in trace.events if event["ph"] == "X"]
+
+
+def test_disabled():
+    assert tracing.current_trace() is None
+    assert _work() == 42
+    with tracing.span("noop") as span:
+        span.set(x=1)
+    # a no-op, which doesn't touch the active trace
+    with tracing.trace() as outer:
+        with tracing.activate(None) as trace:
+            assert trace is None
+            assert tracing.current_trace() is outer
+
+
+def test_trace(tmp_path):
+    path = str(tmp_path / "trace.json")
+    with tracing.trace(path) as trace:
+        assert _work() == 42
+        decode_numpy(_archive_numpy(np.arange(10)))
+        with pytest.raises(ValueError):
+            with tracing.span("failed"):
+                raise ValueError()
+        # not active in other threads, unless activated
+        thread = threading.Thread(target=_work)
+        thread.start()
+        thread.join()
+    assert tracing.current_trace() is None
+
+    spans = _spans(trace)
+    assert [event["name"] for event in spans] == [
+        "inner",
+        "_work",
+        "decode_numpy",
+        "failed",
+    ]
+    assert spans[0]["args"] == {"n": 1, "m": 2}
+    assert spans[3]["args"] == {"error": "ValueError"}
+    # inner spans are enclosed by the outer ones
+    assert spans[1]["ts"] <= spans[0]["ts"]
+    assert spans[0]["ts"] + spans[0]["dur"] <= spans[1]["ts"] + spans[1]["dur"]
+    with open(path) as f:
+        chrome_trace = json.load(f)
+    assert chrome_trace["otherData"]["trace_id"] == trace.trace_id
+    assert chrome_trace["traceEvents"][0]["name"] == "process_name"
+
+
+def test_trace_propagation():
+    trace = tracing.Trace()
+    requests = GRPCUtils().generate_runstep_requests(
+        "session", op_def_pb2.DagDef(), trace.trace_id
+    )
+    head = next(requests).head
+    assert head.trace_id == trace.trace_id
+
+    # spans of the coordinator are returned in the response
+    remote = tracing.Trace(head.trace_id, process="coordinator")
+    with tracing.activate(remote), tracing.span("RunStep"):
+        pass
+    trace.extend(json.loads(json.dumps(remote.events)))
+    assert [event["cat"] for event in _spans(trace)] == ["coordinator"]
+
+
+def test_to_opentelemetry():
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    export = pytest.importorskip("opentelemetry.sdk.trace.export")
+    in_memory = pytest.importorskip(
+        "opentelemetry.sdk.trace.export.in_memory_span_exporter"
+    )
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+    with tracing.trace() as trace:
+        _work()
+    trace.to_opentelemetry(provider.get_tracer("test"))
+    inner, outer = exporter.get_finished_spans()
+    assert (inner.name, outer.name) == ("inner", "_work")
+    assert inner.parent.span_id == outer.context.span_id
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Alibaba Group Holding Limited. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import copy
+import decimal
+import gc
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from graphscope.client.utils import GRPCUtils
+from graphscope.client.utils import get_chunk_stream
+from graphscope.framework import dag_utils
+from graphscope.framework.errors import InvalidArgumentError
+from graphscope.framework.graph_utils import EdgeSubLabel
+from graphscope.framework.graph_utils import VertexLabel
+from graphscope.framework.loader import Loader
+from graphscope.framework.utils import decode_arrow_table
+from graphscope.framework.utils import decode_dataframe
+from graphscope.framework.utils import decode_dataframe_blocks
+from graphscope.framework.utils import decode_numpy
+from graphscope.framework.utils import decode_numpy_blocks
+from graphscope.proto import message_pb2
+from graphscope.proto import op_def_pb2
+from graphscope.proto import types_pb2
+
+# type ids of the context protocol
+_dtype_ids = {np.dtype("int64"): 4, np.dtype("float64"): 7, object: 8}
+
+
+def _archive_column(array):
+    if array.dtype == object:
+        return b"".join(
+            struct.pack("q", len(s.encode("utf-8"))) + s.encode("utf-8") for s in array
+        )
+    return array.tobytes()
+
+
+def _archive_numpy(array):
+    dtype = object if array.dtype == object else array.dtype
+    buffer = struct.pack("q", array.ndim)
+    buffer += b"".join(struct.pack("q", s) for s in array.shape)
+    buffer += struct.pack("i", _dtype_ids[dtype])
+    buffer += struct.pack("q", array.size)
+    return buffer + _archive_column(array.reshape(-1))
+
+
+def _archive_dataframe(df):
+    buffer = struct.pack("q", len(df.columns)) + struct.pack("q", len(df))
+    for name in df.columns:
+        array = df[name].to_numpy()
+        dtype = object if array.dtype == object else array.dtype
+        buffer += struct.pack("q", len(name)) + name.encode("utf-8")
+        buffer += struct.pack("i", _dtype_ids[dtype])
+        buffer += _archive_column(array)
+    return buffer
+
+
+def _split(buffer, chunk_size):
+    return [buffer[i : i + chunk_size] for i in range(0, len(buffer), chunk_size)]
+
+
+def _runstep_responses(results, chunk_size, trailing_head=False):
+    # a trailing head follows the chunks, which are keyed by op
+    head = message_pb2.RunStepResponse(head=message_pb2.RunStepResponseHead())
+    bodies = []
+    for key, result in results:
+        head.head.results.append(
+            op_def_pb2.OpResult(key=key, has_large_result=result is not None)
+        )
+        if result is None:
+            continue
+        chunks = _split(result, chunk_size)
+        for i, chunk in enumerate(chunks):
+            bodies.append(
+                message_pb2.RunStepResponse(
+                    body=message_pb2.RunStepResponseBody(
+                        chunk=chunk,
+                        has_next=i + 1 < len(chunks),
+                        op_key=key if trailing_head else "",
+                    )
+                )
+            )
+    if trailing_head:
+        return bodies + [head]
+    return [head] + bodies
+
+
+@pytest.mark.parametrize("trailing_head", [False, True])
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 20])
+def test_parse_runstep_responses(chunk_size, trailing_head):
+    a = _archive_numpy(np.arange(100, dtype=np.int64))
+    b = _archive_numpy(np.array(["a", "bc", "", "def"] * 10, dtype=object))
+    responses = _runstep_responses(
+        [("a", a), ("c", None), ("b", b)], chunk_size, trailing_head
+    )
+    head, large_results = GRPCUtils().parse_runstep_responses(responses)
+    assert [r.key for r in head.results] == ["a", "c", "b"]
+    assert set(large_results.keys()) == {"a", "b"}
+    assert bytes(large_results["a"]) == a
+    assert bytes(large_results["b"]) == b
+    assert np.array_equal(decode_numpy(large_results["a"]), np.arange(100))
+
+
+@pytest.mark.parametrize("chunk_size", [5, 13, 1 << 20])
+def test_decode_numpy_blocks(chunk_size):
+    for array in [
+        np.arange(1000, dtype=np.int64),
+        np.random.rand(50, 3),
+        np.array([str(i) * (i % 5) for i in range(100)], dtype=object),
+        np.array([], dtype=np.int64),
+    ]:
+        buffer = _archive_numpy(array)
+        blocks = list(decode_numpy_blocks(_split(buffer, chunk_size)))
+        assert np.array_equal(np.concatenate(blocks), decode_numpy(buffer))
+        assert np.array_equal(np.concatenate(blocks), array)
+
+
+@pytest.mark.parametrize("trailing_head", [False, True])
+def test_iter_runstep_responses(trailing_head):
+    df = pd.DataFrame({"id": np.arange(20), "name": [str(i) for i in range(20)]})
+    df["name"] = df["name"].astype(object)
+    buffer = _archive_dataframe(df)
+    a = _archive_numpy(np.arange(10, dtype=np.int64))
+    responses = _runstep_responses(
+        [("x", None), ("a", a), ("df", buffer)], 16, trailing_head
+    )
+    heads = []
+    chunks = GRPCUtils().iter_runstep_responses(iter(responses), heads.append)
+    chunks = (chunk for key, chunk in chunks if key == "df")
+    (result,) = list(decode_dataframe_blocks(chunks))
+    pd.testing.assert_frame_equal(result, decode_dataframe(buffer))
+    assert [r.key for r in heads[0].results] == ["x", "a", "df"]
+
+    # the error in a trailing head is raised after the chunks
+    def check(head):
+        raise RuntimeError("failed")
+
+    chunks = GRPCUtils().iter_runstep_responses(iter(responses), check)
+    if trailing_head:
+        assert next(chunks)[0] == "a"
+    with pytest.raises(RuntimeError, match="failed"):
+        list(chunks)
+
+
+@pytest.mark.parametrize(
+    "strings",
+    [
+        ["a", "bc", "", "def", "中文", "ü"],
+        ["abc"] * 10,
+        ["abc"] * 9 + ["ab"],
+        [],
+    ],
+)
+def test_decode_string_array(strings):
+    array = np.array(strings, dtype=object)
+    buffer = _archive_numpy(array)
+    assert list(decode_numpy(buffer)) == strings
+    df = pd.DataFrame({"s": array})
+    assert list(decode_dataframe(_archive_dataframe(df))["s"]) == strings
+
+
+def test_decode_arrow_table():
+    df = pd.DataFrame(
+        {
+            "id": np.arange(4),
+            "weight": np.random.rand(4),
+            "name": np.array(["a", "bc", "", "d"], dtype=object),
+        }
+    )
+    buffer = _archive_dataframe(df)
+    # append a column of json strings
+    mixed = [1, "a", None, [1, 2]]
+    buffer = struct.pack("q", 4) + buffer[8:]
+    buffer += struct.pack("q", len("mixed")) + b"mixed"
+    buffer += struct.pack("i", types_pb2.COLUMN_TYPE_JSON)
+    buffer += _archive_column(np.array([json.dumps(v) for v in mixed], dtype=object))
+    table = decode_arrow_table(buffer)
+    assert table.column_names == ["id", "weight", "name", "mixed"]
+    pd.testing.assert_frame_equal(
+        table.select(["id", "weight", "name"]).to_pandas(), df
+    )
+    # cannot be converted to arrow, left as json strings
+    assert table.column("mixed").to_pylist() == [json.dumps(v) for v in mixed]
+
+    buffer = struct.pack("q", 1) + struct.pack("q", 3)
+    buffer += struct.pack("q", len("attr")) + b"attr" + struct.pack("i", 9)
+    buffer += _archive_column(np.array(["1.5", "null", "2"], dtype=object))
+    table = decode_arrow_table(buffer)
+    assert table.column("attr").to_pylist() == [1.5, None, 2.0]
+    assert table.column("attr").type == pa.float64()
+
+
+def _table_of_label(label):
+    chunk = label.attr()[0]
+    return chunk, pa.ipc.open_stream(chunk.buffer).read_all()
+
+
+def test_loader_numpy():
+    src = np.arange(6, dtype=np.int64)
+    dst = np.arange(6, dtype=np.int32)[::-1]
+    weight = np.random.rand(6)
+    loader = Loader([src, dst, weight])
+    assert loader.protocol == "pandas"
+    assert loader.deduced_properties == [
+        ("f0", types_pb2.LONG),
+        ("f1", types_pb2.INT),
+        ("f2", types_pb2.DOUBLE),
+    ]
+    chunk, table = _table_of_label(VertexLabel("v", loader))
+    assert chunk.attr[types_pb2.PROTOCOL].s == b"pandas"
+    assert table.column_names == ["f0", "f1", "f2"]
+    for column, array in zip(table.columns, [src, dst, weight]):
+        assert np.array_equal(column.to_numpy(), array)
+        assert column.type == pa.from_numpy_dtype(array.dtype)
+
+
+def test_loader_pandas():
+    df = pd.DataFrame(
+        {
+            "id": np.arange(4),
+            "weight": np.random.rand(4),
+            "name": pd.Series(["a", "bc", "", "d"], dtype=object),
+        }
+    )
+    loader = Loader(df)
+    assert [name for name, _ in loader.deduced_properties] == ["id", "weight", "name"]
+    assert loader.deduced_properties[2][1] == types_pb2.STRING
+    _, table = _table_of_label(VertexLabel("v", loader))
+    assert table.column_names == ["id", "weight", "name"]
+    for name in ("id", "weight", "name"):
+        assert table.column(name).to_pylist() == df[name].tolist()
+
+
+def test_loader_skips_nested_columns():
+    df = pd.DataFrame(
+        {
+            "id": np.arange(2),
+            "tags": [[1, 2], [3]],
+            "price": [decimal.Decimal("1.5"), decimal.Decimal("2.25")],
+            "name": ["a", "b"],
+        }
+    )
+    loader = Loader(df)
+    assert loader.deduced_properties == [
+        ("id", types_pb2.LONG),
+        ("name", types_pb2.STRING),
+    ]
+
+
+def test_generate_runstep_requests():
+    dag_def = op_def_pb2.DagDef()
+    op = dag_def.op.add(key="loader", op=types_pb2.DATA_SOURCE)
+    op.large_attr.chunk_list.items.add(buffer=b"0123456789")
+    op.large_attr.chunk_list.items.add(buffer=b"abc")
+    grpc_utils = GRPCUtils()
+    grpc_utils.CHUNK_SIZE = 4
+    requests = list(grpc_utils.generate_runstep_requests("session", dag_def))
+    metas = requests[0].head.dag_def.op[0].large_attr.chunk_meta_list.items
+    assert [meta.size for meta in metas] == [10, 3]
+    assert [(r.body.chunk, r.body.has_next) for r in requests[1:]] == [
+        (b"0123", True),
+        (b"4567", True),
+        (b"89", False),
+        (b"abc", False),
+    ]
+
+
+def _send_loader(loader, chunk_size):
+    return _send_loader_chunk(VertexLabel("v", loader).attr()[0], chunk_size)
+
+
+def _send_loader_chunk(chunk, chunk_size):
+    dag_def = op_def_pb2.DagDef()
+    op = dag_def.op.add(key="loader", op=types_pb2.DATA_SOURCE)
+    op.large_attr.chunk_list.items.extend([chunk])
+    grpc_utils = GRPCUtils()
+    grpc_utils.CHUNK_SIZE = chunk_size
+    return grpc_utils.generate_runstep_requests("session", dag_def)
+
+
+def test_loader_stream():
+    pulled = []
+
+    def frames():
+        for i in range(4):
+            pulled.append(i)
+            yield pd.DataFrame({"id": np.arange(i * 100, i * 100 + 100), "w": 0.5})
+
+    loader = Loader(frames())
+    assert loader.deduced_properties == [
+        ("id", types_pb2.LONG),
+        ("w", types_pb2.DOUBLE),
+    ]
+    requests = _send_loader(loader, 1024)
+    head = next(requests).head
+    assert head.dag_def.op[0].large_attr.chunk_meta_list.items[0].size == -1
+    # only the first frame is pulled for the schema
+    assert pulled == [0]
+    bodies = list(requests)
+    assert pulled == [0, 1, 2, 3]
+    assert all(len(r.body.chunk) <= 1024 for r in bodies)
+    assert [r.body.has_next for r in bodies] == [True] * (len(bodies) - 1) + [False]
+    table = pa.ipc.open_stream(b"".join(r.body.chunk for r in bodies)).read_all()
+    assert table.column("id").to_pylist() == list(range(400))
+
+    # the stream is taken once sent
+    with pytest.raises(RuntimeError, match="cannot be reused"):
+        _send_loader(loader, 1024)
+
+
+def test_loader_stream_lifetime(monkeypatch):
+    import graphscope.client.session
+
+    table = pa.table({"id": np.arange(100)})
+    loader = Loader(pytest.importorskip("pyarrow.dataset").dataset(table))
+    # datasets are scanned again each time they are sent
+    for _ in range(2):
+        bodies = list(_send_loader(loader, 4096))[1:]
+        received = pa.ipc.open_stream(b"".join(r.body.chunk for r in bodies))
+        assert received.read_all().equals(table)
+
+    op = dag_utils.create_loader(VertexLabel("v", loader))
+    key = loader.source
+    del loader
+    gc.collect()
+    # held by the op, and the copies of op
+    op_copy = copy.deepcopy(op)
+    del op
+    gc.collect()
+    assert get_chunk_stream(key) is not None
+    del op_copy
+    gc.collect()
+    with pytest.raises(RuntimeError, match="released"):
+        get_chunk_stream(key)
+
+    class LazySession(object):
+        def eager(self):
+            return False
+
+    monkeypatch.setattr(
+        graphscope.client.session, "get_session_by_id", lambda _: LazySession()
+    )
+    label = VertexLabel("v", Loader(iter(table.to_batches())), session_id="lazy")
+    with pytest.raises(InvalidArgumentError, match="lazy mode"):
+        dag_utils.create_loader(label)
+
+
+def test_loader_record_batches():
+    table = pa.table({"id": np.arange(1000), "name": ["n%d" % i for i in range(1000)]})
+    for source in (
+        iter(table.to_batches(max_chunksize=100)),
+        pa.RecordBatchReader.from_batches(table.schema, table.to_batches(100)),
+        pytest.importorskip("pyarrow.dataset").dataset(table),
+    ):
+        loader = Loader(source)
+        assert loader.deduced_properties == [
+            ("id", types_pb2.LONG),
+            ("name", types_pb2.STRING),
+        ]
+        bodies = list(_send_loader(loader, 4096))[1:]
+        received = pa.ipc.open_stream(b"".join(r.body.chunk for r in bodies))
+        assert received.read_all().equals(table)
+
+
+def test_loader_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pa.table(
+        {
+            "src": np.arange(1000),
+            "dst": np.arange(1000)[::-1],
+            "weight": np.linspace(0, 1, 1000),
+            "ts": pa.array(np.arange(1000), pa.timestamp("s")),
+        }
+    )
+    for i in range(2):
+        pq.write_table(
+            table.slice(i * 500, 500), tmp_path / ("%d.parquet" % i), row_group_size=100
+        )
+
+    loader = Loader("file://%s/*.parquet" % tmp_path, filter="ts >= 1970-01-01 00:15")
+    # timestamps are not properties
+    assert [name for name, _ in loader.deduced_properties] == ["src", "dst", "weight"]
+    label = EdgeSubLabel(loader, properties=["weight"])
+    bodies = list(_send_loader_chunk(label.get_attr(), 4096))[1:]
+    received = pa.ipc.open_stream(b"".join(r.body.chunk for r in bodies)).read_all()
+    assert received.column_names == ["src", "dst", "weight"]
+    assert received.column("src").to_pylist() == list(range(900, 1000))
+
+    with pytest.raises(ValueError, match="Invalid filter"):
+        Loader("file://%s/*.parquet" % tmp_path, filter="ts")
+    with pytest.raises(ValueError, match="columnar"):
+        Loader(pd.DataFrame({"a": [1]}), filter="a > 0")